@@ -0,0 +1,110 @@
+"""Scaling of probabilities, scoring and solver time with the size of the grid.
+
+Builds synthetic grids of N Drivers and N / 2 Teams, and times each stage against its
+expected growth:
+
+- probabilities: naive grid from winning odds, O(N^3) as each of the N positions
+  normalizes a N x N grid, plus O(N) completion probabilities.
+- scoring: expected points of every Driver and Team, O(N^3) as each Driver computes
+  N x N overtake and beat team mate grids.
+- solver: BasicSolver over C(N, 5) * N / 2 line-ups.
+
+Usage: python benchmarks/grid_scaling.py [N ...]
+"""
+
+import sys
+import time
+from math import comb
+
+import pandas as pd
+
+from gridrival.drivers import Driver
+from gridrival.optimization.basic import BasicSolver
+from gridrival.probabilities import GridProbabilities
+from gridrival.probabilities.betting_odds import RetirementOdds, WinningOdds
+from gridrival.teams import Team
+
+GRID_SIZES = [20, 22, 24, 26, 30]
+
+
+def synthetic_grid(grid_size: int):
+    "Drivers, Teams, winning odds and retirement odds for a grid of grid_size Drivers."
+
+    drivers = [
+        Driver(f"Driver {i}", (32 - 28 * i / grid_size) * 1e6, i + 1)
+        for i in range(grid_size)
+    ]
+    teams = [
+        Team(f"Team {i}", drivers[2 * i], drivers[2 * i + 1], (28 - i) * 1e6)
+        for i in range(grid_size // 2)
+    ]
+    win = pd.Series({d.name: 1.8 * 1.4**i for i, d in enumerate(drivers)})
+    ret = pd.Series({d.name: 15 + i % 10 for i, d in enumerate(drivers)})
+    ret["NO_RETIREMENT"] = 10
+
+    return drivers, teams, win, ret
+
+
+def timed(func):
+    "Return the result of func and the seconds it took."
+
+    start = time.perf_counter()
+    result = func()
+
+    return result, time.perf_counter() - start
+
+
+def run(grid_size: int) -> dict:
+    "Time each stage for a grid of grid_size Drivers."
+
+    drivers, teams, win, ret = synthetic_grid(grid_size)
+
+    def probabilities():
+        grid = WinningOdds(win).naive_grid()
+        comp = RetirementOdds(ret).completion_probabilities()
+        return GridProbabilities(grid, comp)
+
+    def scoring():
+        for driver in drivers:
+            driver.probabilities = prob.driver_probabilities(driver.name)
+        return (
+            [driver.to_fixed_info() for driver in drivers],
+            [team.to_fixed_info() for team in teams],
+        )
+
+    prob, t_prob = timed(probabilities)
+    (fixed_drivers, fixed_teams), t_score = timed(scoring)
+    budget = 100 * 1e6 * grid_size / 20
+    solver, t_solve = timed(
+        lambda: BasicSolver(fixed_drivers, fixed_teams, [], [], budget).solve()
+    )
+
+    return {
+        "grid": grid_size,
+        "probabilities": t_prob,
+        "scoring": t_score,
+        "solver": t_solve,
+        "lineups": comb(grid_size, 5) * len(teams),
+    }
+
+
+def main() -> None:
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or GRID_SIZES
+    results = [run(grid_size) for grid_size in sizes]
+    base = results[0]
+
+    print("grid  prob[s]  x(N^3)  score[s]  x(N^3)  solve[s]  x(lineups)")
+    for r in results:
+        cube = (r["grid"] / base["grid"]) ** 3
+        lineups = r["lineups"] / base["lineups"]
+        print(
+            f"{r['grid']:>4}  {r['probabilities']:7.3f}  "
+            f"{r['probabilities'] / base['probabilities'] / cube:6.2f}  "
+            f"{r['scoring']:8.3f}  {r['scoring'] / base['scoring'] / cube:6.2f}  "
+            f"{r['solver']:8.3f}  {r['solver'] / base['solver'] / lineups:10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compiled kernels against the NumPy path when building and filtering universes.
+
+Times BasicSolver, which enumerates every line-up, scores it with its Talent Driver and
+filters it by budget and included Drivers, on synthetic pools of Drivers, with the
+Talent Driver in the roster and in a separate slot. The kernels are compiled before
+timing, and both paths are checked to find the same best Fantasy Team.
+
+Requires numba, installed with `gridrival[jit]`.
+
+Usage: python benchmarks/jit_kernels.py [N ...]
+"""
+
+import sys
+import time
+
+from gridrival.drivers import FixedInfo
+from gridrival.optimization.basic import BasicSolver
+from gridrival.optimization.kernels import JIT_AVAILABLE, use_jit
+
+POOL_SIZES = [20, 24, 28]
+REPEATS = 3
+
+
+def fixed_infos(n_drivers: int):
+    "Create a pool of n_drivers Drivers and n_drivers / 2 Teams."
+
+    drivers = [
+        FixedInfo(f"D{i}", (32 - 28 * i / n_drivers) * 1e6, 160.0 - 4 * i + i % 3)
+        for i in range(n_drivers)
+    ]
+    teams = [
+        FixedInfo(f"T{i}", (28 - i) * 1e6, 150.0 - 6 * i) for i in range(n_drivers // 2)
+    ]
+
+    return drivers, teams
+
+
+def timed(jit: bool, drivers, teams, talent_slot: bool):
+    "Return the best Fantasy Team and the best seconds of BasicSolver out of REPEATS."
+
+    best = float("inf")
+    with use_jit(jit):
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            solver = BasicSolver(
+                drivers, teams, [drivers[-1]], [], 100 * 1e6, talent_slot=talent_slot
+            )
+            best = min(best, time.perf_counter() - start)
+
+    return solver.solve(), best
+
+
+def main(pool_sizes) -> None:
+
+    if not JIT_AVAILABLE:
+        sys.exit("numba is not installed. Install gridrival[jit].")
+
+    # Compile every kernel before timing.
+    drivers, teams = fixed_infos(8)
+    for talent_slot in (False, True):
+        timed(True, drivers, teams, talent_slot)
+
+    print(f"{'drivers':>7} {'slot':>5} {'numpy':>9} {'jit':>9} {'speed-up':>8}")
+    for n_drivers in pool_sizes:
+        drivers, teams = fixed_infos(n_drivers)
+        for talent_slot in (False, True):
+            numpy_team, numpy_time = timed(False, drivers, teams, talent_slot)
+            jit_team, jit_time = timed(True, drivers, teams, talent_slot)
+            assert numpy_team.points() == jit_team.points()
+            print(
+                f"{n_drivers:>7} {str(talent_slot):>5} {numpy_time:>8.3f}s "
+                f"{jit_time:>8.3f}s {numpy_time / jit_time:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or POOL_SIZES)
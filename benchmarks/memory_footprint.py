@@ -0,0 +1,82 @@
+"""Memory footprint of the full universe of Fantasy Teams.
+
+Compares, for every line-up of 5 Drivers and 1 Team, dict-backed objects as the
+Fantasy Teams were originally stored, the slotted FixedInfo and FantasyTeam, and the
+array-backed Universe used by the solvers.
+
+Usage: python benchmarks/memory_footprint.py
+"""
+
+import tracemalloc
+from itertools import combinations, product
+
+from gridrival.drivers import FixedInfo
+from gridrival.fantasy import TALENT_DRIVER_COST, FantasyTeam
+from gridrival.optimization.universe import Universe
+
+
+class DictFixedInfo:
+    def __init__(self, name, cost, points):
+        self.name = name
+        self.cost = cost
+        self.points = points
+
+
+class DictFantasyTeam:
+    def __init__(self, drivers, team):
+        self.drivers = drivers
+        self.team = team
+        eligible = [d for d in drivers if d.cost <= TALENT_DRIVER_COST]
+        self.talent_driver = max(eligible, key=lambda d: d.points, default=None)
+
+
+def fixed_infos(fixed_cls):
+    "Create a grid of 20 Drivers and 10 Teams."
+
+    drivers = [fixed_cls(f"D{i}", (i + 4) * 1e6, 150.0 - i) for i in range(20)]
+    teams = [fixed_cls(f"T{i}", (i + 5) * 1e6, 160.0 - i) for i in range(10)]
+
+    return drivers, teams
+
+
+def measure(build):
+    "Return the number of line-ups, and the bytes kept alive and at peak by build."
+
+    tracemalloc.start()
+    universe = build()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(universe), size, peak
+
+
+def objects(fixed_cls, fantasy_cls):
+    drivers, teams = fixed_infos(fixed_cls)
+    return lambda: [
+        fantasy_cls(comb, team)
+        for comb, team in product(combinations(drivers, 5), teams)
+    ]
+
+
+def arrays():
+    drivers, teams = fixed_infos(FixedInfo)
+    return lambda: Universe.enumerate(drivers, teams)
+
+
+def main() -> None:
+
+    results = {
+        "dict-backed": measure(objects(DictFixedInfo, DictFantasyTeam)),
+        "slotted": measure(objects(FixedInfo, FantasyTeam)),
+        "array-backed": measure(arrays()),
+    }
+
+    for name, (n, size, peak) in results.items():
+        print(
+            f"{name:<13} {n} line-ups: {size / 2**20:6.1f} MiB kept "
+            f"({size / n:5.1f} B/line-up), {peak / 2**20:6.1f} MiB peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,25 @@
 "F1 Drivers."
-import copy
 
-from pandas import DataFrame, Series
+from typing import Dict, Optional
 
-from gridrival.probabilities import DriverProbabilities, DEFAULT_PROBABILITY
-from gridrival.scoring import LeagueScoring
+from pandas import DataFrame
+
+from gridrival.probabilities import (
+    DEFAULT_PROBABILITY,
+    DriverProbabilities,
+    teammate_joint_probabilities,
+)
+from gridrival.scoring import (
+    expected_overtake_points,
+    expected_personal_improvement_points,
+    league_scoring,
+)
 
 
 class FixedInfo:
     """Fixed info.
 
-    Save Name, Cost and Points as a dictionary for more efficient optimization.
+    Save Name, Cost and Points in a slotted object for more efficient optimization.
 
     Attributes
     ----------
@@ -20,13 +29,24 @@ class FixedInfo:
         Cost of Driver or Team.
     points: float
         Expected points of Driver or Team.
+    components: dict
+        Expected points of Driver or Team for each point component, if known.
     """
 
-    def __init__(self, name: str, cost: float, points: float) -> None:
+    __slots__ = ("name", "cost", "points", "components")
+
+    def __init__(
+        self,
+        name: str,
+        cost: float,
+        points: float,
+        components: Optional[Dict[str, float]] = None,
+    ) -> None:
 
         self.name = name
         self.cost = cost
         self.points = points
+        self.components = components
 
     def __repr__(self) -> str:
         return self.name
@@ -54,7 +74,7 @@ class Driver:
         Cost of the Driver in the fantansy league.
     team: Team
         Team in which the Driver belongs.
-    rank: int
+    rank: float
         Driver's rank given by the eight race rolling average.
     probabilities: DriverProbabilities
         Probabilities for where the Driver will finish in the next race.
@@ -69,13 +89,17 @@ class Driver:
         Expected points from race completion.
     points
         Expected points earned by the Driver.
+    points_breakdown
+        Expected points earned by the Driver for each point component.
+    scoring
+        Point system of the league for the size of the Driver's grid.
     """
 
     def __init__(
         self,
         name: str,
         cost: int,
-        rank: int,
+        rank: float,
         probabilities: DriverProbabilities = DEFAULT_PROBABILITY,
     ) -> None:
 
@@ -102,9 +126,9 @@ class Driver:
         """
 
         if team:
-            scoring = LeagueScoring.Team.QUALIFYING
+            scoring = self.scoring().Team.QUALIFYING
         else:
-            scoring = LeagueScoring.Driver.QUALIFYING
+            scoring = self.scoring().Driver.QUALIFYING
 
         return sum(self.probabilities.qual * scoring)
 
@@ -126,9 +150,9 @@ class Driver:
         """
 
         if team:
-            scoring = LeagueScoring.Team.RACE
+            scoring = self.scoring().Team.RACE
         else:
-            scoring = LeagueScoring.Driver.RACE
+            scoring = self.scoring().Driver.RACE
 
         return sum(self.probabilities.race * scoring)
 
@@ -143,7 +167,7 @@ class Driver:
             Expected points earned by the driver from race completion.
         """
 
-        return sum(self.probabilities.comp * LeagueScoring.Driver.COMPLETION)
+        return sum(self.probabilities.comp * self.scoring().Driver.COMPLETION)
 
     def overtake_points(self) -> float:
         """Expected points from overtaking.
@@ -157,20 +181,21 @@ class Driver:
             Expected points earned by the driver from overtake.
         """
 
-        return (
-            (
-                self.probabilities.overtake_probabilities()
-                * LeagueScoring.Driver.OVERTAKE
+        return float(
+            expected_overtake_points(
+                self.probabilities.qual.to_numpy(),
+                self.probabilities.race.to_numpy(),
+                self.scoring().Driver.OVERTAKE.to_numpy(),
+                getattr(self.probabilities, "correlation", 0.0),
             )
-            .sum()
-            .sum()
         )
 
     def beat_teammate_points(self) -> float:
         """Expected points from beating the other team mate.
 
         Beating other team mate points are determined by the probabilities a driver has
-        of finishing a certain number of positions above its team mate.
+        of finishing a certain number of positions above its team mate. When the Team
+        holds the joint probabilities of its Drivers the points are read from them.
 
         Returns
         -------
@@ -178,8 +203,12 @@ class Driver:
             Expected points earned by the driver from beating its team mate.
         """
 
+        team_probabilities = self.team.probabilities
+        if team_probabilities is not None and self.name in team_probabilities:
+            return float(team_probabilities.beat_teammate_points()[self.name])
+
         expected_points = (
-            self.beat_teammate_probabilities() * LeagueScoring.Driver.BEAT_TEAMMATE
+            self.beat_teammate_probabilities() * self.scoring().Driver.BEAT_TEAMMATE
         )
 
         return expected_points.sum().sum()
@@ -196,13 +225,13 @@ class Driver:
             Expected points earned by the driver from personal improvement.
         """
 
-        pos_improve = self.rank - Series(range(1, 21), range(1, 21))
-        points_improve = LeagueScoring.Driver.PERSONAL_IMPROVEMENT.loc[pos_improve]
-        points_improve.index = range(1, 21)
-
-        expected_points = self.probabilities.race * points_improve
-
-        return expected_points.sum()
+        return float(
+            expected_personal_improvement_points(
+                self.rank,
+                self.probabilities.race.to_numpy(),
+                self.scoring().Driver.PERSONAL_IMPROVEMENT_GRID.to_numpy(),
+            )
+        )
 
     def points(self, team=False) -> float:
         """Total expected points.
@@ -238,10 +267,39 @@ class Driver:
 
         return points
 
+    def points_breakdown(self) -> Dict[str, float]:
+        """Expected points earned by the Driver for each point component.
+
+        Returns
+        -------
+        return: dict
+            Expected driver points of each component. Key is the component's name.
+        """
+
+        return {
+            "qualifying": float(self.qualifying_points()),
+            "race": float(self.race_points()),
+            "completion": float(self.completion_points()),
+            "overtake": float(self.overtake_points()),
+            "beat_teammate": float(self.beat_teammate_points()),
+            "personal_improvement": float(self.personal_improvement_points()),
+        }
+
+    def scoring(self) -> type:
+        "Point system of the league for the size of the Driver's grid."
+        return league_scoring(len(self.probabilities.race))
+
     def to_fixed_info(self) -> FixedInfo:
         "Fix Driver info for easy optimization."
 
-        return FixedInfo(name=self.name, cost=self.cost, points=self.points())
+        components = self.points_breakdown()
+
+        return FixedInfo(
+            name=self.name,
+            cost=self.cost,
+            points=float(sum(components.values())),
+            components=components,
+        )
 
     def other_teammate(self):
         "Get the other team mate."
@@ -249,19 +307,27 @@ class Driver:
             return self.team.driver_2
         return self.team.driver_1
 
-    def beat_teammate_probabilities(self):
-        "Get the probabilities of beating the other team mate."
+    def beat_teammate_probabilities(self) -> DataFrame:
+        """Get the probabilities of beating the other team mate.
+
+        Returns
+        -------
+        return: DataFrame
+            Probabilities of the team mate ending in the row position and the Driver in
+            the column position.
+        """
+
+        team_probabilities = self.team.probabilities
+        if team_probabilities is not None and self.name in team_probabilities:
+            return team_probabilities.joint(self.name).T
+
         prob_driver = self.probabilities.race
         prob_teammate = self.other_teammate().probabilities.race
+        joint = teammate_joint_probabilities(
+            prob_driver.to_numpy(), prob_teammate.to_numpy()
+        )
 
-        df = DataFrame(0, index=range(1, 21), columns=range(1, 21))
-        for pos, prob in prob_driver.items():
-            conditional_prob = copy.copy(prob_teammate)
-            conditional_prob[pos] = 0
-            norm_prob = (conditional_prob * prob) / sum(conditional_prob)
-            df[pos] = norm_prob
-
-        return df
+        return DataFrame(joint.T, index=prob_driver.index, columns=prob_driver.index)
 
     def __eq__(self, driver: "Driver") -> bool:
         "Compare if two Drivers are the same Driver."
@@ -1,5 +1,6 @@
 "Roaster for a Fantasy Team."
-from typing import Tuple
+
+from typing import Optional, Tuple
 
 from gridrival.drivers import FixedInfo
 
@@ -17,6 +18,15 @@ class FantasyTeam:
     double. For simplicity, we assume that the Talent Driver is always the Driver whose
     cost is higher below 18M.
 
+    The league also allows the Talent Driver to be a sixth Driver in a separate slot. In
+    that case the Talent Driver is given explicitly, its cost is added to the Fantasy
+    Team and its points are awarded double.
+
+    Note
+    ----
+    Fantasy Teams are created by the hundred thousands when enumerating the universe of
+    line-ups, so they are slotted and their cost and points are computed only once.
+
     Attributes
     ----------
     drivers: list of FixedInfo
@@ -32,17 +42,42 @@ class FantasyTeam:
         Calculate total cost of Fantasy Team.
     points
         Expected points earned by the Fantasy Team in the race.
+    talent_in_roster
+        The Talent Driver is one of the five Drivers and not a separate slot.
     """
 
+    __slots__ = ("drivers", "team", "talent_driver", "_cost", "_points")
+
     def __init__(
         self,
         drivers: Tuple[FixedInfo, FixedInfo, FixedInfo, FixedInfo, FixedInfo],
         team: FixedInfo,
+        talent_driver: Optional[FixedInfo] = None,
     ):
 
         self.drivers = drivers
         self.team = team
-        self.talent_driver = self._find_talent_driver()
+        if talent_driver is None:
+            self.talent_driver = self._find_talent_driver()
+        else:
+            self.talent_driver = talent_driver
+
+        self._cost = sum(driver.cost for driver in drivers) + team.cost
+        self._points = (
+            sum(driver.points for driver in drivers)
+            + team.points
+            + self.talent_driver.points
+        )
+
+        if not self.talent_in_roster():
+            self._cost += self.talent_driver.cost
+            self._points += self.talent_driver.points
+
+    def talent_in_roster(self) -> bool:
+        "The Talent Driver is one of the five Drivers and not a separate slot."
+        return self.talent_driver is EmptyDriver or any(
+            driver is self.talent_driver for driver in self.drivers
+        )
 
     def cost(self) -> float:
         """Calculate total cost of Fantasy Team.
@@ -55,7 +90,7 @@ class FantasyTeam:
             Total cost of fantasy team.
         """
 
-        return sum(driver.cost for driver in self.drivers) + self.team.cost
+        return self._cost
 
     def points(self) -> float:
         """Expected points earned by the Fantasy Team in the race.
@@ -68,30 +103,20 @@ class FantasyTeam:
             Total expected points for the fantasy team.
         """
 
-        return (
-            sum(driver.points for driver in self.drivers)
-            + self.team.points
-            + self.talent_driver.points
-        )
+        return self._points
 
     def _find_talent_driver(self) -> FixedInfo:
         "Find the highest point Driver with cost below 18M."
 
-        drivers_points = [
-            driver.points
-            for driver in self.drivers
-            if driver.cost <= TALENT_DRIVER_COST
-        ]
+        talent_driver = EmptyDriver
 
-        try:
-            max_points = max(drivers_points)
-        except ValueError:
-            return EmptyDriver
-        else:
-            talent_driver = [
-                driver for driver in self.drivers if driver.points == max_points
-            ]
-            return talent_driver[0]
+        for driver in self.drivers:
+            if driver.cost > TALENT_DRIVER_COST:
+                continue
+            if talent_driver is EmptyDriver or driver.points > talent_driver.points:
+                talent_driver = driver
+
+        return talent_driver
 
     def __contains__(self, fixed: FixedInfo) -> bool:
         "A Fantasy Teams contains a Team or Driver in the Fantasy Team."
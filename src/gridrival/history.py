@@ -0,0 +1,227 @@
+"""History of race results and the rolling ranks of the Drivers.
+
+The rank of a Driver is the average of its finishing positions over the last races. The
+positions of each Driver are kept in a ring buffer next to their running sum, so a new
+result replaces the oldest one and updates the average in constant time per Driver, and
+replaying the results of many seasons takes time linear in the number of races.
+"""
+
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Sequence
+
+import numpy as np
+
+from gridrival.drivers import Driver
+from gridrival.scoring import expected_personal_improvement_points
+
+ROLLING_RACES = 8
+
+
+class SeasonHistory:
+    """Season History keeps the rolling rank of each Driver from its race results.
+
+    A Driver without any result keeps its initial rank, and a Driver missing from a race
+    keeps its results until it races again. Drivers racing for the first time are added
+    to the history.
+
+    Attributes
+    ----------
+    drivers: list of str
+        Names of the Drivers.
+    window: int
+        Number of races of the rolling average.
+    races: int
+        Number of races ingested.
+
+    Methods
+    -------
+    add_result
+        Ingest the finishing positions of a race.
+    replay
+        Ingest the results of many races, yielding the ranks before each one.
+    rank
+        Rolling rank of a Driver.
+    ranks
+        Rolling rank of every Driver.
+    update_drivers
+        Set the rolling ranks as the ranks of Drivers.
+    personal_improvement_points
+        Expected personal improvement points of every Driver in a race.
+    """
+
+    def __init__(
+        self,
+        drivers: Iterable[str] = (),
+        initial: Optional[Mapping[str, float]] = None,
+        window: int = ROLLING_RACES,
+    ) -> None:
+
+        if window < 1:
+            raise ValueError("Window must be at least one race.")
+
+        self.drivers: list = []
+        self.window = window
+        self.races = 0
+
+        self._index: Dict[str, int] = {}
+        self._initial = dict(initial or {})
+        self._positions = np.zeros((0, window))
+        self._sum = np.zeros(0)
+        self._count = np.zeros(0, dtype=np.intp)
+        self._cursor = np.zeros(0, dtype=np.intp)
+        self._rank = np.zeros(0)
+
+        self._add_drivers(list(drivers) + list(self._initial))
+
+    @classmethod
+    def from_drivers(
+        cls, drivers: Iterable[Driver], window: int = ROLLING_RACES
+    ) -> "SeasonHistory":
+        "Create a history with the current ranks of Drivers as their initial ranks."
+        return cls(
+            initial={driver.name: driver.rank for driver in drivers}, window=window
+        )
+
+    def add_result(self, positions: Mapping[str, int]) -> None:
+        """Ingest the finishing positions of a race.
+
+        The oldest position of each Driver in the race is replaced when it already has
+        as many results as the window.
+
+        Parameters
+        ----------
+        positions: dict
+            Finishing position of each Driver in the race, starting at 1. Key is the
+            Driver's name.
+        """
+
+        self._add_drivers(positions)
+
+        rows = np.fromiter(
+            (self._index[name] for name in positions),
+            dtype=np.intp,
+            count=len(positions),
+        )
+        values = np.fromiter(positions.values(), dtype=float, count=len(positions))
+        cursor = self._cursor[rows]
+
+        full = self._count[rows] == self.window
+        self._sum[rows] += values - np.where(full, self._positions[rows, cursor], 0)
+        self._positions[rows, cursor] = values
+        self._count[rows] = np.minimum(self._count[rows] + 1, self.window)
+        self._cursor[rows] = (cursor + 1) % self.window
+        self._rank[rows] = self._sum[rows] / self._count[rows]
+
+        self.races += 1
+
+    def replay(
+        self, results: Iterable[Mapping[str, int]]
+    ) -> Iterator[Dict[str, float]]:
+        """Ingest the results of many races, yielding the ranks before each one.
+
+        The ranks yielded are the ones the league scores each race with, which makes
+        backtesting many seasons a single pass over their results.
+
+        Parameters
+        ----------
+        results: list of dict
+            Finishing positions of each race, in the order they were raced.
+
+        Yields
+        ------
+        ranks: dict
+            Rolling rank of every Driver before the race. Key is the Driver's name.
+        """
+
+        for positions in results:
+            self._add_drivers(positions)
+            yield self.ranks()
+            self.add_result(positions)
+
+    def rank(self, driver: str) -> float:
+        "Rolling rank of a Driver."
+        return float(self._rank[self._index[driver]])
+
+    def ranks(self, drivers: Optional[Sequence[str]] = None) -> Dict[str, float]:
+        """Rolling rank of every Driver.
+
+        Parameters
+        ----------
+        drivers: list of str
+            Names of the Drivers, by default every Driver of the history.
+
+        Returns
+        -------
+        return: dict
+            Rolling rank of each Driver. Key is the Driver's name.
+        """
+
+        if drivers is None:
+            drivers = self.drivers
+
+        return {name: self.rank(name) for name in drivers}
+
+    def update_drivers(self, drivers: Iterable[Driver]) -> None:
+        """Set the rolling ranks as the ranks of Drivers.
+
+        Drivers read their rank when scoring personal improvement points, so the new
+        ranks are used from their next score. Drivers not in the history are left as
+        they are.
+
+        Parameters
+        ----------
+        drivers: list of Driver
+            Drivers to update.
+        """
+
+        for driver in drivers:
+            if driver.name in self._index:
+                driver.rank = self.rank(driver.name)
+
+    def personal_improvement_points(
+        self, race: np.ndarray, drivers: Sequence[str]
+    ) -> np.ndarray:
+        """Expected personal improvement points of every Driver in a race.
+
+        Parameters
+        ----------
+        race: ndarray
+            Matrix(N, N) with the probability of each Driver (row) ending the race in
+            each grid position (column).
+        drivers: list of str
+            Names of the Drivers of each row of the race probabilities.
+
+        Returns
+        -------
+        return: ndarray
+            Expected personal improvement points of each Driver.
+        """
+
+        self._add_drivers(drivers)
+        rows = np.fromiter(
+            (self._index[name] for name in drivers), dtype=np.intp, count=len(drivers)
+        )
+
+        return expected_personal_improvement_points(self._rank[rows], race)
+
+    def _add_drivers(self, names: Iterable[str]) -> None:
+        "Add Drivers not in the history yet, with their initial rank."
+
+        new = [name for name in dict.fromkeys(names) if name not in self._index]
+        if not new:
+            return
+
+        for name in new:
+            self._index[name] = len(self.drivers)
+            self.drivers.append(name)
+
+        # New Drivers without an initial rank start at the back of the grid.
+        default = len(self.drivers)
+        initial = [float(self._initial.get(name, default)) for name in new]
+
+        self._positions = np.vstack(
+            [self._positions, np.zeros((len(new), self.window))]
+        )
+        self._sum = np.concatenate([self._sum, np.zeros(len(new))])
+        self._count = np.concatenate([self._count, np.zeros(len(new), dtype=np.intp)])
+        self._cursor = np.concatenate([self._cursor, np.zeros(len(new), dtype=np.intp)])
+        self._rank = np.concatenate([self._rank, initial])
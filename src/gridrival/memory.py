@@ -0,0 +1,221 @@
+"""Memory instrumentation of the stages of a run.
+
+Python allocations, including NumPy arrays, are traced with tracemalloc, and the
+resident set size (RSS) of the process is sampled from a background thread, so the
+report also covers memory allocated outside of Python.
+
+The peak of tracemalloc is reset at the start of each stage. Stages can be nested or
+run from several threads, as the peak before each reset and at the end of each stage
+is folded into every stage open at the time. Tracing is started by the first open
+stage and stopped when the last one ends. Python 3.7 and 3.8 can not reset the peak,
+so the Python peak of a stage started while tracing is not measured there.
+"""
+
+import itertools
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, NamedTuple, Optional
+
+from pandas import DataFrame
+
+RSS_INTERVAL = 0.01
+
+_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+
+# Traced peak of each open stage before the last reset. Key is the stage's id. Tracing
+# is global to the process, so the peaks are shared by every profiler and thread.
+_PEAKS: Dict[int, int] = {}
+_STAGE_IDS = itertools.count()
+_LOCK = threading.Lock()
+_STARTED = False
+
+
+def resident_set_size() -> Optional[int]:
+    "Resident set size of the process in bytes, None if it can not be read."
+
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # Only the peak is available, in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+class StageMemory(NamedTuple):
+    """Memory used by a stage.
+
+    Attributes
+    ----------
+    python_peak: int
+        Peak of the bytes allocated by Python during the stage, None if it can not be
+        measured.
+    python_allocated: int
+        Bytes allocated by Python during the stage and still in use at its end.
+    rss_before: int
+        Resident set size at the start of the stage.
+    rss_peak: int
+        Peak resident set size sampled during the stage.
+    """
+
+    python_peak: Optional[int]
+    python_allocated: int
+    rss_before: Optional[int]
+    rss_peak: Optional[int]
+
+
+class MemoryProfiler:
+    """Memory Profiler reports the peak memory of each stage of a run.
+
+    Stages with the same name, such as the chunks of a chunked run, are combined into
+    the largest peaks and the total allocated memory.
+
+    Attributes
+    ----------
+    interval: float
+        Seconds between samples of the resident set size.
+    stages: dict
+        Memory used by each stage. Key is the stage's name.
+
+    Methods
+    -------
+    stage
+        Measure the memory used within a block.
+    report
+        DataFrame with the memory used by each stage.
+    """
+
+    def __init__(self, interval: float = RSS_INTERVAL) -> None:
+
+        self.interval = interval
+        self.stages: Dict[str, StageMemory] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure the memory used within a block.
+
+        Parameters
+        ----------
+        name: str
+            Name of the stage.
+        """
+
+        global _STARTED
+
+        with _LOCK:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+                _STARTED = True
+            elif _RESET_PEAK:
+                _fold_peak(tracemalloc.get_traced_memory()[1])
+                tracemalloc.reset_peak()
+            measured = started or _RESET_PEAK
+            current_before, _ = tracemalloc.get_traced_memory()
+            stage_id = next(_STAGE_IDS)
+            _PEAKS[stage_id] = current_before
+
+        rss_before = resident_set_size()
+        rss_peak = [rss_before]
+        done = threading.Event()
+
+        def sample() -> None:
+            while not done.wait(self.interval):
+                rss = resident_set_size()
+                if rss is not None:
+                    rss_peak[0] = max(rss_peak[0] or 0, rss)
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+
+        try:
+            yield
+        finally:
+            done.set()
+            sampler.join()
+
+            with _LOCK:
+                current, peak = tracemalloc.get_traced_memory()
+                _fold_peak(peak)
+                peak = _PEAKS.pop(stage_id)
+                if _STARTED and not _PEAKS:
+                    tracemalloc.stop()
+                    _STARTED = False
+
+            rss = resident_set_size()
+            if rss is not None:
+                rss_peak[0] = max(rss_peak[0] or 0, rss)
+
+            self._record(
+                name,
+                StageMemory(
+                    python_peak=peak - current_before if measured else None,
+                    python_allocated=current - current_before,
+                    rss_before=rss_before,
+                    rss_peak=rss_peak[0],
+                ),
+            )
+
+    def report(self) -> DataFrame:
+        """DataFrame with the memory used by each stage.
+
+        Returns
+        -------
+        return: DataFrame
+            Memory used by each stage in bytes. Index is the stage's name.
+        """
+
+        return DataFrame(
+            [stage._asdict() for stage in self.stages.values()],
+            index=list(self.stages),
+            columns=list(StageMemory._fields),
+        )
+
+    def _record(self, name: str, memory: StageMemory) -> None:
+        "Combine the memory of a stage with previous stages of the same name."
+
+        previous = self.stages.get(name)
+        if previous is not None:
+            memory = StageMemory(
+                python_peak=_max(previous.python_peak, memory.python_peak),
+                python_allocated=previous.python_allocated + memory.python_allocated,
+                rss_before=previous.rss_before,
+                rss_peak=_max(previous.rss_peak, memory.rss_peak),
+            )
+
+        self.stages[name] = memory
+
+
+def _fold_peak(peak: int) -> None:
+    "Keep a traced peak for every open stage."
+
+    for stage_id, stage_peak in _PEAKS.items():
+        _PEAKS[stage_id] = max(stage_peak, peak)
+
+
+def _max(first: Optional[int], second: Optional[int]) -> Optional[int]:
+    "Largest of two measures, None if neither was measured."
+
+    if first is None or second is None:
+        return second if first is None else first
+    return max(first, second)
+
+
+@contextmanager
+def profile_stage(profiler: Optional[MemoryProfiler], name: str) -> Iterator[None]:
+    "Measure a stage with a profiler, or do nothing if there is no profiler."
+
+    if profiler is None:
+        yield
+    else:
+        with profiler.stage(name):
+            yield
@@ -1,11 +1,24 @@
 "Optimization for Best F1 Team."
-from itertools import combinations, product
-from typing import List, Union
 
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 from pandas import DataFrame
 
 from gridrival.drivers import Driver, FixedInfo
 from gridrival.fantasy import FantasyTeam
+from gridrival.memory import MemoryProfiler, profile_stage
+from gridrival.optimization import kernels
+from gridrival.optimization.constraints import (
+    Constraint,
+    CostBand,
+    compile_constraints,
+    constrained_names,
+    excluded_names,
+)
+from gridrival.optimization.export import CHUNK_SIZE, write_lineups
+from gridrival.optimization.prune import prune_dominated
+from gridrival.optimization.universe import ROSTER_SIZE, Universe, count_combinations
 from gridrival.teams import Team
 
 
@@ -25,6 +38,28 @@ class BasicSolver:
         Drivers and Teams which can not be included in the Fantasy Team.
     budget: int
         Maximum budget for the Fantasy Team.
+    constraints: list of constraints
+        Further rules on the line-ups, such as at most a number of Drivers of a
+        constructor, at least one of a set, two Drivers not together or a cost band.
+    talent_slot: bool
+        If True the Talent Driver is a sixth Driver in a separate slot, otherwise it is
+        one of the five Drivers of the Fantasy Team.
+    memory_budget: int
+        Bytes available to build the universe. If the universe does not fit, it is
+        built in chunks which are filtered as they are built.
+    profiler: MemoryProfiler
+        If given, it measures the memory used by each stage of the solver.
+    prune: bool
+        If True Drivers and Teams dominated by enough cheaper ones with more points are
+        left out before building the universe. The best Fantasy Team is unchanged, but
+        the universe only holds line-ups of the Drivers and Teams left.
+    pruned: int
+        Number of Drivers and Teams left out by pruning.
+    frontier_only: bool
+        True if the constrained universe did not fit in the memory budget and only its
+        cost versus points Pareto frontier is kept.
+    universe: Universe
+        Array-backed universe of Fantasy Teams which meet the constraints.
     """
 
     def __init__(
@@ -34,6 +69,11 @@ class BasicSolver:
         in_constraint: List[Union[Driver, Team]],
         out_constraint: List[Union[Driver, Team]],
         budget: int,
+        talent_slot: bool = False,
+        memory_budget: Optional[int] = None,
+        profiler: Optional[MemoryProfiler] = None,
+        prune: bool = False,
+        constraints: Sequence[Constraint] = (),
     ) -> None:
 
         self.drivers = drivers
@@ -41,58 +81,218 @@ class BasicSolver:
         self.in_constraint = in_constraint
         self.out_constraint = out_constraint
         self.budget = budget
+        self.constraints = list(constraints)
+        self.talent_slot = talent_slot
+        self.memory_budget = memory_budget
+        self.profiler = profiler
+        self.prune = prune
+        self.pruned = 0
+        self.frontier_only = False
 
         self.universe = self._get_constrained_universe()
 
     def solve(self) -> FantasyTeam:
         "Solve for the best Fantasy Team within constraints."
 
-        ft_points = [ft.points() for ft in self.universe]
+        return self.universe[int(np.argmax(self.universe.points))]
 
-        max_points = max(ft_points)
+    def to_dataframe(self) -> DataFrame:
+        "Create DataFrame with all teams that meet the constraints."
 
-        best_ft = [ft for ft in self.universe if ft.points() == max_points]
+        with profile_stage(self.profiler, "to_dataframe"):
+            return self.universe.to_dataframe()
 
-        return best_ft[0]
+    def write_lineups(
+        self, path: str, file_format: str = "parquet", chunk_size: int = CHUNK_SIZE
+    ) -> int:
+        """Write all teams that meet the constraints to a Parquet or Arrow IPC file.
 
-    def to_dataframe(self) -> DataFrame:
-        "Create DataFrame with all teams that meet the constraints."
+        Line-ups are written in chunks as typed columns, with the points of each point
+        component, instead of the object columns of `to_dataframe`.
+
+        Parameters
+        ----------
+        path: str
+            File to write.
+        file_format: str
+            Either "parquet" or "arrow".
+        chunk_size: int
+            Number of line-ups written at once.
+
+        Returns
+        -------
+        return: int
+            Number of line-ups written.
+        """
+
+        return write_lineups(self.universe, path, file_format, chunk_size)
+
+    def pareto_frontier(self) -> DataFrame:
+        """Create DataFrame with the cost versus points Pareto frontier.
+
+        The frontier holds, for every budget up to the solver's budget, the best Fantasy
+        Team within that budget. It is obtained from the universe already built by the
+        solver, with no need to solve again for each budget.
 
-        data = [
-            {
-                "driver_1": ft.drivers[0],
-                "driver_2": ft.drivers[1],
-                "driver_3": ft.drivers[2],
-                "driver_4": ft.drivers[3],
-                "driver_5": ft.drivers[4],
-                "team": ft.team,
-                "talent_driver": ft.talent_driver,
-                "cost": ft.cost(),
-                "points": ft.points(),
-            }
-            for ft in self.universe
-        ]
-
-        return DataFrame(data)
-
-    def _get_constrained_universe(self) -> list:
+        Returns
+        -------
+        return: DataFrame
+            Fantasy Teams in the frontier ordered by increasing cost and points.
+        """
+
+        frontier = self.universe.subset(self.universe.pareto_frontier())
+
+        return frontier.to_dataframe()
+
+    def _get_constrained_universe(self) -> Universe:
         "Get the universe of Fantasy Teams which meet the constraints."
 
-        universe = product(combinations(self.drivers, 5), self.teams)
-        ft_universe = [FantasyTeam(comb[0], comb[1]) for comb in universe]
+        # Excluded Drivers and Teams are left out of the enumeration, so they can not be
+        # picked as Talent Driver in a separate slot either.
+        out_names = {out_element.name for out_element in self.out_constraint}
+        out_names |= excluded_names(self.constraints)
+        drivers = [driver for driver in self.drivers if driver.name not in out_names]
+        teams = [team for team in self.teams if team.name not in out_names]
+
+        if self.prune:
+            drivers, teams = self._prune(drivers, teams)
+
+        self._compiled = compile_constraints(self.constraints, drivers, teams)
+        # A separate Talent Driver has to fit in the cost band as well as the budget.
+        budget = self.budget
+        if self._compiled is not None:
+            budget = min(budget, self._compiled.cost_high)
+
+        estimate = Universe.estimated_nbytes(len(drivers), len(teams))
+        if self.memory_budget is not None and estimate > self.memory_budget:
+            return self._get_chunked_universe(drivers, teams, budget, estimate)
+
+        with profile_stage(self.profiler, "universe build"):
+            universe = Universe.enumerate(
+                drivers,
+                teams,
+                talent_slot=self.talent_slot,
+                budget=budget,
+                where=self._where,
+            )
+
+        with profile_stage(self.profiler, "filtering"):
+            return self._filter(universe)
+
+    def _get_chunked_universe(
+        self,
+        drivers: List[FixedInfo],
+        teams: List[FixedInfo],
+        budget: float,
+        estimate: int,
+    ) -> Universe:
+        "Build the universe in chunks which fit in half of the memory budget."
+
+        n_lineups = max(count_combinations(len(drivers), ROSTER_SIZE) * len(teams), 1)
+        chunk_size = max(self.memory_budget * n_lineups // (2 * estimate), 1)
+        chunks = Universe.enumerate_chunks(
+            drivers,
+            teams,
+            chunk_size,
+            talent_slot=self.talent_slot,
+            budget=budget,
+            where=self._where,
+        )
+
+        kept = []
+        kept_nbytes = 0
+
+        while True:
+            with profile_stage(self.profiler, "universe build"):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+
+            with profile_stage(self.profiler, "filtering"):
+                kept.append(self._filter(chunk))
+                kept_nbytes += kept[-1].nbytes
+
+                # The frontier still holds the best Fantasy Team for every budget.
+                if kept_nbytes > self.memory_budget // 2:
+                    universe = Universe.concatenate(kept)
+                    kept = [universe.subset(universe.pareto_frontier())]
+                    kept_nbytes = kept[0].nbytes
+                    self.frontier_only = True
+
+        if not kept:
+            return Universe.enumerate(drivers, teams, talent_slot=self.talent_slot)
+
+        return Universe.concatenate(kept)
+
+    def _prune(
+        self, drivers: List[FixedInfo], teams: List[FixedInfo]
+    ) -> Tuple[List[FixedInfo], List[FixedInfo]]:
+        "Prune dominated Drivers and Teams which are free of constraints."
+
+        # A cheaper line-up may fall below a cost band, so nothing can be pruned.
+        if any(
+            isinstance(constraint, CostBand) and constraint.low > 0
+            for constraint in self.constraints
+        ):
+            return drivers, teams
+
+        # Drivers and Teams in a constraint can neither be pruned nor replace another.
+        constrained = set(constrained_names(self.constraints))
+        free_drivers, free_teams, self.pruned = prune_dominated(
+            [driver for driver in drivers if driver.name not in constrained],
+            [team for team in teams if team.name not in constrained],
+            self.in_constraint,
+            self.talent_slot,
+        )
+        kept = {element.name for element in free_drivers + free_teams} | constrained
+
+        return (
+            [driver for driver in drivers if driver.name in kept],
+            [team for team in teams if team.name in kept],
+        )
+
+    def _where(self, combs: np.ndarray) -> np.ndarray:
+        "Mask of the combinations of Drivers which may meet the constraints."
+
+        if self._compiled is None:
+            return np.ones(len(combs), dtype=bool)
+
+        # The line-ups built next hold every Team for each combination kept, in order,
+        # so the Teams kept are a mask of those line-ups for `_filter`.
+        teams = self._compiled.team_mask(combs)
+        kept = teams.any(axis=1)
+        self._teams = teams[kept].ravel()
+
+        return kept
+
+    def _filter(self, universe: Universe) -> Universe:
+        "Keep the line-ups which meet the budget and every constraint."
 
-        budget_universe = [ft for ft in ft_universe if ft.cost() <= self.budget]
+        if kernels.jit_enabled():
+            mask = self._jit_mask(universe)
+        else:
+            mask = universe.cost <= self.budget
+            for in_element in self.in_constraint:
+                mask &= universe.contains(in_element)
 
-        constraint_universe = []
+        # Count constraints were checked for each combination and Team in `_where`.
+        if self._compiled is not None:
+            mask &= self._teams & self._compiled.cost_mask(universe)
 
-        for ft in budget_universe:
+        return universe.subset(mask)
 
-            if any(in_element not in ft for in_element in self.in_constraint):
-                continue
+    def _jit_mask(self, universe: Universe) -> np.ndarray:
+        "Mask of the line-ups within budget and with every included Driver and Team."
 
-            if any(out_element in ft for out_element in self.out_constraint):
-                continue
+        in_names = {in_element.name for in_element in self.in_constraint}
+        drivers = [i for i, d in enumerate(universe.drivers) if d.name in in_names]
+        teams = [i for i, t in enumerate(universe.teams) if t.name in in_names]
+        found = {universe.drivers[i].name for i in drivers}
+        found |= {universe.teams[i].name for i in teams}
 
-            constraint_universe.append(ft)
+        if found != in_names:
+            return np.zeros(len(universe), dtype=bool)
 
-        return constraint_universe
+        return kernels.constraint_mask(
+            universe.lineups, universe.team, universe.cost, self.budget, drivers, teams
+        )
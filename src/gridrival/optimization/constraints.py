@@ -0,0 +1,343 @@
+"""Declarative constraints on the line-ups of Fantasy Teams.
+
+Constraints are plain values, such as at most two Drivers of a constructor, at least
+one of a set of Drivers and Teams, two Drivers never picked together or a band of cost.
+They are compiled once for the Drivers and Teams of a universe into a matrix with the
+membership of each Driver and Team in each constraint and the bounds of each count, so
+checking every constraint on every line-up is a single gather and sum.
+
+Compiled constraints also prune the enumeration: Drivers and Teams which can never be
+picked are left out, and combinations of Drivers which break a constraint with any Team
+are dropped before being crossed with the Teams, so constraint-heavy queries build
+smaller universes.
+
+Note
+----
+As with `in_constraint`, a Talent Driver in a separate slot does not count as picked.
+"""
+
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from gridrival.drivers import Driver, FixedInfo
+from gridrival.optimization.universe import ROSTER_SIZE
+from gridrival.teams import Team
+
+Element = Union[Driver, Team, FixedInfo, str]
+
+
+def _names(elements: Iterable[Element]) -> Tuple[str, ...]:
+    "Names of Drivers and Teams, given as objects or names."
+    return tuple(getattr(element, "name", element) for element in elements)
+
+
+class AtMost(NamedTuple):
+    """At most a number of the Drivers and Teams of a set are picked.
+
+    Attributes
+    ----------
+    count: int
+        Largest number of picks from the set.
+    elements: list of Driver, Team or str
+        Drivers and Teams of the set.
+    """
+
+    count: int
+    elements: Sequence[Element]
+
+    @classmethod
+    def from_team(cls, team: Team, count: int) -> "AtMost":
+        "At most a number of the Drivers of a constructor are picked."
+        return cls(count, (team.driver_1, team.driver_2))
+
+
+class AtLeast(NamedTuple):
+    """At least a number of the Drivers and Teams of a set are picked.
+
+    Attributes
+    ----------
+    count: int
+        Smallest number of picks from the set.
+    elements: list of Driver, Team or str
+        Drivers and Teams of the set.
+    """
+
+    count: int
+    elements: Sequence[Element]
+
+
+class NotTogether(NamedTuple):
+    """Two Drivers or Teams are never picked together.
+
+    Attributes
+    ----------
+    first: Driver, Team or str
+        First Driver or Team.
+    second: Driver, Team or str
+        Second Driver or Team.
+    """
+
+    first: Element
+    second: Element
+
+
+class CostBand(NamedTuple):
+    """The cost of the Fantasy Team is within a band.
+
+    Attributes
+    ----------
+    low: float
+        Smallest cost.
+    high: float
+        Largest cost.
+    """
+
+    low: float = 0.0
+    high: float = np.inf
+
+
+Constraint = Union[AtMost, AtLeast, NotTogether, CostBand]
+
+
+class CompiledConstraints:
+    """Constraints compiled for the Drivers and Teams of a universe.
+
+    Every count constraint is a column of membership weights of the Drivers and Teams,
+    with the smallest and largest count of picks allowed. Count constraints which no
+    line-up can break are left out.
+
+    Attributes
+    ----------
+    driver_weights: ndarray
+        Matrix(D, C) with 1 if the Driver (row) is in the set of the constraint
+        (column).
+    team_weights: ndarray
+        Matrix(T, C) with 1 if the Team (row) is in the set of the constraint (column).
+    minimum: ndarray
+        Smallest count of picks of each constraint.
+    maximum: ndarray
+        Largest count of picks of each constraint.
+    cost_low: float
+        Smallest cost of the Fantasy Team.
+    cost_high: float
+        Largest cost of the Fantasy Team.
+
+    Methods
+    -------
+    mask
+        Mask of the line-ups of a universe which meet every constraint.
+    cost_mask
+        Mask of the line-ups of a universe within the band of cost.
+    team_mask
+        Mask of the Teams which may meet the constraints with each combination.
+    combination_mask
+        Mask of the combinations of Drivers which may meet the constraints.
+    """
+
+    def __init__(
+        self,
+        constraints: Iterable[Constraint],
+        drivers: Sequence[FixedInfo],
+        teams: Sequence[FixedInfo],
+    ) -> None:
+
+        driver_index = {driver.name: i for i, driver in enumerate(drivers)}
+        team_index = {team.name: i for i, team in enumerate(teams)}
+
+        columns = []
+        self.cost_low = 0.0
+        self.cost_high = np.inf
+
+        for constraint in constraints:
+            if isinstance(constraint, CostBand):
+                self.cost_low = max(self.cost_low, constraint.low)
+                self.cost_high = min(self.cost_high, constraint.high)
+            elif isinstance(constraint, AtMost):
+                columns.append((_names(constraint.elements), 0, constraint.count))
+            elif isinstance(constraint, AtLeast):
+                columns.append((_names(constraint.elements), constraint.count, np.inf))
+            elif isinstance(constraint, NotTogether):
+                columns.append((_names((constraint.first, constraint.second)), 0, 1))
+            else:
+                raise TypeError(f"Unknown constraint {constraint!r}.")
+
+        self.driver_weights = np.zeros((len(drivers), len(columns)), dtype=np.int8)
+        self.team_weights = np.zeros((len(teams), len(columns)), dtype=np.int8)
+        self.minimum = np.array([column[1] for column in columns], dtype=float)
+        self.maximum = np.array([column[2] for column in columns], dtype=float)
+
+        for c, (names, _, _) in enumerate(columns):
+            for name in set(names):
+                if name in driver_index:
+                    self.driver_weights[driver_index[name], c] = 1
+                if name in team_index:
+                    self.team_weights[team_index[name], c] = 1
+
+        picks = np.minimum(self.driver_weights.sum(axis=0), ROSTER_SIZE)
+        picks += self.team_weights.max(axis=0, initial=0)
+        binding = (self.minimum > 0) | (self.maximum < picks)
+        self.driver_weights = self.driver_weights[:, binding]
+        self.team_weights = self.team_weights[:, binding]
+        self.minimum = self.minimum[binding]
+        self.maximum = self.maximum[binding]
+
+        self._driver_cost = np.array([driver.cost for driver in drivers], dtype=float)
+        self._team_cost = np.array([team.cost for team in teams], dtype=float)
+        self._max_cost = np.sort(self._driver_cost)[-ROSTER_SIZE:].sum()
+        self._max_cost += self._team_cost.max(initial=0)
+
+        # Most Teams share the same membership, so counts are checked once for each.
+        self._team_rows, self._team_row = np.unique(
+            self.team_weights, axis=0, return_inverse=True
+        )
+
+    def mask(self, universe) -> np.ndarray:
+        """Mask of the line-ups of a universe which meet every constraint.
+
+        Parameters
+        ----------
+        universe: Universe
+            Universe of the Drivers and Teams the constraints were compiled for.
+
+        Returns
+        -------
+        return: ndarray
+            Boolean mask of the line-ups which meet every constraint.
+        """
+
+        mask = self.cost_mask(universe)
+
+        if len(self.minimum):
+            counts = self.driver_weights[universe.lineups].sum(axis=1, dtype=np.int16)
+            counts += self.team_weights[universe.team]
+            mask &= ((counts >= self.minimum) & (counts <= self.maximum)).all(axis=1)
+
+        return mask
+
+    def cost_mask(self, universe) -> np.ndarray:
+        """Mask of the line-ups of a universe within the band of cost.
+
+        Parameters
+        ----------
+        universe: Universe
+            Universe of the Drivers and Teams the constraints were compiled for.
+
+        Returns
+        -------
+        return: ndarray
+            Boolean mask of the line-ups within the band of cost.
+        """
+
+        return (universe.cost >= self.cost_low) & (universe.cost <= self.cost_high)
+
+    def team_mask(self, combs: np.ndarray) -> np.ndarray:
+        """Mask of the Teams which may meet the constraints with each combination.
+
+        The count constraints are checked exactly, with the counts of each combination
+        of Drivers added to the counts of each Team. A line-up of a combination and a
+        Team in the mask only has to be checked against the band of cost, and only if
+        it is cheap enough, as the cost of a Talent Driver in a separate slot is not
+        known yet.
+
+        Parameters
+        ----------
+        combs: ndarray
+            Matrix(M, 5) with the index of the Drivers of each combination.
+
+        Returns
+        -------
+        return: ndarray
+            Matrix(M, T) with True for the Teams which may meet every constraint with
+            the combination (row).
+        """
+
+        # Every sum is one Driver at a time, as a gather of the whole array at once
+        # is many times slower on the short rows of a combination.
+        drivers = list(combs.T)
+
+        mask = np.ones((len(combs), len(self._team_cost)), dtype=bool)
+        if self.cost_high < self._max_cost:
+            cost = sum(np.take(self._driver_cost, driver) for driver in drivers)
+            mask &= cost[:, None] + self._team_cost <= self.cost_high
+
+        meets = np.ones((len(combs), len(self._team_rows)), dtype=bool)
+        for c, weights in enumerate(self.driver_weights.T):
+            counts = sum(np.take(weights, driver) for driver in drivers)
+            for u, team_counts in enumerate(self._team_rows[:, c]):
+                total = counts + team_counts
+                meets[:, u] &= (total >= self.minimum[c]) & (total <= self.maximum[c])
+
+        return mask & meets[:, self._team_row]
+
+    def combination_mask(self, combs: np.ndarray) -> np.ndarray:
+        """Mask of the combinations of Drivers which may meet the constraints.
+
+        A combination is dropped when it meets the constraints with no Team, see
+        `team_mask`.
+
+        Parameters
+        ----------
+        combs: ndarray
+            Matrix(M, 5) with the index of the Drivers of each combination.
+
+        Returns
+        -------
+        return: ndarray
+            Boolean mask of the combinations which may meet every constraint.
+        """
+
+        return self.team_mask(combs).any(axis=1)
+
+
+def compile_constraints(
+    constraints: Iterable[Constraint],
+    drivers: Sequence[FixedInfo],
+    teams: Sequence[FixedInfo],
+) -> Optional[CompiledConstraints]:
+    """Compile constraints for the Drivers and Teams of a universe.
+
+    Parameters
+    ----------
+    constraints: list of constraints
+        Constraints on the line-ups.
+    drivers: list of FixedInfo
+        Drivers of the universe.
+    teams: list of FixedInfo
+        Teams of the universe.
+
+    Returns
+    -------
+    return: CompiledConstraints
+        Compiled constraints, None if there are no constraints.
+    """
+
+    constraints = list(constraints)
+    if not constraints:
+        return None
+
+    return CompiledConstraints(constraints, drivers, teams)
+
+
+def excluded_names(constraints: Iterable[Constraint]) -> Set[str]:
+    "Names of the Drivers and Teams which no constraint allows to be picked."
+
+    return {
+        name
+        for constraint in constraints
+        if isinstance(constraint, AtMost) and constraint.count <= 0
+        for name in _names(constraint.elements)
+    }
+
+
+def constrained_names(constraints: Iterable[Constraint]) -> List[str]:
+    "Names of the Drivers and Teams in the set of some constraint."
+
+    names = []
+    for constraint in constraints:
+        if isinstance(constraint, (AtMost, AtLeast)):
+            names.extend(_names(constraint.elements))
+        elif isinstance(constraint, NotTogether):
+            names.extend(_names((constraint.first, constraint.second)))
+
+    return names
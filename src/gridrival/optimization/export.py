@@ -0,0 +1,145 @@
+"""Columnar export of scored universes of Fantasy Teams to Parquet or Arrow IPC.
+
+Drivers and Teams are identified by an entity ID, Drivers first and then Teams, and
+their names are stored once in a dictionary shared by every line-up column. Line-ups
+are written in chunks, so exporting the universe never materializes Fantasy Teams nor
+holds more than a chunk of Arrow data at once.
+
+Requires the optional dependency pyarrow, installed with `gridrival[arrow]`.
+"""
+
+from itertools import chain
+from typing import Iterator, Optional
+
+import numpy as np
+
+from gridrival.optimization.universe import ROSTER_SIZE, Universe
+
+CHUNK_SIZE = 1 << 16
+FORMATS = ("parquet", "arrow")
+
+
+def _import_pyarrow():
+    "Import pyarrow, which is an optional dependency."
+
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Exporting line-ups requires pyarrow. Install it with gridrival[arrow]."
+        )
+
+    return pyarrow
+
+
+def record_batches(
+    universe: Universe, chunk_size: int = CHUNK_SIZE, race: Optional[str] = None
+) -> Iterator:
+    """Arrow record batches with the line-ups of a universe.
+
+    Each line-up has the entity IDs of its Drivers, Team and Talent Driver as
+    dictionary-encoded columns, its cost, its points and its points for each point
+    component when the Drivers and Teams have them.
+
+    Parameters
+    ----------
+    universe: Universe
+        Universe of Fantasy Teams to export.
+    chunk_size: int
+        Number of line-ups in each record batch.
+    race: str
+        Name of the race, stored in a column to combine line-ups of many races.
+
+    Yields
+    ------
+    batch: RecordBatch
+        Line-ups of a chunk of the universe, a single empty batch for an empty
+        universe.
+    """
+
+    pa = _import_pyarrow()
+
+    names = pa.array(
+        [element.name for element in list(universe.drivers) + list(universe.teams)],
+        type=pa.string(),
+    )
+    n_drivers = len(universe.drivers)
+
+    def entity(ids: np.ndarray, mask: Optional[np.ndarray] = None):
+        indices = pa.array(ids.astype(np.int16), type=pa.int16(), mask=mask)
+        return pa.DictionaryArray.from_arrays(indices, names)
+
+    for start in range(0, max(len(universe), 1), chunk_size):
+        chunk = universe.subset(slice(start, start + chunk_size))
+
+        columns = {
+            f"driver_{i + 1}": entity(chunk.lineups[:, i]) for i in range(ROSTER_SIZE)
+        }
+        columns["team"] = entity(chunk.team.astype(np.intp) + n_drivers)
+        columns["talent_driver"] = entity(chunk.talent, mask=chunk.talent < 0)
+        columns["cost"] = pa.array(chunk.cost)
+        columns["points"] = pa.array(chunk.points)
+        for name, points in chunk.component_points().items():
+            columns[f"points_{name}"] = pa.array(points)
+        if race is not None:
+            columns["race"] = pa.DictionaryArray.from_arrays(
+                pa.array(np.zeros(len(chunk), dtype=np.int8)), pa.array([race])
+            )
+
+        yield pa.RecordBatch.from_pydict(
+            columns, metadata={"talent_slot": str(universe.talent_slot)}
+        )
+
+
+def write_lineups(
+    universe: Universe,
+    path: str,
+    file_format: str = "parquet",
+    chunk_size: int = CHUNK_SIZE,
+    race: Optional[str] = None,
+) -> int:
+    """Write the line-ups of a universe to a Parquet or Arrow IPC file.
+
+    Parquet files are compressed and allow predicate pushdown on any column, and Arrow
+    IPC files can be memory mapped.
+
+    Parameters
+    ----------
+    universe: Universe
+        Universe of Fantasy Teams to export.
+    path: str
+        File to write.
+    file_format: str
+        Either "parquet" or "arrow".
+    chunk_size: int
+        Number of line-ups written at once.
+    race: str
+        Name of the race, stored in a column to combine line-ups of many races.
+
+    Returns
+    -------
+    return: int
+        Number of line-ups written.
+    """
+
+    if file_format not in FORMATS:
+        raise ValueError(f"Format must be one of {', '.join(FORMATS)}.")
+
+    pa = _import_pyarrow()
+    batches = record_batches(universe, chunk_size, race)
+    first = next(batches)
+
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(path, first.schema)
+    else:
+        writer = pa.ipc.new_file(path, first.schema)
+
+    rows = 0
+    with writer:
+        for batch in chain([first], batches):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+
+    return rows
@@ -0,0 +1,304 @@
+"""Compiled kernels for the enumeration and filtering of line-ups.
+
+The inner loops of building a universe, which enumerate the combinations of Drivers,
+add up the cost and points of each line-up with every Team, select its Talent Driver
+and filter the line-ups within budget with every included Driver and Team, are written
+as plain loops over a single pass of the line-ups. When Numba is installed, with
+`gridrival[jit]`, they are compiled to machine code and used by `Universe` and
+`BasicSolver`. Otherwise the NumPy path is used, with the same results.
+
+Compilation is cached on disk, so only the first run of an install pays for it.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+JIT_AVAILABLE = numba is not None
+
+_JIT: ContextVar = ContextVar("jit", default=JIT_AVAILABLE)
+
+
+def jit_enabled() -> bool:
+    "True if the compiled kernels are in use."
+    return _JIT.get()
+
+
+def set_jit(enabled: bool) -> None:
+    "Use the compiled kernels, or the NumPy path, in the current context."
+
+    if enabled and not JIT_AVAILABLE:
+        raise ImportError("Compiled kernels require numba. Install gridrival[jit].")
+    _JIT.set(enabled)
+
+
+@contextmanager
+def use_jit(enabled: bool) -> Iterator[bool]:
+    "Use the compiled kernels, or the NumPy path, within a block."
+
+    if enabled and not JIT_AVAILABLE:
+        raise ImportError("Compiled kernels require numba. Install gridrival[jit].")
+
+    token = _JIT.set(enabled)
+    try:
+        yield enabled
+    finally:
+        _JIT.reset(token)
+
+
+def _compile(func):
+    "Compile a kernel with Numba if it is installed."
+
+    if numba is None:
+        return func
+    return numba.njit(cache=True, nogil=True)(func)
+
+
+@_compile
+def _fill_combinations(n, out):
+    k = out.shape[1]
+    current = np.arange(k)
+
+    for row in range(out.shape[0]):
+        out[row, :] = current
+
+        # Advance the rightmost element which is not at its last value.
+        i = k - 1
+        while i >= 0 and current[i] == n - k + i:
+            i -= 1
+        if i < 0:
+            break
+        current[i] += 1
+        for j in range(i + 1, k):
+            current[j] = current[j - 1] + 1
+
+
+@_compile
+def _score_lineups(
+    combs,
+    driver_cost,
+    driver_points,
+    team_cost,
+    team_points,
+    talent_cost,
+    talent_slot,
+    budget,
+    candidates,
+    cost,
+    points,
+    talent,
+):
+    n_teams = team_cost.shape[0]
+    k = combs.shape[1]
+
+    for c in range(combs.shape[0]):
+        comb_cost = driver_cost[combs[c, 0]]
+        comb_points = driver_points[combs[c, 0]]
+        for i in range(1, k):
+            comb_cost += driver_cost[combs[c, i]]
+            comb_points += driver_points[combs[c, i]]
+
+        # Roster Talent Driver: eligible Driver with the most points, first on ties.
+        roster_talent = -1
+        for i in range(k):
+            driver = combs[c, i]
+            if driver_cost[driver] <= talent_cost and (
+                roster_talent < 0
+                or driver_points[driver] > driver_points[roster_talent]
+            ):
+                roster_talent = driver
+
+        for t in range(n_teams):
+            row = c * n_teams + t
+            row_cost = comb_cost + team_cost[t]
+            row_points = comb_points + team_points[t]
+            chosen = roster_talent
+
+            if talent_slot:
+                # Candidates are sorted by points, the first one that fits is chosen.
+                chosen = -1
+                for candidate in candidates:
+                    if driver_cost[candidate] > budget - row_cost:
+                        continue
+                    in_lineup = False
+                    for i in range(k):
+                        if combs[c, i] == candidate:
+                            in_lineup = True
+                    if not in_lineup:
+                        chosen = candidate
+                        break
+
+            if chosen >= 0:
+                row_points += driver_points[chosen]
+                if talent_slot:
+                    row_cost += driver_cost[chosen]
+                    row_points += driver_points[chosen]
+
+            cost[row] = row_cost
+            points[row] = row_points
+            talent[row] = chosen
+
+
+@_compile
+def _constraint_mask(lineups, team, cost, budget, drivers, teams, mask):
+    for row in range(lineups.shape[0]):
+        keep = cost[row] <= budget
+        for driver in drivers:
+            if not keep:
+                break
+            found = False
+            for i in range(lineups.shape[1]):
+                if lineups[row, i] == driver:
+                    found = True
+            keep = found
+        for required_team in teams:
+            keep = keep and team[row] == required_team
+        mask[row] = keep
+
+
+def combinations(n: int, k: int, dtype: np.dtype = np.intp) -> np.ndarray:
+    """Combinations of k elements out of range(n), in lexicographic order.
+
+    Parameters
+    ----------
+    n: int
+        Number of elements.
+    k: int
+        Number of elements in each combination.
+    dtype: dtype
+        Integer type of the combinations.
+
+    Returns
+    -------
+    return: ndarray
+        Matrix(C(n, k), k) with the combinations, as `itertools.combinations`.
+    """
+
+    count = 1 if 0 <= k <= n else 0
+    for i in range(min(k, n - k)):
+        count = count * (n - i) // (i + 1)
+
+    out = np.empty((count, k), dtype=dtype)
+    if count and k:
+        _fill_combinations(n, out)
+
+    return out
+
+
+def score_lineups(
+    combs: np.ndarray,
+    driver_cost: np.ndarray,
+    driver_points: np.ndarray,
+    team_cost: np.ndarray,
+    team_points: np.ndarray,
+    talent_cost: float,
+    talent_slot: bool = False,
+    budget: float = np.inf,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cost, points and Talent Driver of the line-ups of combinations and Teams.
+
+    Line-ups are ordered as `product(combs, teams)`, and are scored in a single pass,
+    with the points added up in the order of the NumPy path.
+
+    Parameters
+    ----------
+    combs: ndarray
+        Matrix(M, 5) with the index of the Drivers of each combination.
+    driver_cost: ndarray
+        Cost of each Driver.
+    driver_points: ndarray
+        Expected points of each Driver, in the type of the points of the line-ups.
+    team_cost: ndarray
+        Cost of each Team.
+    team_points: ndarray
+        Expected points of each Team.
+    talent_cost: float
+        Largest cost of a Talent Driver.
+    talent_slot: bool
+        If True the Talent Driver is chosen outside the five Drivers.
+    budget: float
+        Budget available to pay for a Talent Driver in a separate slot.
+
+    Returns
+    -------
+    return: tuple of ndarray
+        Cost, points and index of the Talent Driver of each line-up, -1 if there is
+        no Talent Driver.
+    """
+
+    n_lineups = len(combs) * len(team_cost)
+    cost = np.empty(n_lineups, dtype=float)
+    points = np.empty(n_lineups, dtype=driver_points.dtype)
+    talent = np.empty(n_lineups, dtype=np.int16)
+
+    eligible = np.flatnonzero(driver_cost <= talent_cost)
+    candidates = eligible[np.argsort(-driver_points[eligible], kind="stable")]
+
+    _score_lineups(
+        np.ascontiguousarray(combs),
+        driver_cost,
+        driver_points,
+        team_cost,
+        team_points.astype(driver_points.dtype),
+        talent_cost,
+        talent_slot,
+        float(budget),
+        candidates,
+        cost,
+        points,
+        talent,
+    )
+
+    return cost, points, talent
+
+
+def constraint_mask(
+    lineups: np.ndarray,
+    team: np.ndarray,
+    cost: np.ndarray,
+    budget: float,
+    drivers: Sequence[int] = (),
+    teams: Sequence[int] = (),
+) -> np.ndarray:
+    """Mask of the line-ups within budget with every included Driver and Team.
+
+    Parameters
+    ----------
+    lineups: ndarray
+        Matrix(N, 5) with the index of the Drivers of each line-up.
+    team: ndarray
+        Index of the Team of each line-up.
+    cost: ndarray
+        Total cost of each line-up.
+    budget: float
+        Maximum budget for the Fantasy Team.
+    drivers: list of int
+        Index of the Drivers which must be included.
+    teams: list of int
+        Index of the Teams which must be included.
+
+    Returns
+    -------
+    return: ndarray
+        Boolean mask of the line-ups which meet the constraints.
+    """
+
+    mask = np.empty(len(cost), dtype=bool)
+    _constraint_mask(
+        lineups,
+        team,
+        cost,
+        float(budget),
+        np.asarray(drivers, dtype=np.intp),
+        np.asarray(teams, dtype=np.intp),
+        mask,
+    )
+
+    return mask
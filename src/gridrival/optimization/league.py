@@ -0,0 +1,332 @@
+"Optimization for the line-ups of many members of the same league."
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from gridrival.drivers import Driver, FixedInfo
+from gridrival.fantasy import FantasyTeam
+from gridrival.optimization.universe import ROSTER_SIZE, Universe
+from gridrival.teams import Team
+
+BATCH_SIZE = 64
+DENSE_FRACTION = 8
+
+
+def binomial_table(n: int, k: int) -> np.ndarray:
+    "Matrix(n + 1, k + 1) with the binomial coefficients C(i, j)."
+
+    table = np.zeros((n + 1, k + 1), dtype=np.int64)
+    table[:, 0] = 1
+    for i in range(1, n + 1):
+        table[i, 1:] = table[i - 1, 1:] + table[i - 1, :-1]
+
+    return table
+
+
+def combinations_array(n: int, k: int) -> np.ndarray:
+    "Matrix(C(n, k), k) with the combinations of k elements out of range(n)."
+
+    combs = list(combinations(range(n), k))
+
+    return np.array(combs, dtype=np.intp).reshape(len(combs), k)
+
+
+class Member(NamedTuple):
+    """A member of the league with its current line-up.
+
+    Attributes
+    ----------
+    drivers: list of Driver
+        The five Drivers in the member's current line-up.
+    team: Team
+        The Team in the member's current line-up.
+    bank: float
+        Budget not spent in the current line-up.
+    transfers: int
+        Maximum number of Drivers and Teams which can be replaced.
+    """
+
+    drivers: Sequence[Union[Driver, FixedInfo]]
+    team: Union[Team, FixedInfo]
+    bank: float
+    transfers: int
+
+
+class Neighbourhood:
+    """Vectorized search of the best line-up around many current line-ups.
+
+    The universe is sorted by points, so the best line-up reachable by a member is the
+    one with the lowest position among the line-ups within its budget and transfers.
+
+    When a member has few transfers its neighbourhood is small, and the line-ups in it
+    are generated directly: every way of swapping up to that many Drivers, with or
+    without swapping the Team, ranked into the universe with the combinatorial number
+    system. When the neighbourhood is a large share of the universe, line-ups are
+    instead one-hot encoded by the Drivers and Team they contain, and a single matrix
+    product gives how many of them each line-up shares with the current line-up of a
+    whole batch of members.
+
+    Attributes
+    ----------
+    universe: Universe
+        Universe of every Fantasy Team, sorted by decreasing points.
+    """
+
+    def __init__(self, universe: Universe) -> None:
+
+        order = np.argsort(-universe.points, kind="stable")
+        self.universe = universe.subset(order)
+        self._position = np.empty(len(order), dtype=np.intp)
+        self._position[order] = np.arange(len(order))
+
+        n_drivers = len(universe.drivers)
+        self._n_teams = len(universe.teams)
+        self._entities = {
+            fixed.name: i for i, fixed in enumerate(universe.drivers + universe.teams)
+        }
+        self._entity_cost = np.array(
+            [fixed.cost for fixed in universe.drivers + universe.teams], dtype=float
+        )
+
+        self._binomial = binomial_table(n_drivers, ROSTER_SIZE)
+        self._keep = [
+            combinations_array(ROSTER_SIZE, ROSTER_SIZE - r)
+            for r in range(ROSTER_SIZE + 1)
+        ]
+        self._add = [
+            combinations_array(n_drivers - ROSTER_SIZE, r)
+            for r in range(ROSTER_SIZE + 1)
+        ]
+
+        self._onehot = np.zeros((len(universe), len(self._entities)), dtype=np.float32)
+        rows = np.arange(len(universe))
+        for column in self.universe.lineups.T:
+            self._onehot[rows, column] = 1
+        self._onehot[rows, self.universe.team.astype(np.intp) + n_drivers] = 1
+
+    def best_positions(self, members: Sequence[Member]) -> np.ndarray:
+        """Position in the universe of the best reachable line-up of each member.
+
+        Parameters
+        ----------
+        members: list of Member
+            Members of the league with their current line-ups.
+
+        Returns
+        -------
+        return: ndarray
+            Position of the best line-up of each member, -1 if none is reachable.
+        """
+
+        best = np.full(len(members), -1, dtype=np.intp)
+        dense = []
+
+        for j, member in enumerate(members):
+            size = self.neighbourhood_size(member.transfers)
+            if size * DENSE_FRACTION <= len(self.universe):
+                best[j] = self._best_neighbour(member)
+            else:
+                dense.append(j)
+
+        if dense:
+            best[dense] = self._best_dense([members[j] for j in dense])
+
+        return best
+
+    def neighbourhood_size(self, transfers: int) -> int:
+        "Number of line-ups reachable with a number of transfers, ignoring budget."
+
+        size = 0
+
+        for r in range(min(transfers, ROSTER_SIZE) + 1):
+            swaps = len(self._keep[r]) * len(self._add[r])
+            size += swaps * (self._n_teams if r < transfers else 1)
+
+        return size
+
+    def _best_neighbour(self, member: Member) -> int:
+        "Best line-up among the generated neighbourhood of the current line-up."
+
+        ids, budget = self._current(member)
+        current = np.sort(ids[:ROSTER_SIZE])
+        outside = np.setdiff1d(np.arange(len(self._binomial) - 1), current)
+        team = ids[ROSTER_SIZE] - (len(self._binomial) - 1)
+
+        indices = []
+        for r in range(min(member.transfers, ROSTER_SIZE) + 1):
+            kept = current[self._keep[r]]
+            added = outside[self._add[r]]
+            lineups = np.concatenate(
+                [
+                    np.repeat(kept, len(added), axis=0),
+                    np.tile(added, (len(kept), 1)),
+                ],
+                axis=1,
+            )
+            lineups.sort(axis=1)
+
+            if r < member.transfers:
+                teams = np.arange(self._n_teams)
+            else:
+                teams = np.array([team])
+            indices.append(
+                (self._rank(lineups)[:, None] * self._n_teams + teams).ravel()
+            )
+
+        positions = self._position[np.concatenate(indices)]
+        positions = positions[self.universe.cost[positions] <= budget]
+
+        return positions.min() if len(positions) else -1
+
+    def _best_dense(self, members: Sequence[Member]) -> np.ndarray:
+        "Best line-up of a batch of members searching the whole universe."
+
+        current = np.zeros((len(self._entities), len(members)), dtype=np.float32)
+        budget = np.empty(len(members))
+        transfers = np.empty(len(members))
+
+        for j, member in enumerate(members):
+            ids, budget[j] = self._current(member)
+            current[ids, j] = 1
+            transfers[j] = member.transfers
+
+        changes = (ROSTER_SIZE + 1) - self._onehot @ current
+        reachable = changes <= transfers
+        reachable &= self.universe.cost[:, None] <= budget
+
+        best = reachable.argmax(axis=0)
+        best[~reachable.any(axis=0)] = -1
+
+        return best
+
+    def _current(self, member: Member) -> Tuple[np.ndarray, float]:
+        "Indices of the Drivers and Team of the current line-up, and the budget."
+
+        ids = np.array(
+            [self._entity(fixed) for fixed in list(member.drivers) + [member.team]]
+        )
+
+        return ids, self._entity_cost[ids].sum() + member.bank
+
+    def _rank(self, lineups: np.ndarray) -> np.ndarray:
+        "Lexicographic rank of sorted line-ups among the combinations of Drivers."
+
+        n_drivers = len(self._binomial) - 1
+        previous = np.column_stack([np.full(len(lineups), -1), lineups[:, :-1]]).astype(
+            np.intp
+        )
+        remaining = ROSTER_SIZE - np.arange(ROSTER_SIZE)
+
+        return (
+            self._binomial[n_drivers - previous - 1, remaining]
+            - self._binomial[n_drivers - lineups, remaining]
+        ).sum(axis=1)
+
+    def _entity(self, fixed: Union[Driver, Team, FixedInfo]) -> int:
+        "Index of a Driver or Team in the one-hot encoding."
+
+        try:
+            return self._entities[fixed.name]
+        except KeyError:
+            raise ValueError(f"{fixed.name} is not available in the universe.")
+
+
+class LeagueSolver:
+    """League Solver obtains the best reachable line-up for many league members at once.
+
+    All the members share a single scored universe of Fantasy Teams, and each member's
+    best line-up is searched for within its budget, given by its current line-up and
+    bank, and within its transfers allowed. Members are solved in batches with a
+    vectorized neighbourhood search, and batches can be split across processes which
+    each keep a copy of the universe.
+
+    Note
+    ----
+    The Talent Driver is always one of the five Drivers of the line-up.
+
+    Attributes
+    ----------
+    drivers: list of FixedInfo
+        List of drivers available for the Fantasy Team.
+    teams: list of FixedInfo
+        List of teams available for the Fantasy Team.
+    processes: int
+        Number of worker processes, if None members are solved in this process.
+    batch_size: int
+        Number of members solved together in a vectorized search.
+    neighbourhood: Neighbourhood
+        Vectorized search over the universe of Fantasy Teams.
+
+    Methods
+    -------
+    solve
+        Solve for the best reachable Fantasy Team of each member.
+    """
+
+    def __init__(
+        self,
+        drivers: List[FixedInfo],
+        teams: List[FixedInfo],
+        processes: Optional[int] = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+
+        self.drivers = drivers
+        self.teams = teams
+        self.processes = processes
+        self.batch_size = batch_size
+
+        self.neighbourhood = Neighbourhood(Universe.enumerate(drivers, teams))
+
+    def solve(self, members: Sequence[Member]) -> List[Optional[FantasyTeam]]:
+        """Solve for the best reachable Fantasy Team of each member.
+
+        Parameters
+        ----------
+        members: list of Member
+            Members of the league with their current line-ups.
+
+        Returns
+        -------
+        return: list of FantasyTeam
+            Best reachable Fantasy Team of each member, None if none is reachable.
+        """
+
+        batches = [
+            members[i : i + self.batch_size]
+            for i in range(0, len(members), self.batch_size)
+        ]
+
+        if self.processes is None:
+            positions = [self.neighbourhood.best_positions(b) for b in batches]
+        else:
+            with ProcessPoolExecutor(
+                self.processes,
+                initializer=_init_worker,
+                initargs=(self.neighbourhood,),
+            ) as executor:
+                positions = list(executor.map(_best_positions, batches))
+
+        universe = self.neighbourhood.universe
+
+        return [
+            universe[position] if position >= 0 else None
+            for position in np.concatenate(positions or [np.empty(0, dtype=int)])
+        ]
+
+
+_NEIGHBOURHOOD: Optional[Neighbourhood] = None
+
+
+def _init_worker(neighbourhood: Neighbourhood) -> None:
+    "Keep the shared universe in the worker process."
+    global _NEIGHBOURHOOD
+    _NEIGHBOURHOOD = neighbourhood
+
+
+def _best_positions(members: Sequence[Member]) -> np.ndarray:
+    "Solve a batch of members in a worker process."
+    return _NEIGHBOURHOOD.best_positions(members)
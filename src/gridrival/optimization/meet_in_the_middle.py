@@ -0,0 +1,299 @@
+"Exact optimization of large pools of Drivers by meet in the middle."
+
+from itertools import combinations
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from gridrival.drivers import Driver, FixedInfo
+from gridrival.fantasy import TALENT_DRIVER_COST, FantasyTeam
+from gridrival.optimization.universe import ROSTER_SIZE, Universe
+from gridrival.teams import Team
+
+
+class Subsets(NamedTuple):
+    """Subsets of the same size of a half of the Drivers.
+
+    Attributes
+    ----------
+    drivers: ndarray
+        Matrix(M, size) with the index of the Drivers of each subset.
+    cost: ndarray
+        Total cost of each subset.
+    points: ndarray
+        Total expected points of each subset.
+    """
+
+    drivers: np.ndarray
+    cost: np.ndarray
+    points: np.ndarray
+
+    def frontier(self, excluded: Optional[int] = None) -> "Subsets":
+        """Cost versus points Pareto frontier of the subsets.
+
+        Parameters
+        ----------
+        excluded: int
+            Index of a Driver whose subsets are left out.
+
+        Returns
+        -------
+        return: Subsets
+            Subsets of the frontier sorted by increasing cost and points.
+        """
+
+        keep = np.ones(len(self.cost), dtype=bool)
+        if excluded is not None:
+            keep = ~(self.drivers == excluded).any(axis=1)
+        candidates = np.flatnonzero(keep)
+
+        order = candidates[
+            np.lexsort((-self.points[candidates], self.cost[candidates]))
+        ]
+        points = self.points[order]
+        best_before = np.maximum.accumulate(np.concatenate([[-np.inf], points[:-1]]))
+        order = order[points > best_before]
+
+        return Subsets(self.drivers[order], self.cost[order], self.points[order])
+
+
+def half_subsets(
+    drivers: np.ndarray, cost: np.ndarray, points: np.ndarray, max_size: int
+) -> List[Subsets]:
+    """Every subset of a half of the Drivers, grouped by size.
+
+    Parameters
+    ----------
+    drivers: ndarray
+        Index of the Drivers of the half.
+    cost: ndarray
+        Cost of every Driver.
+    points: ndarray
+        Expected points of every Driver.
+    max_size: int
+        Largest size of the subsets.
+
+    Returns
+    -------
+    return: list of Subsets
+        Subsets of each size from zero to `max_size`.
+    """
+
+    subsets = []
+
+    for size in range(min(max_size, len(drivers)) + 1):
+        members = list(combinations(drivers, size))
+        members = np.array(members, dtype=np.intp).reshape(len(members), size)
+        subsets.append(
+            Subsets(members, cost[members].sum(axis=1), points[members].sum(axis=1))
+        )
+
+    return subsets
+
+
+class Best(NamedTuple):
+    "Best combination of Drivers found for a Team."
+
+    points: float
+    drivers: Tuple[int, ...]
+    team: int
+
+
+class MeetInTheMiddleSolver:
+    """Meet in the Middle Solver obtains the Fantasy Team with the most expected points
+    which meet the constraints without enumerating every line-up.
+
+    The Drivers are split in two halves, and the subsets of each half are enumerated and
+    grouped by size, keeping only their cost versus points Pareto frontier. A line-up
+    joins a subset of one half with a subset of the other half of the remaining size,
+    and the best partner of each subset within the budget is found by binary search on
+    the other frontier, for every Team at once. The enumeration grows with the square
+    root of the number of line-ups of `BasicSolver`, so pools of 30 or more Drivers are
+    solved exactly.
+
+    The Talent Driver doubles the points of the best eligible Driver of the line-up, or
+    of a sixth Driver in a separate slot, so the search is repeated for each Talent
+    Driver with its points and cost fixed, and with no Talent Driver at all.
+
+    Attributes
+    ----------
+    drivers: list of FixedInfo
+        List of drivers available for the Fantasy Team.
+    teams: list of FixedInfo
+        List of teams available for the Fantasy Team.
+    in_constraint: list of Driver and Team
+        Drivers and Teams which much be included in the Fantasy Team.
+    out_constraint: list of Driver and Team
+        Drivers and Teams which can not be included in the Fantasy Team.
+    budget: int
+        Maximum budget for the Fantasy Team.
+    talent_slot: bool
+        If True the Talent Driver is a sixth Driver in a separate slot, otherwise it is
+        one of the five Drivers of the Fantasy Team.
+
+    Methods
+    -------
+    solve
+        Solve for the best Fantasy Team within constraints.
+    """
+
+    def __init__(
+        self,
+        drivers: List[FixedInfo],
+        teams: List[FixedInfo],
+        in_constraint: List[Union[Driver, Team]],
+        out_constraint: List[Union[Driver, Team]],
+        budget: int,
+        talent_slot: bool = False,
+    ) -> None:
+
+        self.drivers = drivers
+        self.teams = teams
+        self.in_constraint = in_constraint
+        self.out_constraint = out_constraint
+        self.budget = budget
+        self.talent_slot = talent_slot
+
+    def solve(self) -> Optional[FantasyTeam]:
+        """Solve for the best Fantasy Team within constraints.
+
+        Returns
+        -------
+        return: FantasyTeam
+            Best Fantasy Team, None if no Fantasy Team meets the constraints.
+        """
+
+        # Excluded Drivers and Teams are left out, also as Talent Driver.
+        out_names = {out_element.name for out_element in self.out_constraint}
+        in_names = {in_element.name for in_element in self.in_constraint}
+        drivers = [driver for driver in self.drivers if driver.name not in out_names]
+        teams = [team for team in self.teams if team.name not in out_names]
+
+        if in_names - {element.name for element in drivers + teams}:
+            return None
+
+        required = [i for i, driver in enumerate(drivers) if driver.name in in_names]
+        team_index = [i for i, team in enumerate(teams) if team.name in in_names]
+        if len(required) > ROSTER_SIZE or len(team_index) > 1:
+            return None
+        if not team_index:
+            team_index = list(range(len(teams)))
+        if not team_index:
+            return None
+
+        cost = np.array([driver.cost for driver in drivers], dtype=float)
+        points = np.array([driver.points for driver in drivers], dtype=float)
+        team_cost = np.array([teams[i].cost for i in team_index], dtype=float)
+        team_points = np.array([teams[i].points for i in team_index], dtype=float)
+
+        free = np.setdiff1d(np.arange(len(drivers)), required)
+        size = ROSTER_SIZE - len(required)
+        halves = [
+            half_subsets(half, cost, points, size) for half in np.array_split(free, 2)
+        ]
+
+        base_cost = cost[required].sum() + team_cost
+        base_points = points[required].sum() + team_points
+
+        best = None
+        for talent in self._talent_cases(cost, required):
+            case = self._solve_case(
+                halves, size, talent, cost, points, base_cost, base_points, required
+            )
+            if case is not None and (best is None or case.points > best.points):
+                best = Best(case.points, case.drivers, team_index[case.team])
+
+        if best is None:
+            return None
+
+        universe = Universe._from_combinations(
+            drivers,
+            [teams[best.team]],
+            np.array([sorted(best.drivers)], dtype=np.intp),
+            self.talent_slot,
+            self.budget,
+            None,
+        )
+
+        return universe[0]
+
+    def _talent_cases(self, cost: np.ndarray, required: List[int]) -> List[int]:
+        "Talent Drivers to search with, -1 for no Talent Driver."
+
+        eligible = np.flatnonzero(cost <= TALENT_DRIVER_COST)
+        if self.talent_slot:
+            eligible = np.setdiff1d(eligible, required)
+
+        return [-1] + eligible.tolist()
+
+    def _solve_case(
+        self,
+        halves: List[List[Subsets]],
+        size: int,
+        talent: int,
+        cost: np.ndarray,
+        points: np.ndarray,
+        base_cost: np.ndarray,
+        base_points: np.ndarray,
+        required: List[int],
+    ) -> Optional[Best]:
+        "Best Drivers and Team with a given Talent Driver."
+
+        fixed = list(required)
+        budget = self.budget - base_cost
+        bonus = 0.0
+
+        if talent >= 0 and self.talent_slot:
+            bonus = 2 * points[talent]
+            budget = budget - cost[talent]
+        elif talent >= 0:
+            bonus = points[talent]
+            if talent not in required:
+                fixed.append(talent)
+                size -= 1
+                bonus += points[talent]
+                budget = budget - cost[talent]
+
+        if size < 0:
+            return None
+
+        excluded = talent if talent >= 0 else None
+        best = None
+
+        for left_size in range(size + 1):
+            right_size = size - left_size
+            if left_size >= len(halves[0]) or right_size >= len(halves[1]):
+                continue
+
+            left = halves[0][left_size].frontier(excluded)
+            right = halves[1][right_size].frontier(excluded)
+            if not len(left.cost) or not len(right.cost):
+                continue
+
+            # Rows are the Teams and columns the subsets of the left half.
+            partner = (
+                np.searchsorted(
+                    right.cost, budget[:, None] - left.cost[None, :], side="right"
+                )
+                - 1
+            )
+            total = np.where(
+                partner >= 0,
+                left.points[None, :] + right.points[np.maximum(partner, 0)],
+                -np.inf,
+            )
+            total += base_points[:, None]
+
+            team, i = np.unravel_index(np.argmax(total), total.shape)
+            if np.isfinite(total[team, i]) and (
+                best is None or total[team, i] + bonus > best.points
+            ):
+                best = Best(
+                    float(total[team, i] + bonus),
+                    tuple(fixed)
+                    + tuple(left.drivers[i])
+                    + tuple(right.drivers[partner[team, i]]),
+                    int(team),
+                )
+
+        return best
@@ -0,0 +1,137 @@
+"""Dominance pruning of the Drivers and Teams available for a Fantasy Team.
+
+A Driver dominates another when it costs no more and is expected to earn no fewer
+points, with ties broken by their order. A Driver with as many dominators as the other
+Drivers of a line-up plus one can always be swapped for a dominator missing from the
+line-up, for a line-up as cheap with as many points, so it is never needed in a best
+line-up under any budget. The same holds for a Team with a single dominator.
+
+Pruning runs before enumerating line-ups and shrinks `combinations(drivers, 5)`, which
+grows with the fifth power of the number of Drivers.
+"""
+
+from typing import Iterable, List, NamedTuple, Union
+
+import numpy as np
+
+from gridrival.drivers import Driver, FixedInfo
+from gridrival.fantasy import TALENT_DRIVER_COST
+from gridrival.optimization.universe import ROSTER_SIZE
+from gridrival.teams import Team
+
+
+class Pruned(NamedTuple):
+    """Drivers and Teams left after pruning.
+
+    Attributes
+    ----------
+    drivers: list of FixedInfo
+        Drivers which may be in a best Fantasy Team, in their original order.
+    teams: list of FixedInfo
+        Teams which may be in a best Fantasy Team, in their original order.
+    n_pruned: int
+        Number of Drivers and Teams pruned.
+    """
+
+    drivers: List[FixedInfo]
+    teams: List[FixedInfo]
+    n_pruned: int
+
+
+def dominators(
+    cost: np.ndarray, points: np.ndarray, talent: bool = False
+) -> np.ndarray:
+    """Count the dominators of each element.
+
+    Element j dominates element i when it costs no more and has no fewer points, and it
+    is cheaper, has more points or comes first. With `talent`, an element eligible as
+    Talent Driver is only dominated by eligible elements, as the Talent Driver's points
+    are doubled.
+
+    Parameters
+    ----------
+    cost: ndarray
+        Cost of each element.
+    points: ndarray
+        Expected points of each element.
+    talent: bool
+        If True eligibility as Talent Driver is taken into account.
+
+    Returns
+    -------
+    return: ndarray
+        Number of dominators of each element.
+    """
+
+    cost = np.asarray(cost, dtype=float)
+    points = np.asarray(points, dtype=float)
+    index = np.arange(len(cost))
+
+    # Rows are the dominators (j) and columns the dominated elements (i).
+    no_worse = (cost[:, None] <= cost[None, :]) & (points[:, None] >= points[None, :])
+    better = (
+        (cost[:, None] < cost[None, :])
+        | (points[:, None] > points[None, :])
+        | (index[:, None] < index[None, :])
+    )
+    dominates = no_worse & better
+
+    if talent:
+        eligible = cost <= TALENT_DRIVER_COST
+        dominates &= eligible[:, None] | ~eligible[None, :]
+
+    return dominates.sum(axis=0)
+
+
+def prune_dominated(
+    drivers: List[FixedInfo],
+    teams: List[FixedInfo],
+    in_constraint: Iterable[Union[Driver, Team, FixedInfo]] = (),
+    talent_slot: bool = False,
+) -> Pruned:
+    """Prune the Drivers and Teams which are never needed in a best Fantasy Team.
+
+    A Driver is pruned with five dominators, or six when the Talent Driver takes a
+    separate slot, and a Team with one. Drivers and Teams which must be included in the
+    Fantasy Team are never pruned. Excluded Drivers and Teams should be removed
+    beforehand, as they can not replace a pruned one.
+
+    Parameters
+    ----------
+    drivers: list of FixedInfo
+        Drivers available for the Fantasy Team.
+    teams: list of FixedInfo
+        Teams available for the Fantasy Team.
+    in_constraint: list of Driver and Team
+        Drivers and Teams which must be included in the Fantasy Team.
+    talent_slot: bool
+        If True the Talent Driver is a sixth Driver in a separate slot.
+
+    Returns
+    -------
+    return: Pruned
+        Drivers and Teams left, and the number pruned.
+    """
+
+    in_names = {element.name for element in in_constraint}
+    required = ROSTER_SIZE + 1 if talent_slot else ROSTER_SIZE
+
+    def keep(elements: List[FixedInfo], required: int, talent: bool) -> np.ndarray:
+        if not elements:
+            return np.zeros(0, dtype=bool)
+        count = dominators(
+            [element.cost for element in elements],
+            [element.points for element in elements],
+            talent,
+        )
+        fixed = np.array([element.name in in_names for element in elements])
+        return (count < required) | fixed
+
+    keep_drivers = keep(drivers, required, talent=True)
+    keep_teams = keep(teams, 1, talent=False)
+
+    return Pruned(
+        drivers=[driver for driver, kept in zip(drivers, keep_drivers) if kept],
+        teams=[team for team, kept in zip(teams, keep_teams) if kept],
+        n_pruned=int((~keep_drivers).sum() + (~keep_teams).sum()),
+    )
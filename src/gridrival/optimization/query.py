@@ -0,0 +1,216 @@
+"Answer many constrained queries against a single universe of Fantasy Teams."
+
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from gridrival.drivers import Driver, FixedInfo
+from gridrival.fantasy import FantasyTeam
+from gridrival.optimization.universe import Universe
+from gridrival.teams import Team
+
+FIRST_CHUNK = 256
+AFFORDABLE_FRACTION = 4
+
+
+class Query(NamedTuple):
+    """A variant of the optimization problem.
+
+    Attributes
+    ----------
+    budget: float
+        Maximum budget for the Fantasy Team.
+    in_constraint: list of Driver and Team
+        Drivers and Teams which much be included in the Fantasy Team.
+    out_constraint: list of Driver and Team
+        Drivers and Teams which can not be included in the Fantasy Team.
+    """
+
+    budget: float
+    in_constraint: Sequence[Union[Driver, Team]] = ()
+    out_constraint: Sequence[Union[Driver, Team]] = ()
+
+
+class QuerySolver:
+    """Query Solver scores the universe of Fantasy Teams once and then answers many
+    queries with different budgets and constraints.
+
+    The universe is sorted by points, so the answer to a query is the first line-up in
+    that order which meets the query. Every line-up also stores a bitset of the Drivers
+    and Team it contains, and every Driver and Team a posting list with the positions of
+    the line-ups that contain it. A query with included Drivers or Teams only scans the
+    shortest of their posting lists, and a query without them scans the whole order in
+    growing chunks, stopping at the first line-up that meets it. The cheapest cost of
+    the line-ups left to scan is kept along each order, so a scan also stops as soon as
+    no line-up left fits in the budget.
+
+    Tight budgets leave the best line-ups deep in the points order, so when only a small
+    fraction of the universe fits in the budget, the query is instead answered from the
+    line-ups sorted by cost: the affordable ones are a prefix of that order found by
+    binary search, and the answer is the valid one with the best position by points.
+
+    Note
+    ----
+    The Talent Driver is always one of the five Drivers of the line-up.
+
+    Attributes
+    ----------
+    universe: Universe
+        Universe of every Fantasy Team, sorted by decreasing points.
+    postings: list of ndarray
+        Positions in the universe of the line-ups containing each Driver and Team.
+    members: ndarray
+        Matrix(N, W) with the bitset of the Drivers and Teams of each line-up.
+
+    Methods
+    -------
+    solve
+        Solve for the best Fantasy Team of each query.
+    solve_query
+        Solve for the best Fantasy Team of a single query.
+    """
+
+    def __init__(self, drivers: List[FixedInfo], teams: List[FixedInfo]) -> None:
+
+        universe = Universe.enumerate(drivers, teams)
+        order = np.argsort(-universe.points, kind="stable")
+        self.universe = universe.subset(order)
+
+        self._entities = {
+            fixed.name: i for i, fixed in enumerate(list(drivers) + list(teams))
+        }
+        self._min_cost_after = self._suffix_min(self.universe.cost)
+        self._cost_order = np.argsort(self.universe.cost, kind="stable")
+        self._cost_sorted = self.universe.cost[self._cost_order]
+
+        n_entities = len(drivers) + len(teams)
+        entities = np.column_stack(
+            [self.universe.lineups, self.universe.team.astype(np.intp) + len(drivers)]
+        ).astype(np.intp)
+
+        self.members = np.zeros((len(self.universe), n_entities // 64 + 1), np.uint64)
+        rows = np.arange(len(self.universe))
+        for column in entities.T:
+            self.members[rows, column // 64] |= np.left_shift(
+                np.uint64(1), (column % 64).astype(np.uint64)
+            )
+
+        positions = np.argsort(entities, axis=None, kind="stable") // entities.shape[1]
+        counts = np.bincount(entities.ravel(), minlength=n_entities)
+        self.postings = np.split(positions, np.cumsum(counts)[:-1])
+        self._postings_min_cost_after = [
+            self._suffix_min(self.universe.cost[posting]) for posting in self.postings
+        ]
+
+    def solve(
+        self, queries: Iterable[Union[Query, tuple]]
+    ) -> List[Optional[FantasyTeam]]:
+        """Solve for the best Fantasy Team of each query.
+
+        Parameters
+        ----------
+        queries: list of Query
+            Queries, or tuples of budget, in_constraint and out_constraint.
+
+        Returns
+        -------
+        return: list of FantasyTeam
+            Best Fantasy Team of each query, None if no Fantasy Team meets the query.
+        """
+
+        return [self.solve_query(Query(*query)) for query in queries]
+
+    def solve_query(self, query: Query) -> Optional[FantasyTeam]:
+        """Solve for the best Fantasy Team of a single query.
+
+        Parameters
+        ----------
+        query: Query
+            Budget and constraints of the Fantasy Team.
+
+        Returns
+        -------
+        return: FantasyTeam
+            Best Fantasy Team for the query, None if no Fantasy Team meets the query.
+        """
+
+        position = self._first_match(query)
+
+        if position is None:
+            return None
+        return self.universe[position]
+
+    def _first_match(self, query: Query) -> Optional[int]:
+        "Position of the first line-up in the universe that meets the query."
+
+        in_ids = [self._entities.get(element.name) for element in query.in_constraint]
+        out_ids = [self._entities.get(element.name) for element in query.out_constraint]
+        if None in in_ids:
+            return None
+
+        in_mask = self._bitset(in_ids)
+        out_mask = self._bitset([i for i in out_ids if i is not None])
+
+        n_affordable = np.searchsorted(self._cost_sorted, query.budget, side="right")
+        if not in_ids and n_affordable * AFFORDABLE_FRACTION <= len(self.universe):
+            positions = self._cost_order[:n_affordable]
+            valid = self._valid(positions, query.budget, in_mask, out_mask)
+            if valid.any():
+                return int(positions[valid].min())
+            return None
+
+        if in_ids:
+            shortest = min(in_ids, key=lambda i: len(self.postings[i]))
+            candidates = self.postings[shortest]
+            min_cost_after = self._postings_min_cost_after[shortest]
+        else:
+            candidates = None
+            min_cost_after = self._min_cost_after
+
+        n_candidates = len(min_cost_after)
+        start, chunk = 0, FIRST_CHUNK
+
+        while start < n_candidates and min_cost_after[start] <= query.budget:
+            stop = min(start + chunk, n_candidates)
+            if candidates is None:
+                positions = np.arange(start, stop)
+            else:
+                positions = candidates[start:stop]
+
+            valid = self._valid(positions, query.budget, in_mask, out_mask)
+            if valid.any():
+                return int(positions[valid.argmax()])
+
+            start, chunk = stop, chunk * 2
+
+        return None
+
+    def _valid(
+        self,
+        positions: np.ndarray,
+        budget: float,
+        in_mask: np.ndarray,
+        out_mask: np.ndarray,
+    ) -> np.ndarray:
+        "Mask of the line-ups at the positions which meet budget and constraints."
+
+        members = self.members[positions]
+        valid = self.universe.cost[positions] <= budget
+        valid &= ((members & in_mask) == in_mask).all(axis=1)
+        valid &= ((members & out_mask) == 0).all(axis=1)
+
+        return valid
+
+    @staticmethod
+    def _suffix_min(cost: np.ndarray) -> np.ndarray:
+        "Cheapest cost from each position to the end."
+        return np.minimum.accumulate(cost[::-1])[::-1]
+
+    def _bitset(self, ids: List[int]) -> np.ndarray:
+        "Bitset with the given Drivers and Teams."
+
+        bitset = np.zeros(self.members.shape[1], dtype=np.uint64)
+        for i in ids:
+            bitset[i // 64] |= np.uint64(1) << np.uint64(i % 64)
+
+        return bitset
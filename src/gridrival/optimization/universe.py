@@ -0,0 +1,599 @@
+"Array-backed universe of Fantasy Teams."
+
+from itertools import combinations, islice
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+from pandas import DataFrame
+
+from gridrival.drivers import FixedInfo
+from gridrival.dtypes import points_dtype
+from gridrival.fantasy import TALENT_DRIVER_COST, EmptyDriver, FantasyTeam
+from gridrival.optimization import kernels
+
+ROSTER_SIZE = 5
+
+# Arrays created while enumerating a line-up, relative to the arrays kept for it.
+ENUMERATION_OVERHEAD = 3
+
+
+def count_combinations(n: int, k: int) -> int:
+    "Number of combinations of k elements out of n."
+
+    if not 0 <= k <= n:
+        return 0
+
+    count = 1
+    for i in range(min(k, n - k)):
+        count = count * (n - i) // (i + 1)
+
+    return count
+
+
+def index_dtype(size: int) -> np.dtype:
+    "Smallest unsigned integer type able to index size elements."
+    return np.min_scalar_type(max(size - 1, 0))
+
+
+def roster_talent_drivers(
+    lineups: np.ndarray, driver_cost: np.ndarray, driver_points: np.ndarray
+) -> np.ndarray:
+    """Select the Talent Driver among the Drivers of each line-up.
+
+    The Talent Driver is the argmax of the Drivers' points over the mask of Drivers
+    eligible by cost, computed for all line-ups at once. Ties are broken by the position
+    in the line-up.
+
+    Parameters
+    ----------
+    lineups: ndarray
+        Matrix(N, 5) with the index of the Drivers of each line-up.
+    driver_cost: ndarray
+        Cost of each Driver.
+    driver_points: ndarray
+        Expected points of each Driver.
+
+    Returns
+    -------
+    talent: ndarray
+        Index of the Talent Driver of each line-up, -1 if no Driver is eligible.
+    """
+
+    eligible = driver_cost[lineups] <= TALENT_DRIVER_COST
+    scores = np.where(eligible, driver_points[lineups], -np.inf)
+    best = scores.argmax(axis=1)
+
+    talent = lineups[np.arange(len(lineups)), best].astype(np.int16)
+    talent[~eligible.any(axis=1)] = -1
+
+    return talent
+
+
+def slot_talent_drivers(
+    lineups: np.ndarray,
+    driver_cost: np.ndarray,
+    driver_points: np.ndarray,
+    remaining: Union[float, np.ndarray] = np.inf,
+) -> np.ndarray:
+    """Select the Talent Driver of each line-up for a separate Talent Driver slot.
+
+    The Talent Driver is the eligible Driver with the most points which is not in the
+    line-up and fits in the remaining budget. Candidates are visited once in order of
+    points, each one assigned at once to every line-up still without Talent Driver, so
+    the cost is linear in the number of line-ups times the number of eligible Drivers.
+
+    Parameters
+    ----------
+    lineups: ndarray
+        Matrix(N, 5) with the index of the Drivers of each line-up.
+    driver_cost: ndarray
+        Cost of each Driver.
+    driver_points: ndarray
+        Expected points of each Driver.
+    remaining: float or ndarray
+        Budget left for the Talent Driver by each line-up.
+
+    Returns
+    -------
+    talent: ndarray
+        Index of the Talent Driver of each line-up, -1 if no Driver is available.
+    """
+
+    talent = np.full(len(lineups), -1, dtype=np.int16)
+
+    candidates = np.flatnonzero(driver_cost <= TALENT_DRIVER_COST)
+    order = np.argsort(-driver_points[candidates], kind="stable")
+
+    for candidate in candidates[order]:
+        free = (
+            (talent < 0)
+            & (driver_cost[candidate] <= remaining)
+            & ~(lineups == candidate).any(axis=1)
+        )
+        talent[free] = candidate
+        if (talent >= 0).all():
+            break
+
+    return talent
+
+
+class Universe:
+    """Universe of Fantasy Teams stored as arrays.
+
+    Each line-up is stored as the indices of its Drivers, Team and Talent Driver, plus
+    its precomputed cost and points. This takes a few dozen bytes per line-up instead of
+    one Python object per Fantasy Team, and Fantasy Teams are only built when a line-up
+    is accessed.
+
+    The Talent Driver is either one of the five Drivers of the line-up, or when
+    `talent_slot` is set, a sixth Driver in a separate slot whose cost is added to the
+    line-up and whose points are awarded double.
+
+    Attributes
+    ----------
+    drivers: list of FixedInfo
+        Drivers available for the Fantasy Teams.
+    teams: list of FixedInfo
+        Teams available for the Fantasy Teams.
+    lineups: ndarray
+        Matrix(N, 5) with the index of the Drivers of each line-up.
+    team: ndarray
+        Index of the Team of each line-up.
+    talent: ndarray
+        Index of the Talent Driver of each line-up, -1 if there is no Talent Driver.
+    cost: ndarray
+        Total cost of each line-up.
+    points: ndarray
+        Total expected points of each line-up.
+    talent_slot: bool
+        If True the Talent Driver is not one of the five Drivers of the line-up.
+
+    Methods
+    -------
+    enumerate
+        Create the universe with every line-up of five Drivers and one Team.
+    enumerate_chunks
+        Create the universe in chunks of line-ups.
+    concatenate
+        Join universes of the same Drivers and Teams.
+    estimated_nbytes
+        Estimate the memory needed to enumerate a universe.
+    nbytes
+        Memory used by the arrays of the universe.
+    subset
+        Keep only the line-ups selected by a mask or an array of indices.
+    contains
+        Mask of the line-ups which contain a Driver or Team.
+    pareto_frontier
+        Indices of the line-ups in the cost versus points Pareto frontier.
+    component_points
+        Expected points of each line-up for each point component.
+    to_dataframe
+        Create DataFrame with the line-ups.
+    """
+
+    def __init__(
+        self,
+        drivers: List[FixedInfo],
+        teams: List[FixedInfo],
+        lineups: np.ndarray,
+        team: np.ndarray,
+        talent: np.ndarray,
+        cost: np.ndarray,
+        points: np.ndarray,
+        talent_slot: bool = False,
+    ) -> None:
+
+        self.drivers = drivers
+        self.teams = teams
+        self.lineups = lineups
+        self.team = team
+        self.talent = talent
+        self.cost = cost
+        self.points = points
+        self.talent_slot = talent_slot
+
+    @classmethod
+    def enumerate(
+        cls,
+        drivers: List[FixedInfo],
+        teams: List[FixedInfo],
+        talent_slot: bool = False,
+        budget: float = np.inf,
+        dtype: Optional[np.dtype] = None,
+        where: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    ) -> "Universe":
+        """Create the universe with every line-up of five Drivers and one Team.
+
+        Line-ups are ordered as `product(combinations(drivers, 5), teams)`.
+
+        Parameters
+        ----------
+        drivers: list of FixedInfo
+            Drivers available for the Fantasy Teams.
+        teams: list of FixedInfo
+            Teams available for the Fantasy Teams.
+        talent_slot: bool
+            If True the Talent Driver is chosen outside the five Drivers.
+        budget: float
+            Budget available to pay for a Talent Driver in a separate slot.
+        dtype: dtype
+            Type of the points, by default the points type of the data types policy.
+            Costs are always float64.
+        where: callable
+            Mask of the combinations of Drivers to keep, given a Matrix(M, 5) with
+            their indices. By default every combination is kept.
+
+        Returns
+        -------
+        return: Universe
+            Universe with every possible line-up.
+        """
+
+        if kernels.jit_enabled():
+            combs = kernels.combinations(
+                len(drivers), ROSTER_SIZE, index_dtype(len(drivers))
+            )
+        else:
+            combs = np.array(
+                list(combinations(range(len(drivers)), ROSTER_SIZE)),
+                dtype=index_dtype(len(drivers)),
+            ).reshape(-1, ROSTER_SIZE)
+
+        if where is not None:
+            combs = combs[where(combs)]
+
+        return cls._from_combinations(drivers, teams, combs, talent_slot, budget, dtype)
+
+    @classmethod
+    def enumerate_chunks(
+        cls,
+        drivers: List[FixedInfo],
+        teams: List[FixedInfo],
+        chunk_size: int,
+        talent_slot: bool = False,
+        budget: float = np.inf,
+        dtype: Optional[np.dtype] = None,
+        where: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    ) -> Iterator["Universe"]:
+        """Create the universe in chunks of line-ups.
+
+        Chunks follow the order of `enumerate`, and hold every Team for each
+        combination of Drivers, so only a chunk of the universe is in memory at once.
+
+        Parameters
+        ----------
+        drivers: list of FixedInfo
+            Drivers available for the Fantasy Teams.
+        teams: list of FixedInfo
+            Teams available for the Fantasy Teams.
+        chunk_size: int
+            Approximate number of line-ups in each chunk.
+        talent_slot: bool
+            If True the Talent Driver is chosen outside the five Drivers.
+        budget: float
+            Budget available to pay for a Talent Driver in a separate slot.
+        dtype: dtype
+            Type of the points, by default the points type of the data types policy.
+        where: callable
+            Mask of the combinations of Drivers to keep, given a Matrix(M, 5) with
+            their indices. By default every combination is kept.
+
+        Yields
+        ------
+        chunk: Universe
+            Universe with a chunk of the line-ups.
+        """
+
+        n_combs = max(chunk_size // max(len(teams), 1), 1)
+        all_combs = combinations(range(len(drivers)), ROSTER_SIZE)
+
+        while True:
+            combs = np.array(
+                list(islice(all_combs, n_combs)), dtype=index_dtype(len(drivers))
+            ).reshape(-1, ROSTER_SIZE)
+            if not len(combs):
+                return
+            if where is not None:
+                combs = combs[where(combs)]
+
+            yield cls._from_combinations(
+                drivers, teams, combs, talent_slot, budget, dtype
+            )
+
+    @classmethod
+    def _from_combinations(
+        cls,
+        drivers: List[FixedInfo],
+        teams: List[FixedInfo],
+        combs: np.ndarray,
+        talent_slot: bool,
+        budget: float,
+        dtype: Optional[np.dtype],
+    ) -> "Universe":
+        "Create the line-ups of the combinations of Drivers with every Team."
+
+        driver_cost = np.array([driver.cost for driver in drivers], dtype=float)
+        dtype = points_dtype(dtype)
+        driver_points = np.array([driver.points for driver in drivers], dtype=dtype)
+        team_cost = np.array([team.cost for team in teams], dtype=float)
+        team_points = np.array([team.points for team in teams], dtype=dtype)
+
+        n_teams = len(teams)
+        lineups = np.repeat(combs, n_teams, axis=0)
+        team = np.tile(np.arange(n_teams, dtype=index_dtype(n_teams)), len(combs))
+
+        if kernels.jit_enabled():
+            cost, points, talent = kernels.score_lineups(
+                combs,
+                driver_cost,
+                driver_points,
+                team_cost,
+                team_points,
+                TALENT_DRIVER_COST,
+                talent_slot,
+                budget,
+            )
+        else:
+            cost = np.repeat(driver_cost[combs].sum(axis=1), n_teams)
+            cost += team_cost[team]
+            points = np.repeat(driver_points[combs].sum(axis=1), n_teams)
+            points += team_points[team]
+
+            if talent_slot:
+                talent = slot_talent_drivers(
+                    lineups, driver_cost, driver_points, budget - cost
+                )
+            else:
+                talent = np.repeat(
+                    roster_talent_drivers(combs, driver_cost, driver_points), n_teams
+                )
+
+            has_talent = talent >= 0
+            talent_points = np.where(has_talent, driver_points[talent], 0)
+            points += talent_points
+
+            if talent_slot:
+                cost += np.where(has_talent, driver_cost[talent], 0)
+                points += talent_points
+
+        return cls(
+            drivers=drivers,
+            teams=teams,
+            lineups=lineups,
+            team=team,
+            talent=talent,
+            cost=cost,
+            points=points,
+            talent_slot=talent_slot,
+        )
+
+    @classmethod
+    def concatenate(cls, universes: Sequence["Universe"]) -> "Universe":
+        """Join universes of the same Drivers and Teams.
+
+        Parameters
+        ----------
+        universes: list of Universe
+            Universes to join, at least one.
+
+        Returns
+        -------
+        return: Universe
+            Universe with the line-ups of every universe in order.
+        """
+
+        first = universes[0]
+
+        return cls(
+            drivers=first.drivers,
+            teams=first.teams,
+            lineups=np.concatenate([u.lineups for u in universes]),
+            team=np.concatenate([u.team for u in universes]),
+            talent=np.concatenate([u.talent for u in universes]),
+            cost=np.concatenate([u.cost for u in universes]),
+            points=np.concatenate([u.points for u in universes]),
+            talent_slot=first.talent_slot,
+        )
+
+    @staticmethod
+    def estimated_nbytes(
+        n_drivers: int, n_teams: int, dtype: Optional[np.dtype] = None
+    ) -> int:
+        """Estimate the memory needed to enumerate a universe.
+
+        Parameters
+        ----------
+        n_drivers: int
+            Number of Drivers available.
+        n_teams: int
+            Number of Teams available.
+        dtype: dtype
+            Type of the points, by default the points type of the data types policy.
+
+        Returns
+        -------
+        return: int
+            Bytes of the arrays of the universe and the temporary arrays needed to
+            create it.
+        """
+
+        lineup_nbytes = (
+            ROSTER_SIZE * index_dtype(n_drivers).itemsize
+            + index_dtype(n_teams).itemsize
+            + np.dtype(np.int16).itemsize
+            + np.dtype(float).itemsize
+            + points_dtype(dtype).itemsize
+        )
+        n_lineups = count_combinations(n_drivers, ROSTER_SIZE) * n_teams
+
+        return n_lineups * lineup_nbytes * ENUMERATION_OVERHEAD
+
+    @property
+    def nbytes(self) -> int:
+        "Memory used by the arrays of the universe."
+
+        return sum(
+            array.nbytes
+            for array in (self.lineups, self.team, self.talent, self.cost, self.points)
+        )
+
+    def subset(self, selection: np.ndarray) -> "Universe":
+        """Keep only the line-ups selected by a mask or an array of indices.
+
+        Parameters
+        ----------
+        selection: ndarray
+            Boolean mask or indices of the line-ups to keep.
+
+        Returns
+        -------
+        return: Universe
+            Universe with only the selected line-ups.
+        """
+
+        return Universe(
+            drivers=self.drivers,
+            teams=self.teams,
+            lineups=self.lineups[selection],
+            team=self.team[selection],
+            talent=self.talent[selection],
+            cost=self.cost[selection],
+            points=self.points[selection],
+            talent_slot=self.talent_slot,
+        )
+
+    def contains(self, element: Union[FixedInfo, object]) -> np.ndarray:
+        """Mask of the line-ups which contain a Driver or Team.
+
+        Elements are matched by name, so Drivers, Teams and FixedInfo can be used. A
+        Talent Driver in a separate slot does not count as contained in the line-up.
+
+        Parameters
+        ----------
+        element: Driver, Team or FixedInfo
+            Element to look for in the line-ups.
+
+        Returns
+        -------
+        return: ndarray
+            Boolean mask of the line-ups containing the element.
+        """
+
+        mask = np.zeros(len(self), dtype=bool)
+
+        for i, driver in enumerate(self.drivers):
+            if driver.name == element.name:
+                mask |= (self.lineups == i).any(axis=1)
+
+        for i, team in enumerate(self.teams):
+            if team.name == element.name:
+                mask |= self.team == i
+
+        return mask
+
+    def pareto_frontier(self) -> np.ndarray:
+        """Indices of the line-ups in the cost versus points Pareto frontier.
+
+        A line-up is in the frontier if every cheaper line-up has fewer points. The
+        best line-up for any budget is then the most expensive line-up of the frontier
+        within the budget.
+
+        The frontier is computed with a single sort by cost, and a single scan keeping
+        the line-ups which improve the best points found so far.
+
+        Returns
+        -------
+        frontier: ndarray
+            Indices of the frontier line-ups, ordered by increasing cost and points.
+        """
+
+        order = np.lexsort((-self.points, self.cost))
+        points = self.points[order]
+
+        best_before = np.maximum.accumulate(points)
+        improves = np.empty(len(points), dtype=bool)
+        improves[:1] = True
+        improves[1:] = points[1:] > best_before[:-1]
+
+        return order[improves]
+
+    def component_points(self) -> Dict[str, np.ndarray]:
+        """Expected points of each line-up for each point component.
+
+        The points of each component are added up for the line-up in the same way as
+        the total points, and team points are added to the driver component of the
+        same name, so the components of a line-up add up to its points.
+
+        Returns
+        -------
+        return: dict
+            Points of each line-up for each component. Key is the component's name.
+            Empty if any Driver or Team has no points by component.
+        """
+
+        fixed = list(self.drivers) + list(self.teams)
+        if any(getattr(element, "components", None) is None for element in fixed):
+            return {}
+
+        names = dict.fromkeys(name for element in fixed for name in element.components)
+        has_talent = self.talent >= 0
+        talent_factor = 2 if self.talent_slot else 1
+        components = {}
+
+        for name in names:
+            driver_points = np.array(
+                [driver.components.get(name, 0) for driver in self.drivers],
+                dtype=self.points.dtype,
+            )
+            team_points = np.array(
+                [team.components.get(name, 0) for team in self.teams],
+                dtype=self.points.dtype,
+            )
+
+            points = driver_points[self.lineups].sum(axis=1) + team_points[self.team]
+            points += talent_factor * np.where(
+                has_talent, driver_points[self.talent], 0
+            )
+            components[name] = points
+
+        return components
+
+    def to_dataframe(self) -> DataFrame:
+        """Create DataFrame with the line-ups.
+
+        Returns
+        -------
+        return: DataFrame
+            Drivers, Team, Talent Driver, cost and points of each line-up.
+        """
+
+        drivers = np.empty(len(self.drivers) + 1, dtype=object)
+        drivers[:-1] = self.drivers
+        drivers[-1] = EmptyDriver
+        teams = np.empty(len(self.teams), dtype=object)
+        teams[:] = self.teams
+
+        data = {
+            f"driver_{i + 1}": drivers[self.lineups[:, i]] for i in range(ROSTER_SIZE)
+        }
+        data["team"] = teams[self.team]
+        data["talent_driver"] = drivers[self.talent]
+        data["cost"] = self.cost
+        data["points"] = self.points
+
+        return DataFrame(data)
+
+    def __len__(self) -> int:
+        return len(self.cost)
+
+    def __getitem__(self, i: int) -> FantasyTeam:
+        talent = self.talent[i]
+        return FantasyTeam(
+            tuple(self.drivers[j] for j in self.lineups[i]),
+            self.teams[self.team[i]],
+            self.drivers[talent] if talent >= 0 else EmptyDriver,
+        )
+
+    def __iter__(self) -> Iterator[FantasyTeam]:
+        return (self[i] for i in range(len(self)))
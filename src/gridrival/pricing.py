@@ -0,0 +1,307 @@
+"""Projection of the price changes of Drivers and Teams.
+
+After each race the league moves the cost of every Driver and Team towards the default
+salary of the rank of its fantasy points in that race. The change is a fraction of the
+gap between the default salary and the current cost, rounded towards zero to a salary
+step and capped, so prices react to performance against the level expected for their
+price.
+
+Price changes are projected from the points of simulated races, for every scenario,
+Driver and Team at once, race after race.
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+from pandas import DataFrame
+
+from gridrival.drivers import FixedInfo
+from gridrival.simulation import QUANTILES, SeasonSimulator
+
+DRIVER_TOP_SALARY = 34.0 * 1e6
+DRIVER_SALARY_STEP = 1.6 * 1e6
+DRIVER_MAX_CHANGE = 2.0 * 1e6
+TEAM_TOP_SALARY = 30.0 * 1e6
+TEAM_SALARY_STEP = 3.0 * 1e6
+TEAM_MAX_CHANGE = 3.0 * 1e6
+ADJUSTMENT_RATE = 4
+PRICE_STEP = 0.1 * 1e6
+
+
+def default_salaries(size: int, top: float, step: float) -> np.ndarray:
+    "Default salary of each rank of fantasy points, starting at rank 1."
+    return top - step * np.arange(size)
+
+
+def price_changes(
+    cost: np.ndarray,
+    points: np.ndarray,
+    salaries: np.ndarray,
+    max_change: float,
+) -> np.ndarray:
+    """Price change of each Driver or Team after a race.
+
+    Computed at once for every scenario given in the leading dimensions.
+
+    Parameters
+    ----------
+    cost: ndarray
+        Cost of each Driver or Team before the race, with shape (..., N).
+    points: ndarray
+        Fantasy points of each Driver or Team in the race, with shape (..., N).
+    salaries: ndarray
+        Default salary of each rank of fantasy points.
+    max_change: float
+        Largest price change, up or down.
+
+    Returns
+    -------
+    return: ndarray
+        Price change of each Driver or Team with the shape of the costs.
+    """
+
+    order = np.argsort(-np.asarray(points), axis=-1, kind="stable")
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(order.shape[-1]), axis=-1)
+
+    gap = (salaries[rank] - cost) / ADJUSTMENT_RATE
+    change = np.trunc(np.round(gap / PRICE_STEP, 6)) * PRICE_STEP
+
+    return np.clip(change, -max_change, max_change)
+
+
+def project_prices(
+    cost: np.ndarray,
+    points: Sequence[np.ndarray],
+    salaries: np.ndarray,
+    max_change: float,
+) -> np.ndarray:
+    """Cost of each Driver or Team after each race.
+
+    Parameters
+    ----------
+    cost: ndarray
+        Current cost of each Driver or Team, with shape (N).
+    points: list of ndarray
+        Fantasy points of each race, each with shape (..., N).
+    salaries: ndarray
+        Default salary of each rank of fantasy points.
+    max_change: float
+        Largest price change after a race, up or down.
+
+    Returns
+    -------
+    return: ndarray
+        Cost after each race, with shape (R, ..., N).
+    """
+
+    costs = []
+    current = np.asarray(cost, dtype=float)
+
+    for race_points in points:
+        current = current + price_changes(current, race_points, salaries, max_change)
+        costs.append(current)
+
+    return np.stack(costs)
+
+
+def with_projected_costs(
+    fixed: Sequence[FixedInfo], costs: Mapping[str, float]
+) -> List[FixedInfo]:
+    """Fixed info of Drivers or Teams with projected costs.
+
+    Parameters
+    ----------
+    fixed: list of FixedInfo
+        Drivers or Teams for the solvers.
+    costs: dict
+        Projected cost of each Driver or Team. Key is the name.
+
+    Returns
+    -------
+    return: list of FixedInfo
+        Fixed info with the projected costs, and the same points.
+    """
+
+    return [
+        FixedInfo(
+            name=element.name,
+            cost=costs.get(element.name, element.cost),
+            points=element.points,
+            components=element.components,
+        )
+        for element in fixed
+    ]
+
+
+class PriceProjection:
+    """Price Projection simulates the price changes of Drivers and Teams.
+
+    The races of a season simulator are sampled, and the price of every Driver and Team
+    moves after each race with its rank of fantasy points in that race. Every scenario
+    is projected at once with array operations.
+
+    The points of the simulated races have the expected points of the grids as their
+    mean, except for beat team mate points which follow the sampled finishing orders,
+    see `SeasonSimulator`. The mean points of each race are kept to check the
+    projection against them.
+
+    Attributes
+    ----------
+    simulator: SeasonSimulator
+        Simulator of the points of every race of the season.
+    driver_cost: ndarray
+        Current cost of each Driver of the simulator.
+    team_cost: ndarray
+        Current cost of each Team of the simulator.
+    driver_changes: ndarray
+        Matrix(S, R, N) with the price change of each Driver after each race.
+    team_changes: ndarray
+        Matrix(S, R, T) with the price change of each Team after each race.
+    driver_points: ndarray
+        Matrix(R, N) with the mean fantasy points of each Driver in each race.
+    team_points: ndarray
+        Matrix(R, T) with the mean fantasy points of each Team in each race.
+
+    Methods
+    -------
+    run
+        Project the prices of many scenarios.
+    expected_costs
+        Expected cost of each Driver and Team after a number of races.
+    summary
+        DataFrame with the distribution of the price change after a number of races.
+    """
+
+    def __init__(
+        self,
+        simulator: SeasonSimulator,
+        driver_cost: Mapping[str, float],
+        team_cost: Mapping[str, float],
+    ) -> None:
+
+        self.simulator = simulator
+        self.driver_cost = np.array(
+            [driver_cost[name] for name in simulator.drivers], dtype=float
+        )
+        self.team_cost = np.array(
+            [team_cost[name] for name in simulator.teams], dtype=float
+        )
+        self.driver_changes: Optional[np.ndarray] = None
+        self.team_changes: Optional[np.ndarray] = None
+        self.driver_points: Optional[np.ndarray] = None
+        self.team_points: Optional[np.ndarray] = None
+
+        self._driver_salaries = default_salaries(
+            len(simulator.drivers), DRIVER_TOP_SALARY, DRIVER_SALARY_STEP
+        )
+        self._team_salaries = default_salaries(
+            len(simulator.teams), TEAM_TOP_SALARY, TEAM_SALARY_STEP
+        )
+
+    def run(self, samples: int, seed: Optional[int] = None) -> "PriceProjection":
+        """Project the prices of many scenarios.
+
+        Parameters
+        ----------
+        samples: int
+            Number of scenarios.
+        seed: int
+            Seed of the random stream. If None results are not reproducible.
+
+        Returns
+        -------
+        return: PriceProjection
+            The projection itself, with the price changes of every scenario.
+        """
+
+        rng = np.random.default_rng(np.random.SeedSequence(seed))
+        driver_points, team_points = zip(*self.simulator.race_points(samples, rng))
+
+        driver_costs = project_prices(
+            self.driver_cost, driver_points, self._driver_salaries, DRIVER_MAX_CHANGE
+        )
+        team_costs = project_prices(
+            self.team_cost, team_points, self._team_salaries, TEAM_MAX_CHANGE
+        )
+
+        self.driver_changes = _changes(self.driver_cost, driver_costs)
+        self.team_changes = _changes(self.team_cost, team_costs)
+        self.driver_points = np.mean(driver_points, axis=1)
+        self.team_points = np.mean(team_points, axis=1)
+
+        return self
+
+    def expected_costs(self, races: Optional[int] = None) -> Dict[str, float]:
+        """Expected cost of each Driver and Team after a number of races.
+
+        Parameters
+        ----------
+        races: int
+            Number of races, by default every race of the season.
+
+        Returns
+        -------
+        return: dict
+            Expected cost of each Driver and Team. Key is the name.
+        """
+
+        summary = self.summary(races, q=())
+
+        return dict(zip(summary.index, summary["expected_cost"]))
+
+    def summary(
+        self, races: Optional[int] = None, q: Sequence[float] = QUANTILES
+    ) -> DataFrame:
+        """DataFrame with the distribution of the price change after a number of races.
+
+        Parameters
+        ----------
+        races: int
+            Number of races, by default every race of the season.
+        q: list of float
+            Quantiles of the price change to compute, between 0 and 1.
+
+        Returns
+        -------
+        return: DataFrame
+            Current and expected cost, and mean, standard deviation, probability of
+            rising and falling and quantiles of the price change of each Driver and
+            Team. Index is the name.
+        """
+
+        if self.driver_changes is None:
+            raise ValueError("Prices must be projected with run first.")
+
+        change = np.concatenate(
+            [
+                self.driver_changes[:, :races].sum(axis=1),
+                self.team_changes[:, :races].sum(axis=1),
+            ],
+            axis=1,
+        )
+        cost = np.concatenate([self.driver_cost, self.team_cost])
+
+        summary = DataFrame(
+            {
+                "cost": cost,
+                "expected_cost": cost + change.mean(axis=0),
+                "mean": change.mean(axis=0),
+                "std": change.std(axis=0),
+                "rise": (change > 0).mean(axis=0),
+                "fall": (change < 0).mean(axis=0),
+            },
+            index=self.simulator.drivers + self.simulator.teams,
+        )
+        for quantile, values in zip(q, np.quantile(change, q, axis=0)):
+            summary[f"q{quantile:g}"] = values
+
+        return summary
+
+
+def _changes(cost: np.ndarray, costs: np.ndarray) -> np.ndarray:
+    "Matrix(S, R, N) with the price changes from the costs after each race."
+
+    before = np.broadcast_to(cost, costs.shape[1:])[None]
+
+    return np.diff(costs, axis=0, prepend=before).transpose(1, 0, 2)
@@ -1,8 +1,70 @@
 "Outcome probabilities for a race."
 
-from typing import Optional
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
 
-from pandas import DataFrame, Series
+import numpy as np
+from pandas import DataFrame, Index, Series
+
+from gridrival.dtypes import probability_dtype
+from gridrival.probabilities.betting_odds import RetirementOdds, naive_grid_array
+from gridrival.probabilities.demargin import Method, demargin
+from gridrival.scoring import (
+    GRID_SIZE,
+    comonotone_coupling,
+    expected_overtake_points,
+    expected_personal_improvement_points,
+    league_scoring,
+)
+
+
+def teammate_joint_probabilities(
+    driver: np.ndarray, teammate: np.ndarray
+) -> np.ndarray:
+    """Joint probabilities of the positions of a Driver and its team mate.
+
+    The Driver ends in each position with its own probabilities, and the team mate ends
+    in any other position with its probabilities conditioned on that position being
+    taken. Computed at once for every pair given in the leading dimensions.
+
+    Parameters
+    ----------
+    driver: ndarray
+        Probabilities of the Driver for each grid position, with shape (..., N).
+    teammate: ndarray
+        Probabilities of the team mate for each grid position, with shape (..., N).
+
+    Returns
+    -------
+    return: ndarray
+        Matrix(N, N) for each pair with the probability of the Driver ending in the row
+        position and the team mate in the column position.
+    """
+
+    driver = np.asarray(driver)
+    teammate = np.asarray(teammate)
+    remaining = teammate.sum(axis=-1, keepdims=True) - teammate
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        conditional = np.where(
+            remaining[..., :, None] > 0,
+            teammate[..., None, :] / remaining[..., :, None],
+            0,
+        )
+
+    joint = driver[..., :, None] * conditional
+    diagonal = np.arange(driver.shape[-1])
+    joint[..., diagonal, diagonal] = 0
+
+    return joint
+
+
+def _grid_array(grid: DataFrame, dtype: np.dtype) -> np.ndarray:
+    "Read-only contiguous array of a grid with the given type."
+
+    array = np.ascontiguousarray(grid.to_numpy(dtype=dtype))
+    array.setflags(write=False)
+
+    return array
 
 
 class DriverProbabilities:
@@ -11,7 +73,7 @@ class DriverProbabilities:
     Probabilities are a series of probabilities each position on the grid the Driver can
     end up.
 
-    The probabilities are independent for both qualifying and the race.
+    The qualifying and race positions are independent unless a correlation is given.
 
     Attributes
     ----------
@@ -19,13 +81,17 @@ class DriverProbabilities:
         Probabilities to end the race stage in each grid position.
     qual: DataFrame
         Probabilities to end the qualifying stage in each grid position.
+    correlation: float
+        Correlation between qualifying and race positions, from 0 for independent
+        positions to 1 for positions which move together.
     """
 
     def __init__(
         self,
         race: Series,
         comp: Series,
-        qual: Optional[Series] = None
+        qual: Optional[Series] = None,
+        correlation: float = 0.0,
     ) -> None:
 
         self.race = race
@@ -34,6 +100,7 @@ class DriverProbabilities:
             self.qual = race
         else:
             self.qual = qual
+        self.correlation = correlation
 
     def overtake_probabilities(self) -> DataFrame:
         """Create a matrix of overtake probabilities.
@@ -42,12 +109,22 @@ class DriverProbabilities:
         probabilities that the driver qualifies in m position and finishes the race in
         nth position.
 
+        The matrix is only needed to inspect the overtake probabilities, as expected
+        overtake points are computed without it.
+
         Returns
         -------
         return: DataFrame
             Matrix of probabilities of overtake positions.
         """
-        return DataFrame(self.qual).dot(DataFrame(self.race).T)
+
+        independent = DataFrame(self.qual).dot(DataFrame(self.race).T)
+        if not self.correlation:
+            return independent
+
+        coupled = comonotone_coupling(self.qual.to_numpy(), self.race.to_numpy())
+
+        return (1 - self.correlation) * independent + self.correlation * coupled
 
 
 class GridProbabilities:
@@ -56,7 +133,12 @@ class GridProbabilities:
     Probabilities are the matrix of probabilities each Driver ends in each grid
     position.
 
-    The probabilities are independent for both qualifying and the race.
+    Each grid is stored once as a read-only contiguous array with a row for each Driver,
+    in the order of the race grid, and an index from the Driver's name to its row. The
+    DataFrames of the grids, the probabilities of a single Driver and the arrays given
+    to the scoring code are all views of these arrays, with no copies.
+
+    The qualifying and race positions are independent unless a correlation is given.
 
     Attributes
     ----------
@@ -64,48 +146,521 @@ class GridProbabilities:
         Probabilities for each Driver to end the race stage in each grid position.
     qual: DataFrame
         Probabilities for each Driver to end the qualifying stage in each grid position.
+    comp: DataFrame
+        Probabilities for each Driver to complete a percentage of the race.
+    correlation: float
+        Correlation between qualifying and race positions, from 0 for independent
+        positions to 1 for positions which move together.
+    names: Index
+        Names of the Drivers, one for each row of the grids.
+    positions: Index
+        Grid positions, one for each column of the race and qualifying grids.
+    completions: Index
+        Completion categories, one for each column of the completion grid.
+    race_array: ndarray
+        Matrix(D, N) with the race grid.
+    qual_array: ndarray
+        Matrix(D, N) with the qualifying grid, the race grid if there is none.
+    comp_array: ndarray
+        Matrix(D, C) with the completion grid.
+
+    Note
+    ----
+    The grids are stored with the probability type of the data types policy in use,
+    unless a type is given. The qualifying and completion grids are aligned to the
+    Drivers of the race grid, which must all be in them.
+
+    The DataFrames `race`, `qual` and `comp` are read-only views of the arrays, so
+    setting a value in them, as in `grid.race.iloc[0, 0] = p`, raises a ValueError.
+    Changed probabilities are a new GridProbabilities built from copies of the frames,
+    such as `grid.race.copy()`, so the arrays and every point computed from them stay
+    consistent.
 
     Methods
     -------
+    from_odds: GridProbabilities
+        Create the probabilities from winning, qualifying and retirement odds.
     driver_probabilities: Series
         Return the probabilities for a single Driver.
+    rows: ndarray
+        Rows of the grids of some Drivers.
+    select: GridProbabilities
+        Probabilities for some of the Drivers.
+    qualifying_points: Series
+        Expected points earned from qualifying by every Driver.
+    race_points: Series
+        Expected points earned from the race by every Driver.
+    completion_points: Series
+        Expected points from race completion for every Driver.
+    overtake_points: Series
+        Expected overtake points for every Driver.
+    personal_improvement_points: Series
+        Expected personal improvement points for every Driver.
+    team_probabilities: TeamProbabilities
+        Joint probabilities of the Drivers of each Team.
     """
 
     def __init__(
         self,
         race: DataFrame,
         comp: DataFrame,
-        qual: Optional[DataFrame] = None
+        qual: Optional[DataFrame] = None,
+        dtype: Optional[np.dtype] = None,
+        correlation: float = 0.0,
     ) -> None:
 
-        self.race = race
+        dtype = probability_dtype(dtype)
+        self.correlation = correlation
+
+        self.names = race.index
+        self.positions = race.columns
+        self.completions = comp.columns
+        self._rows = {name: row for row, name in enumerate(self.names)}
+
+        self.race_array = _grid_array(race, dtype)
         if qual is None:
-            self.qual = race
+            self.qual_array = self.race_array
         else:
-            self.qual = qual
-        self.comp = comp
+            self.qual_array = _grid_array(qual.loc[self.names, self.positions], dtype)
+        self.comp_array = _grid_array(comp.loc[self.names], dtype)
+
+        self.race = self._frame(self.race_array, self.positions)
+        self.qual = self._frame(self.qual_array, self.positions)
+        self.comp = self._frame(self.comp_array, self.completions)
+
+    @classmethod
+    def from_odds(
+        cls,
+        win: Series,
+        retirement: Series,
+        qual: Optional[Series] = None,
+        dtype: Optional[np.dtype] = None,
+        correlation: float = 0.0,
+        method: Union[str, Method] = "proportional",
+    ) -> "GridProbabilities":
+        """Create the probabilities from winning, qualifying and retirement odds.
+
+        The race grid is built from the odds of winning the race, and the qualifying
+        grid from the odds of winning qualifying, both at once with the naive method.
+        The margin of both markets is also removed at once.
+
+        Parameters
+        ----------
+        win: Series
+            Betting odds for each Driver to win the race. Index is Driver's name.
+        retirement: Series
+            Betting odds for each Driver to retire first or not retire.
+        qual: Series
+            Betting odds for each Driver to win qualifying. If None the qualifying
+            grid is the race grid.
+        dtype: dtype
+            Type of the grids, by default the probability type of the data types policy.
+        correlation: float
+            Correlation between qualifying and race positions.
+        method: str or Method
+            Method to remove the margin of the odds, see `demargin`.
+
+        Returns
+        -------
+        return: GridProbabilities
+            Probabilities for the race and qualifying grids.
+        """
+
+        markets = [win] if qual is None else [win, qual.loc[win.index]]
+        grids = naive_grid_array(
+            demargin(np.stack([odds.to_numpy() for odds in markets]), method)
+        )
+        positions = range(1, len(win) + 1)
+
+        frames = [DataFrame(grid, index=win.index, columns=positions) for grid in grids]
+
+        return cls(
+            frames[0],
+            RetirementOdds(retirement, method).completion_probabilities(),
+            frames[1] if qual is not None else None,
+            dtype=dtype,
+            correlation=correlation,
+        )
 
     def driver_probabilities(self, driver: str) -> DriverProbabilities:
         """Return the probabilities for a single Driver.
 
+        The probabilities are views of the Driver's rows of the grids.
+
         Returns
         -------
         return: DriverProbabilities
             Probabilities for each possible result position for a single Driver.
         """
 
+        row = self._rows[driver]
+
         return DriverProbabilities(
-            race=self.race.loc[driver],
-            comp= self.comp.loc[driver],
-            qual=self.qual.loc[driver]
+            race=self._series(self.race_array[row], self.positions, driver),
+            comp=self._series(self.comp_array[row], self.completions, driver),
+            qual=self._series(self.qual_array[row], self.positions, driver),
+            correlation=self.correlation,
         )
 
+    def rows(self, drivers: Iterable[str]) -> np.ndarray:
+        """Rows of the grids of some Drivers.
+
+        Parameters
+        ----------
+        drivers: list of str
+            Names of the Drivers.
+
+        Returns
+        -------
+        return: ndarray
+            Row of each Driver in the grid arrays.
+        """
+
+        return np.array([self._rows[driver] for driver in drivers], dtype=np.intp)
+
+    def select(self, drivers: Iterable[str]) -> "GridProbabilities":
+        """Probabilities for some of the Drivers.
+
+        Parameters
+        ----------
+        drivers: list of str
+            Names of the Drivers, in the order of the new grids.
+
+        Returns
+        -------
+        return: GridProbabilities
+            Probabilities with the rows of the Drivers given.
+        """
+
+        drivers = list(drivers)
+        rows = self.rows(drivers)
+        index = Index(drivers, name=self.names.name)
+        qual = None
+        if self.qual_array is not self.race_array:
+            qual = DataFrame(self.qual_array[rows], index=index, columns=self.positions)
+
+        return GridProbabilities(
+            DataFrame(self.race_array[rows], index=index, columns=self.positions),
+            DataFrame(self.comp_array[rows], index=index, columns=self.completions),
+            qual,
+            dtype=self.race_array.dtype,
+            correlation=self.correlation,
+        )
+
+    def qualifying_points(self, team: bool = False) -> Series:
+        """Expected points earned from qualifying by every Driver.
+
+        Parameters
+        ----------
+        team: bool
+            If True it returns the expected team points earned by each Driver. If False
+            it returns the expected driver points earned by each Driver.
+
+        Returns
+        -------
+        return: Series
+            Expected points from the qualifying stage for each Driver.
+        """
+
+        scoring = league_scoring(len(self.positions))
+        scoring = scoring.Team if team else scoring.Driver
+        scoring = scoring.QUALIFYING.loc[self.positions].to_numpy()
+
+        return Series(self.qual_array @ scoring, index=self.names)
+
+    def race_points(self, team: bool = False) -> Series:
+        """Expected points earned from the race by every Driver.
+
+        Parameters
+        ----------
+        team: bool
+            If True it returns the expected team points earned by each Driver. If False
+            it returns the expected driver points earned by each Driver.
+
+        Returns
+        -------
+        return: Series
+            Expected points from the race stage for each Driver.
+        """
+
+        scoring = league_scoring(len(self.positions))
+        scoring = scoring.Team if team else scoring.Driver
+        scoring = scoring.RACE.loc[self.positions].to_numpy()
+
+        return Series(self.race_array @ scoring, index=self.names)
+
+    def completion_points(self) -> Series:
+        """Expected points from race completion for every Driver.
+
+        Returns
+        -------
+        return: Series
+            Expected completion points for each Driver.
+        """
+
+        completion = league_scoring(len(self.positions)).Driver.COMPLETION
+        completion = completion.loc[self.completions].to_numpy()
+
+        return Series(self.comp_array @ completion, index=self.names)
+
+    def overtake_points(self) -> Series:
+        """Expected overtake points for every Driver.
+
+        Computed in a single matrix expression for the whole grid, without building a
+        matrix of overtake probabilities for each Driver unless a correlation is given.
+
+        Returns
+        -------
+        return: Series
+            Expected overtake points for each Driver.
+        """
+
+        return Series(
+            expected_overtake_points(
+                self.qual_array, self.race_array, correlation=self.correlation
+            ),
+            index=self.names,
+        )
+
+    def personal_improvement_points(self, rank: Series) -> Series:
+        """Expected personal improvement points for every Driver.
+
+        Parameters
+        ----------
+        rank: Series
+            Rank of each Driver given by the eight race rolling average. Index is
+            Driver's name.
+
+        Returns
+        -------
+        return: Series
+            Expected personal improvement points for each Driver.
+        """
+
+        return Series(
+            expected_personal_improvement_points(
+                rank.loc[self.names].to_numpy(), self.race_array
+            ),
+            index=self.names,
+        )
+
+    def _frame(self, array: np.ndarray, columns: Index) -> DataFrame:
+        "DataFrame view of a grid array."
+        return DataFrame(array, index=self.names, columns=columns, copy=False)
+
+    @staticmethod
+    def _series(array: np.ndarray, index: Index, name: str) -> Series:
+        "Series view of a row of a grid array."
+        return Series(array, index=index, name=name, copy=False)
+
+    def team_probabilities(
+        self, teams: Mapping[str, Tuple[str, str]]
+    ) -> "TeamProbabilities":
+        """Joint probabilities of the Drivers of each Team.
+
+        Parameters
+        ----------
+        teams: dict
+            Names of the two Drivers of each Team. Key is Team's name.
+
+        Returns
+        -------
+        return: TeamProbabilities
+            Joint probabilities for qualifying and the race.
+        """
+
+        return TeamProbabilities(self, teams)
+
+
+class TeamProbabilities:
+    """Joint probabilities for the outcomes of the two Drivers of each Team.
+
+    The joint probabilities of every pair of team mates are computed once for the
+    whole grid, both for qualifying and the race, and are shared by the beat team mate
+    points of the Drivers and the points of the Teams. They never change, so the points
+    of every Driver and Team are also computed once and shared by every lookup.
+
+    For each Team, the joint probabilities are computed from the point of view of each
+    of its Drivers, who ends in each position with its own probabilities while the team
+    mate is conditioned on that position being taken.
+
+    Attributes
+    ----------
+    teams: list of str
+        Names of the Teams.
+    drivers: ndarray
+        Matrix(T, 2) with the names of the Drivers of each Team.
+    positions: Index
+        Grid positions.
+    race: ndarray
+        Joint race probabilities with shape (T, 2, N, N), for each Team and Driver, with
+        the Driver's position in rows and the team mate's position in columns.
+    qual: ndarray
+        Joint qualifying probabilities with the same shape as race.
+
+    Methods
+    -------
+    from_teams
+        Create the joint probabilities for Team objects.
+    joint
+        Joint probabilities of a Driver and its team mate.
+    beat_teammate_points
+        Expected points of every Driver from beating its team mate.
+    qualifying_points
+        Expected team points of every Team earned from qualifying.
+    race_points
+        Expected team points of every Team earned from the race stage.
+    points
+        Expected team points of every Team earned from the race.
+    """
+
+    def __init__(
+        self, grid: "GridProbabilities", teams: Mapping[str, Tuple[str, str]]
+    ) -> None:
+
+        self.teams = list(teams)
+        self.drivers = np.array([teams[team] for team in self.teams], dtype=object)
+        self.positions = grid.positions
+
+        names = self.drivers.ravel()
+        rows = grid.rows(names)
+        shape = (len(self.teams), 2, len(self.positions))
+        race = grid.race_array[rows].reshape(shape)
+        qual = grid.qual_array[rows].reshape(shape)
+
+        self.race = teammate_joint_probabilities(race, race[:, ::-1])
+        self.qual = teammate_joint_probabilities(qual, qual[:, ::-1])
+
+        self._race_marginal = race
+        self._qual_marginal = qual
+        self._index = {name: divmod(i, 2) for i, name in enumerate(names)}
+        self._points: Dict[str, Series] = {}
+
+    @classmethod
+    def from_teams(cls, grid: "GridProbabilities", teams: list) -> "TeamProbabilities":
+        """Create the joint probabilities for Team objects.
+
+        Parameters
+        ----------
+        grid: GridProbabilities
+            Probabilities of every Driver.
+        teams: list of Team
+            Teams with their two Drivers.
+
+        Returns
+        -------
+        return: TeamProbabilities
+            Joint probabilities of the Drivers of each Team.
+        """
+
+        return cls(
+            grid,
+            {team.name: (team.driver_1.name, team.driver_2.name) for team in teams},
+        )
+
+    def joint(self, driver: str, stage: str = "race") -> DataFrame:
+        """Joint probabilities of a Driver and its team mate.
+
+        Parameters
+        ----------
+        driver: str
+            Name of the Driver.
+        stage: str
+            Either "race" or "qual".
+
+        Returns
+        -------
+        return: DataFrame
+            Probabilities of the Driver ending in the row position and the team mate in
+            the column position.
+        """
+
+        team, k = self._index[driver]
+
+        return DataFrame(
+            getattr(self, stage)[team, k], index=self.positions, columns=self.positions
+        )
+
+    def beat_teammate_points(self) -> Series:
+        """Expected points of every Driver from beating its team mate.
+
+        Returns
+        -------
+        return: Series
+            Expected beat team mate points for each Driver.
+        """
+
+        def compute() -> Series:
+            scoring = league_scoring(len(self.positions)).Driver.BEAT_TEAMMATE
+            points = np.einsum("tkij,ji->tk", self.race, scoring.to_numpy())
+            return Series(points.ravel(), index=self.drivers.ravel())
+
+        return self._cached("beat_teammate", compute)
+
+    def qualifying_points(self) -> Series:
+        """Expected team points of every Team earned from qualifying.
+
+        Returns
+        -------
+        return: Series
+            Expected team points from the qualifying stage for each Team.
+        """
+
+        return self._cached(
+            "qualifying", lambda: self._team_points(self._qual_marginal, "QUALIFYING")
+        )
+
+    def race_points(self) -> Series:
+        """Expected team points of every Team earned from the race stage.
+
+        Returns
+        -------
+        return: Series
+            Expected team points from the race stage for each Team.
+        """
+
+        return self._cached(
+            "race", lambda: self._team_points(self._race_marginal, "RACE")
+        )
+
+    def points(self) -> Series:
+        """Expected team points of every Team earned from the race.
+
+        Returns
+        -------
+        return: Series
+            Expected team points for each Team.
+        """
+
+        return self._cached(
+            "total", lambda: self.qualifying_points() + self.race_points()
+        )
+
+    def _team_points(self, marginal: np.ndarray, stage: str) -> Series:
+        "Expected team points of every Team from the marginals of a stage."
+
+        scoring = getattr(league_scoring(len(self.positions)).Team, stage)
+        points = marginal @ scoring.loc[self.positions].to_numpy()
+
+        return Series(points.sum(axis=1), index=self.teams)
+
+    def _cached(self, key: str, compute: Callable[[], Series]) -> Series:
+        "Points computed once, as the joint probabilities never change."
+
+        if key not in self._points:
+            self._points[key] = compute()
+        return self._points[key]
+
+    def __contains__(self, driver: str) -> bool:
+        "The joint probabilities include a Driver."
+        return driver in self._index
+
 
 COMPLETE_RACE = Series(0, index=range(0, 5))
 COMPLETE_RACE[4] = 1
 
 DEFAULT_PROBABILITY = DriverProbabilities(
-    race=Series(1 / 20, index=range(1, 21)),
-    qual=Series(1 / 20, index=range(1, 21)),
-    comp=Series(1, index=range(0, 5))
+    race=Series(1 / GRID_SIZE, index=range(1, GRID_SIZE + 1)),
+    qual=Series(1 / GRID_SIZE, index=range(1, GRID_SIZE + 1)),
+    comp=Series(1, index=range(0, 5)),
 )
@@ -1,6 +1,50 @@
 "Betting Odds."
+from typing import Optional, Union
+
+import numpy as np
 import pandas as pd
 
+from gridrival.dtypes import probability_dtype
+from gridrival.probabilities.demargin import Method, demargin_series
+
+
+def naive_grid_array(probabilities: np.ndarray) -> np.ndarray:
+    """Grids of probabilities using a naive method for many markets at once.
+
+    Each position is given the probability of not having placed in a higher position
+    times its complement, normalized over the Drivers, starting from the probability of
+    winning. The loop over positions is shared by every market given in the leading
+    dimensions, so building the race and qualifying grids together costs about the
+    same as building one.
+
+    Parameters
+    ----------
+    probabilities: ndarray
+        Probabilities of winning of each Driver, with shape (..., N).
+
+    Returns
+    -------
+    return: ndarray
+        Matrix(N, N) for each market with the probability of each Driver (row) ending
+        in each grid position (column).
+    """
+
+    probabilities = np.asarray(probabilities, dtype=float)
+    size = probabilities.shape[-1]
+
+    grid = np.zeros(probabilities.shape + (size,))
+    grid[..., 0] = probabilities
+    past_prob = probabilities.copy()
+
+    for i in range(1, size - 1):
+        new_prob = past_prob * (1 - past_prob)
+        grid[..., i] = new_prob / new_prob.sum(axis=-1, keepdims=True)
+        past_prob += grid[..., i]
+
+    grid[..., size - 1] = 1 - past_prob
+
+    return grid
+
 
 class WinningOdds:
     """Obtain probabilities from betting odds for the winner.
@@ -12,6 +56,8 @@ class WinningOdds:
     ----------
     odds: Series
         Betting odds for each driver to win. Includes house fee. Index is Driver's name.
+    method: str or Method
+        Method to remove the house fee, see `demargin`.
 
     Methods
     -------
@@ -23,9 +69,10 @@ class WinningOdds:
         Return a grid of probabilities using a deterministic rank method.
     """
 
-    def __init__(self, odds: pd.Series):
+    def __init__(self, odds: pd.Series, method: Union[str, Method] = "proportional"):
 
         self.odds = odds
+        self.method = method
 
     def probabilities(self) -> pd.Series:
         """Transform odds into winning probabilities.
@@ -36,18 +83,21 @@ class WinningOdds:
             Probabilities of winning from betting odds and normalized from house margin.
         """
 
-        bet_prob = 1 / self.odds
-        norm_prob = bet_prob / sum(bet_prob)
-
-        return norm_prob
+        return demargin_series(self.odds, self.method)
 
-    def naive_grid(self) -> pd.DataFrame:
+    def naive_grid(self, dtype: Optional[np.dtype] = None) -> pd.DataFrame:
         """Return a grid of probabilities using a naive method.
 
         This method calculates the probability for each grid position in a naive way, by
         using the probability of winning from the odds, and the probability of not
         having placed in a higher position.
 
+        Parameters
+        ----------
+        dtype: dtype
+            Type of the grid, by default the probability type of the data types policy.
+            The grid is always computed in float64.
+
         Returns
         -------
         df: DataFrame
@@ -55,21 +105,14 @@ class WinningOdds:
         """
 
         df = pd.DataFrame(
-            0, index=self.odds.index, columns=range(1, len(self.odds) + 1)
+            naive_grid_array(self.probabilities().to_numpy()),
+            index=self.odds.index,
+            columns=range(1, len(self.odds) + 1),
         )
-        df[1] = self.probabilities()
-
-        for i in range(1, len(self.odds) - 1):
-            past_prob = df.sum(axis=1)
-            new_prob = past_prob * (1 - past_prob)
-            norm_prob = new_prob / sum(new_prob)
-            df[i + 1] = norm_prob
 
-        df[len(self.odds)] = 1 - df.sum(axis=1)
+        return df.astype(probability_dtype(dtype))
 
-        return df
-
-    def rank_grid(self) -> pd.DataFrame:
+    def rank_grid(self, dtype: Optional[np.dtype] = None) -> pd.DataFrame:
         """Return a grid of probabilities using a rank method.
 
         The rank method ranks all Drivers by odds and, and assumes in a deterministic
@@ -77,13 +120,20 @@ class WinningOdds:
         Driver have the same odds, the probabilities of the Drivers are split among the
         ranks.
 
+        Parameters
+        ----------
+        dtype: dtype
+            Type of the grid, by default the probability type of the data types policy.
+
         Returns
         -------
         df: DataFrame
             Probabilities grid using a rank method.
         """
 
-        df = pd.DataFrame(0, index=self.odds.index, columns=range(1, 21))
+        df = pd.DataFrame(
+            0.0, index=self.odds.index, columns=range(1, len(self.odds) + 1)
+        )
         ranked_odds = self.odds.rank(method="min")
         grouped_ranks = ranked_odds.groupby(ranked_odds)
 
@@ -91,7 +141,7 @@ class WinningOdds:
             num_drivers = len(driver)
             df.loc[driver.index, rank : rank + num_drivers - 1] = 1 / num_drivers
 
-        return df
+        return df.astype(probability_dtype(dtype))
 
 
 class RaceOdds:
@@ -110,6 +160,10 @@ class RaceOdds:
         Odds for each driver to finish top 6.
     pnt: Series
         Odds for each driver to finish in the top 10.
+    method: str or Method
+        Method to remove the house fee, see `demargin`. Markets with many winners are
+        solved for their number of winners by "power" and "odds_ratio", and are
+        approximated as single winner markets scaled back by the other methods.
 
     Methods
     -------
@@ -117,9 +171,10 @@ class RaceOdds:
         Transform odds into normalized probabilities.
     """
 
-    def __init__(self, odds: pd.Series):
+    def __init__(self, odds: pd.Series, method: Union[str, Method] = "proportional"):
 
         self.odds = odds
+        self.method = method
 
     def probabilities(self, total_probability=1) -> pd.Series:
         """Transform odds into winning probabilities.
@@ -135,10 +190,7 @@ class RaceOdds:
             Probabilities of winning from betting odds and normalized from house margin.
         """
 
-        bet_prob = 1 / self.odds
-        norm_prob = bet_prob / sum(bet_prob) * total_probability
-
-        return norm_prob
+        return demargin_series(self.odds, self.method, total_probability)
 
 
 class RetirementOdds:
@@ -155,6 +207,8 @@ class RetirementOdds:
         Probability of no driver retiring.
     first_ret: Series
         Probability of each driver retiring first.
+    method: str or Method
+        Method to remove the house fee, see `demargin`.
     
     Methods
     -------
@@ -164,9 +218,10 @@ class RetirementOdds:
         Transform first driver to retire odds in overall retirement probabilities.
     """
 
-    def __init__(self, odds: pd.Series):
+    def __init__(self, odds: pd.Series, method: Union[str, Method] = "proportional"):
 
         self.odds = odds
+        self.method = method
 
         prob = self.probabilities()
         self.no_ret = prob["NO_RETIREMENT"]
@@ -181,10 +236,7 @@ class RetirementOdds:
             Probabilities of winning from betting odds and normalized from house margin.
         """
 
-        bet_prob = 1 / self.odds
-        norm_prob = bet_prob / sum(bet_prob)
-
-        return norm_prob
+        return demargin_series(self.odds, self.method)
 
     def retirement_probabilities(self) -> pd.Series:
         """Calculate the probability of each driver of not completing the race.
@@ -195,16 +247,25 @@ class RetirementOdds:
             Probabilities for each driver of retiring during the race.
         """
 
-        avg_ret = 1-self.no_ret**(1/20)
-        multiplier = (avg_ret*20)/self.first_ret.sum()
+        grid_size = len(self.first_ret)
+        avg_ret = 1-self.no_ret**(1/grid_size)
+        multiplier = (avg_ret*grid_size)/self.first_ret.sum()
 
         ret_prob = self.first_ret.multiply(multiplier)
 
         return ret_prob
 
-    def completion_probabilities(self) -> pd.DataFrame:
+    def completion_probabilities(
+        self, dtype: Optional[np.dtype] = None
+    ) -> pd.DataFrame:
         """Calculate the probabilities each driver completes a percentage of the race.
 
+        Parameters
+        ----------
+        dtype: dtype
+            Type of the probabilities, by default the probability type of the data types
+            policy.
+
         Returns
         -------
         comp_prob: DataFrame
@@ -224,7 +285,7 @@ class RetirementOdds:
             axis = 1
         )
 
-        return comp_prob
+        return comp_prob.astype(probability_dtype(dtype))
 
 
 TOP_1 = {
@@ -0,0 +1,214 @@
+"""Removal of the bookmaker margin from betting odds.
+
+The implied probabilities of betting odds add up to more than the number of winners of
+the market, as the bookmaker keeps a margin. Proportional normalization spreads the
+margin evenly, but bookmakers put more of it on the longshots, so other methods shift
+it towards them:
+
+- shin: Shin's model of a fraction z of bets from insiders.
+- power: implied probabilities raised to a power k.
+- odds_ratio: odds of the implied probabilities divided by a ratio c.
+
+Each method has a single parameter per market, found by bisection so that the
+probabilities add up to the number of winners. Bisection runs at once for every market
+and snapshot given in the leading dimensions of the odds, and markets of different
+sizes are padded with NaN.
+
+Markets with more than one winner, such as a podium, are solved for their number of
+winners by the power and odds ratio methods, which keep every probability below 1.
+Shin's model and user methods are for single winner markets, so they are given the
+implied probabilities divided by the number of winners, and scaled back, which is an
+approximation. Probabilities scaled back above 1 are capped at 1, and the excess is
+spread over the other outcomes in proportion to their probabilities.
+"""
+
+from typing import Callable, Dict, Union
+
+import numpy as np
+import pandas as pd
+
+TOLERANCE = 1e-14
+MAX_ITERATIONS = 100
+
+# Function of the implied probabilities of single winner markets, given with shape
+# (..., N), which returns their probabilities.
+Method = Callable[[np.ndarray], np.ndarray]
+
+# Function of the implied probabilities and the parameter of each market.
+ParametricMethod = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def _shin(implied: np.ndarray, z: np.ndarray) -> np.ndarray:
+    "Shin probabilities for a fraction z of insider bets."
+
+    booksum = np.nansum(implied, axis=-1, keepdims=True)
+    root = np.sqrt(z**2 + 4 * (1 - z) * implied**2 / booksum)
+
+    return (root - z) / (2 * (1 - z))
+
+
+def _power(implied: np.ndarray, log_k: np.ndarray) -> np.ndarray:
+    "Implied probabilities raised to the power exp(log_k)."
+    return implied ** np.exp(log_k)
+
+
+def _odds_ratio(implied: np.ndarray, log_c: np.ndarray) -> np.ndarray:
+    "Probabilities whose odds are the implied odds divided by exp(log_c)."
+
+    c = np.exp(log_c)
+
+    return implied / (c + implied - c * implied)
+
+
+# Each method with the bracket of its parameter, where the total decreases, and True if
+# it is solved for the number of winners, else for single winner markets.
+METHODS: Dict[str, tuple] = {
+    "shin": (_shin, 0.0, 1.0 - 1e-9, False),
+    "power": (_power, -7.0, 7.0, True),
+    "odds_ratio": (_odds_ratio, -20.0, 20.0, True),
+}
+
+
+def _bisect(
+    implied: np.ndarray,
+    method: ParametricMethod,
+    lower: float,
+    upper: float,
+    total: float,
+    tolerance: float,
+    max_iterations: int,
+) -> np.ndarray:
+    "Probabilities with the parameter of each market which makes them add up to total."
+
+    lower = np.full(implied.shape[:-1] + (1,), lower)
+    upper = np.full(implied.shape[:-1] + (1,), upper)
+
+    for _ in range(max_iterations):
+        middle = (lower + upper) / 2
+        excess = np.nansum(method(implied, middle), axis=-1, keepdims=True) - total
+
+        lower = np.where(excess > 0, middle, lower)
+        upper = np.where(excess > 0, upper, middle)
+
+        if np.all(np.abs(excess) < tolerance):
+            break
+
+    return method(implied, (lower + upper) / 2)
+
+
+def demargin(
+    odds: np.ndarray,
+    method: Union[str, Method] = "proportional",
+    total: float = 1.0,
+    tolerance: float = TOLERANCE,
+    max_iterations: int = MAX_ITERATIONS,
+) -> np.ndarray:
+    """Probabilities of betting odds without the bookmaker margin.
+
+    Parameters
+    ----------
+    odds: ndarray
+        Decimal betting odds of each outcome, with shape (..., N). Every market in the
+        leading dimensions is de-margined at once, and missing outcomes are NaN.
+    method: str or Method
+        Either "proportional", "shin", "power" or "odds_ratio", or a function with a
+        single argument, the implied probabilities of single winner markets with shape
+        (..., N), that returns their probabilities.
+    total: float
+        Sum of the probabilities of a market, its number of winners. The power and
+        odds ratio methods are solved for it, the other methods are applied to the
+        implied probabilities divided by it and scaled back. Probabilities above 1 are
+        capped at 1.
+    tolerance: float
+        Largest error allowed in the sum of the probabilities of a market.
+    max_iterations: int
+        Largest number of bisection steps.
+
+    Returns
+    -------
+    return: ndarray
+        Probabilities with the shape of the odds, adding up to `total` in each market.
+    """
+
+    implied = 1 / np.asarray(odds, dtype=float)
+
+    if callable(method):
+        probabilities = method(implied / total)
+    elif method == "proportional":
+        probabilities = implied
+    elif method in METHODS:
+        function, lower, upper, many_winners = METHODS[method]
+        if not many_winners:
+            implied = implied / total
+        probabilities = _bisect(
+            implied,
+            function,
+            lower,
+            upper,
+            total if many_winners else 1.0,
+            tolerance,
+            max_iterations,
+        )
+    else:
+        raise ValueError(
+            f"Method must be proportional, {', '.join(METHODS)} or a function."
+        )
+
+    # Also exact when a parameter is at the edge of its bracket.
+    probabilities = probabilities / np.nansum(probabilities, axis=-1, keepdims=True)
+    probabilities = probabilities * total
+
+    if total > 1:
+        probabilities = _cap(probabilities, total)
+
+    return probabilities
+
+
+def _cap(probabilities: np.ndarray, total: float) -> np.ndarray:
+    "Probabilities of at most 1, with the excess spread over the other outcomes."
+
+    for _ in range(probabilities.shape[-1]):
+        if not (probabilities > 1).any():
+            break
+
+        capped = probabilities >= 1
+        free = np.nansum(np.where(capped, 0, probabilities), axis=-1, keepdims=True)
+        room = total - capped.sum(axis=-1, keepdims=True)
+        scale = np.divide(room, free, out=np.zeros_like(free), where=free > 0)
+
+        probabilities = np.where(capped, 1.0, probabilities * scale)
+
+    return probabilities
+
+
+def demargin_series(
+    odds: pd.Series, method: Union[str, Method] = "proportional", total: float = 1.0
+) -> pd.Series:
+    "Probabilities of the betting odds of a market without the bookmaker margin."
+    return pd.Series(demargin(odds.to_numpy(), method, total), index=odds.index)
+
+
+def demargin_frame(
+    odds: pd.DataFrame, method: Union[str, Method] = "proportional", total: float = 1.0
+) -> pd.DataFrame:
+    """Probabilities of many markets or snapshots without the bookmaker margin.
+
+    Parameters
+    ----------
+    odds: DataFrame
+        Betting odds of each market or snapshot (row) for each outcome (column).
+        Missing odds are NaN.
+    method: str or Method
+        De-margining method, see `demargin`.
+    total: float
+        Sum of the probabilities of each market.
+
+    Returns
+    -------
+    return: DataFrame
+        Probabilities with the index and columns of the odds.
+    """
+
+    return pd.DataFrame(
+        demargin(odds.to_numpy(), method, total), index=odds.index, columns=odds.columns
+    )
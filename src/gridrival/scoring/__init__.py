@@ -1,48 +1,251 @@
 "Point system awarded by the fantasy league."
 
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 from pandas.core.series import Series
 
-empty_grid = pd.DataFrame(0, index=range(1, 21), columns=range(1, 21))
+GRID_SIZE = 20
+
+
+def position_grid(grid_size: int = GRID_SIZE) -> pd.DataFrame:
+    "Matrix(N, N) of zeros indexed by the grid positions."
+    positions = range(1, grid_size + 1)
+    return pd.DataFrame(0, index=positions, columns=positions)
 
 
 def distance_func(x: pd.Series) -> pd.Series:
     return x.index - x.name
 
 
-overtake_df = empty_grid.apply(distance_func) * 3
-overtake_df[overtake_df <= 0] = 0
+def overtake_grid(grid_size: int = GRID_SIZE) -> pd.DataFrame:
+    "Points for each qualifying (row) and race (column) position."
+
+    overtake_df = position_grid(grid_size).apply(distance_func) * 3
+    overtake_df[overtake_df <= 0] = 0
+
+    return overtake_df
+
+
+def teammate_grid(grid_size: int = GRID_SIZE) -> pd.DataFrame:
+    "Points for each Driver (column) and team mate (row) race position."
+
+    teammate_df = position_grid(grid_size).apply(distance_func)
+    teammate_df[teammate_df <= 0] = 0
+    teammate_df[(teammate_df > 0) & (teammate_df <= 3)] = 2
+    teammate_df[(teammate_df > 3) & (teammate_df <= 7)] = 5
+    teammate_df[(teammate_df > 7) & (teammate_df <= 12)] = 8
+    teammate_df[teammate_df > 12] = 12
+
+    return teammate_df
+
+
+def personal_improvement_series(grid_size: int = GRID_SIZE) -> Series:
+    "Points for each number of positions finished above the Driver's rank."
+
+    personal_improvement = Series(0, range(-grid_size + 1, grid_size))
+    personal_improvement.loc[1] = 2
+    personal_improvement.loc[2] = 4
+    personal_improvement.loc[3] = 6
+    personal_improvement.loc[4] = 9
+    personal_improvement.loc[5] = 12
+    personal_improvement.loc[6] = 16
+    personal_improvement.loc[7] = 20
+    personal_improvement.loc[8] = 25
+    personal_improvement.loc[9:] = 30
+
+    return personal_improvement
+
+
+def personal_improvement_grid(grid_size: int = GRID_SIZE) -> pd.DataFrame:
+    "Points for each Driver's rank (row) and race position (column)."
+
+    improvement = personal_improvement_series(grid_size)
+    positions = np.arange(1, grid_size + 1)
+
+    return pd.DataFrame(
+        improvement.loc[(positions[:, None] - positions[None, :]).ravel()]
+        .to_numpy()
+        .reshape(grid_size, grid_size),
+        index=positions,
+        columns=positions,
+    )
+
+
+@lru_cache()
+def league_scoring(grid_size: int = GRID_SIZE) -> type:
+    """Point system of the league for a grid of any size.
+
+    The points of each position follow the same rules as for 20 Drivers and never go
+    below zero. Tables are built once for each grid size.
+
+    Parameters
+    ----------
+    grid_size: int
+        Number of Drivers in the grid.
+
+    Returns
+    -------
+    return: LeagueScoring
+        Point system for the grid size.
+    """
+
+    positions = range(1, grid_size + 1)
+
+    class LeagueScoring:
+        class Driver:
+
+            QUALIFYING = pd.Series({i: max(52 - (i * 2), 0) for i in positions})
+            RACE = pd.Series({i: max(103 - (i * 3), 0) for i in positions})
+            COMPLETION = pd.Series({i: i * 3 for i in range(0, 5)})
+            OVERTAKE = overtake_grid(grid_size)
+            BEAT_TEAMMATE = teammate_grid(grid_size)
+            PERSONAL_IMPROVEMENT = personal_improvement_series(grid_size)
+            PERSONAL_IMPROVEMENT_GRID = personal_improvement_grid(grid_size)
+
+        class Team:
+
+            QUALIFYING = pd.Series({i: max(31 - i, 0) for i in positions})
+            RACE = pd.Series({i: max(62 - (i * 2), 0) for i in positions})
+
+    return LeagueScoring
+
+
+def comonotone_coupling(qual: np.ndarray, race: np.ndarray) -> np.ndarray:
+    """Joint probabilities of qualifying and race positions which move together.
+
+    The qualifying and race positions are the same quantile of their distributions, so
+    a better qualifying always means a better race. The marginals of the joint
+    probabilities are the qualifying and race probabilities, as long as these are not
+    negative.
+
+    Parameters
+    ----------
+    qual: ndarray
+        Probabilities to end the qualifying stage in each grid position, with shape
+        (..., N).
+    race: ndarray
+        Probabilities to end the race stage in each grid position, with shape (..., N).
+
+    Returns
+    -------
+    return: ndarray
+        Matrix(N, N) for each Driver with the probability of qualifying in the row
+        position and ending the race in the column position.
+    """
+
+    qual_cdf = np.cumsum(qual, axis=-1)
+    race_cdf = np.cumsum(race, axis=-1)
+
+    upper = np.minimum(qual_cdf[..., :, None], race_cdf[..., None, :])
+    lower = np.maximum((qual_cdf - qual)[..., :, None], (race_cdf - race)[..., None, :])
+
+    return np.clip(upper - lower, 0, None)
+
+
+def expected_overtake_points(
+    qual: np.ndarray,
+    race: np.ndarray,
+    overtake: Optional[np.ndarray] = None,
+    correlation: float = 0.0,
+) -> np.ndarray:
+    """Expected overtake points without building the matrix of overtake probabilities.
+
+    With independent qualifying and race positions the expected points are the
+    bilinear form qual' * OVERTAKE * race, computed at once for every Driver and
+    scenario given in the leading dimensions of the probabilities. Points are computed
+    in the type of the probabilities, so float32 scenario tensors are not upcast.
+
+    Qualifying and race positions are correlated by mixing the independent joint
+    probabilities with the comonotone coupling, where both positions move together, in
+    proportion to the correlation.
+
+    Parameters
+    ----------
+    qual: ndarray
+        Probabilities to end the qualifying stage in each grid position, with shape
+        (..., N).
+    race: ndarray
+        Probabilities to end the race stage in each grid position, with shape (..., N).
+    overtake: ndarray
+        Matrix(N, N) of overtake points, by default the league's for a grid of N.
+    correlation: float
+        Correlation between qualifying and race positions, from 0 for independent
+        positions to 1 for positions which move together.
+
+    Returns
+    -------
+    return: ndarray
+        Expected overtake points with the leading shape of the probabilities.
+    """
+
+    if not 0 <= correlation <= 1:
+        raise ValueError("Correlation must be between 0 and 1.")
+
+    qual = np.asarray(qual)
+    race = np.asarray(race)
+    if overtake is None:
+        overtake = league_scoring(qual.shape[-1]).Driver.OVERTAKE.to_numpy()
+    overtake = np.asarray(overtake, dtype=np.result_type(qual, race))
+
+    points = np.einsum("...q,...q->...", qual @ overtake, race)
+
+    if correlation:
+        coupled = np.einsum("...qr,qr->...", comonotone_coupling(qual, race), overtake)
+        points = (1 - correlation) * points + correlation * coupled
+
+    return points
+
+
+def expected_personal_improvement_points(
+    rank: np.ndarray, race: np.ndarray, improvement: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Expected personal improvement points from the table of rank and race position.
+
+    The points for each race position are a row of the table gathered by the Driver's
+    rank, so the expected points of every Driver are a single gather and dot product.
+    Ranks given by a rolling average are not integer, and their row is interpolated
+    linearly between the rows of the two closest ranks.
+
+    Parameters
+    ----------
+    rank: ndarray
+        Rank of each Driver, with shape (...).
+    race: ndarray
+        Probabilities to end the race stage in each grid position, with shape (..., N).
+    improvement: ndarray
+        Matrix(N, N) of points for each rank and race position, by default the
+        league's for a grid of N.
+
+    Returns
+    -------
+    return: ndarray
+        Expected personal improvement points with the leading shape of the
+        probabilities.
+    """
 
-teammate_df = empty_grid.apply(distance_func)
-teammate_df[teammate_df <= 0] = 0
-teammate_df[(teammate_df > 0) & (teammate_df <= 3)] = 2
-teammate_df[(teammate_df > 3) & (teammate_df <= 7)] = 5
-teammate_df[(teammate_df > 7) & (teammate_df <= 12)] = 8
-teammate_df[teammate_df > 12] = 12
+    race = np.asarray(race)
+    grid_size = race.shape[-1]
+    if improvement is None:
+        improvement = league_scoring(grid_size).Driver.PERSONAL_IMPROVEMENT_GRID
+        improvement = improvement.to_numpy()
+    improvement = np.asarray(improvement, dtype=race.dtype)
 
-personal_improvement = Series(0, range(-19, 20))
-personal_improvement.loc[1] = 2
-personal_improvement.loc[2] = 4
-personal_improvement.loc[3] = 6
-personal_improvement.loc[4] = 9
-personal_improvement.loc[5] = 12
-personal_improvement.loc[6] = 16
-personal_improvement.loc[7] = 20
-personal_improvement.loc[8] = 25
-personal_improvement.loc[9:] = 30
+    rank = np.clip(np.asarray(rank, dtype=race.dtype), 1, grid_size) - 1
+    lower = np.floor(rank).astype(int)
+    upper = np.minimum(lower + 1, grid_size - 1)
+    weight = (rank - lower)[..., None]
 
+    points = (1 - weight) * improvement[lower] + weight * improvement[upper]
 
-class LeagueScoring:
-    class Driver:
+    return np.einsum("...p,...p->...", points, race)
 
-        QUALIFYING = pd.Series({i: 52 - (i * 2) for i in range(1, 21)})
-        RACE = pd.Series({i: 103 - (i * 3) for i in range(1, 21)})
-        COMPLETION = pd.Series({i: i * 3 for i in range(0,5)})
-        OVERTAKE = overtake_df
-        BEAT_TEAMMATE = teammate_df
-        PERSONAL_IMPROVEMENT = personal_improvement
 
-    class Team:
+empty_grid = position_grid(GRID_SIZE)
+overtake_df = overtake_grid(GRID_SIZE)
+teammate_df = teammate_grid(GRID_SIZE)
+personal_improvement = personal_improvement_series(GRID_SIZE)
 
-        QUALIFYING = pd.Series({i: 31 - i for i in range(1, 21)})
-        RACE = pd.Series({i: 62 - (i * 2) for i in range(1, 21)})
+LeagueScoring = league_scoring(GRID_SIZE)
@@ -0,0 +1,259 @@
+"""Immutable sessions for evaluating a race.
+
+A session holds everything one evaluation needs, the roster of Drivers and Teams with
+their costs, the probabilities of the race and the ranks of the Drivers, as read-only
+values. Scoring a session reads the probabilities and the league's scoring tables,
+which are cached and shared by every session, and never sets the probabilities, ranks
+or Teams of the Driver and Team objects. Many sessions can therefore be evaluated at
+the same time from threads or asyncio tasks of a single process.
+"""
+
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from pandas import DataFrame, Series
+
+from gridrival.drivers import Driver, FixedInfo
+from gridrival.fantasy import FantasyTeam
+from gridrival.optimization.basic import BasicSolver
+from gridrival.probabilities import GridProbabilities, TeamProbabilities
+from gridrival.teams import Team
+
+DRIVER_COMPONENTS = (
+    "qualifying",
+    "race",
+    "completion",
+    "overtake",
+    "beat_teammate",
+    "personal_improvement",
+)
+TEAM_COMPONENTS = ("qualifying", "race")
+
+
+class Session(NamedTuple):
+    """Session with the roster, probabilities and ranks of one evaluation.
+
+    Sessions are immutable, variations of a session are new sessions created with
+    `with_probabilities` and `with_ranks`.
+
+    Attributes
+    ----------
+    driver_costs: dict
+        Cost of each Driver of the roster. Key is the Driver's name.
+    team_costs: dict
+        Cost of each Team of the roster. Key is the Team's name.
+    teams: dict
+        Names of the two Drivers of each Team. Key is the Team's name.
+    probabilities: GridProbabilities
+        Probabilities of the race.
+    ranks: dict
+        Rank of each Driver given by the eight race rolling average.
+
+    Methods
+    -------
+    from_roster
+        Create a session from Driver and Team objects.
+    with_probabilities
+        Session with the same roster and ranks for other probabilities.
+    with_ranks
+        Session with the same roster and probabilities for other ranks.
+    driver_points
+        Expected points of every Driver for each point component.
+    team_points
+        Expected team points of every Team for each point component.
+    fixed_drivers
+        Fixed info of the Drivers for the solvers.
+    fixed_teams
+        Fixed info of the Teams for the solvers.
+    solve
+        Solve for the best Fantasy Team of the session.
+    """
+
+    driver_costs: Mapping[str, float]
+    team_costs: Mapping[str, float]
+    teams: Mapping[str, Tuple[str, str]]
+    probabilities: GridProbabilities
+    ranks: Mapping[str, float]
+
+    @classmethod
+    def create(
+        cls,
+        driver_costs: Mapping[str, float],
+        team_costs: Mapping[str, float],
+        teams: Mapping[str, Tuple[str, str]],
+        probabilities: GridProbabilities,
+        ranks: Mapping[str, float],
+    ) -> "Session":
+        "Create a session with read-only copies of the mappings given."
+
+        return cls(
+            driver_costs=MappingProxyType(dict(driver_costs)),
+            team_costs=MappingProxyType(dict(team_costs)),
+            teams=MappingProxyType({name: tuple(pair) for name, pair in teams.items()}),
+            probabilities=probabilities,
+            ranks=MappingProxyType(dict(ranks)),
+        )
+
+    @classmethod
+    def from_roster(
+        cls,
+        drivers: Iterable[Driver],
+        teams: Iterable[Team],
+        probabilities: GridProbabilities,
+        ranks: Optional[Mapping[str, float]] = None,
+    ) -> "Session":
+        """Create a session from Driver and Team objects.
+
+        The costs, ranks and team mates of the objects are copied, and the objects are
+        left untouched.
+
+        Parameters
+        ----------
+        drivers: list of Driver
+            Drivers of the roster.
+        teams: list of Team
+            Teams of the roster.
+        probabilities: GridProbabilities
+            Probabilities of the race.
+        ranks: dict
+            Rank of each Driver, by default the rank of the Driver objects.
+
+        Returns
+        -------
+        return: Session
+            Session of the roster.
+        """
+
+        drivers = list(drivers)
+        teams = list(teams)
+        if ranks is None:
+            ranks = {driver.name: driver.rank for driver in drivers}
+
+        return cls.create(
+            driver_costs={driver.name: driver.cost for driver in drivers},
+            team_costs={team.name: team.cost for team in teams},
+            teams={
+                team.name: (team.driver_1.name, team.driver_2.name) for team in teams
+            },
+            probabilities=probabilities,
+            ranks=ranks,
+        )
+
+    def with_probabilities(self, probabilities: GridProbabilities) -> "Session":
+        "Session with the same roster and ranks for other probabilities."
+        return self._replace(probabilities=probabilities)
+
+    def with_ranks(self, ranks: Mapping[str, float]) -> "Session":
+        "Session with the same roster and probabilities for other ranks."
+        return self._replace(ranks=MappingProxyType(dict(ranks)))
+
+    def driver_points(self) -> DataFrame:
+        """Expected points of every Driver for each point component.
+
+        Returns
+        -------
+        return: DataFrame
+            Expected driver points of each Driver (row) for each component (column).
+            Index is the Driver's name.
+        """
+
+        grid = self.probabilities
+        names = list(self.driver_costs)
+        ranks = Series(self.ranks, dtype=float)
+
+        points = DataFrame(
+            {
+                "qualifying": grid.qualifying_points(),
+                "race": grid.race_points(),
+                "completion": grid.completion_points(),
+                "overtake": grid.overtake_points(),
+                "beat_teammate": self._team_probabilities().beat_teammate_points(),
+                "personal_improvement": grid.personal_improvement_points(ranks),
+            }
+        )
+
+        return points.loc[names, list(DRIVER_COMPONENTS)]
+
+    def team_points(self) -> DataFrame:
+        """Expected team points of every Team for each point component.
+
+        Returns
+        -------
+        return: DataFrame
+            Expected team points of each Team (row) for each component (column). Index
+            is the Team's name.
+        """
+
+        team_probabilities = self._team_probabilities()
+
+        points = DataFrame(
+            {
+                "qualifying": team_probabilities.qualifying_points(),
+                "race": team_probabilities.race_points(),
+            }
+        )
+
+        return points.loc[list(self.team_costs), list(TEAM_COMPONENTS)]
+
+    def fixed_drivers(self) -> List[FixedInfo]:
+        "Fixed info of the Drivers for the solvers."
+        return _fixed_info(self.driver_points(), self.driver_costs)
+
+    def fixed_teams(self) -> List[FixedInfo]:
+        "Fixed info of the Teams for the solvers."
+        return _fixed_info(self.team_points(), self.team_costs)
+
+    def solve(
+        self,
+        in_constraint: Sequence[Union[Driver, Team, FixedInfo]] = (),
+        out_constraint: Sequence[Union[Driver, Team, FixedInfo]] = (),
+        budget: float = float("inf"),
+        talent_slot: bool = False,
+    ) -> FantasyTeam:
+        """Solve for the best Fantasy Team of the session.
+
+        Parameters
+        ----------
+        in_constraint: list of Driver and Team
+            Drivers and Teams which much be included in the Fantasy Team.
+        out_constraint: list of Driver and Team
+            Drivers and Teams which can not be included in the Fantasy Team.
+        budget: float
+            Maximum budget for the Fantasy Team.
+        talent_slot: bool
+            If True the Talent Driver is a sixth Driver in a separate slot.
+
+        Returns
+        -------
+        return: FantasyTeam
+            Best Fantasy Team within constraints.
+        """
+
+        solver = BasicSolver(
+            self.fixed_drivers(),
+            self.fixed_teams(),
+            list(in_constraint),
+            list(out_constraint),
+            budget,
+            talent_slot=talent_slot,
+        )
+
+        return solver.solve()
+
+    def _team_probabilities(self) -> TeamProbabilities:
+        "Joint probabilities of the Drivers of each Team of the roster."
+        return self.probabilities.team_probabilities(self.teams)
+
+
+def _fixed_info(points: DataFrame, costs: Mapping[str, float]) -> List[FixedInfo]:
+    "Fixed info with the total points and the points of each component."
+
+    return [
+        FixedInfo(
+            name=name,
+            cost=costs[name],
+            points=float(sum(components)),
+            components={key: float(value) for key, value in components.items()},
+        )
+        for name, components in points.iterrows()
+    ]
@@ -0,0 +1,835 @@
+"""Monte Carlo simulation of fantasy points over full seasons.
+
+Each sample of a season draws the qualifying, race and completion outcomes of every
+race from its GridProbabilities, and scores them with the point system of the league.
+Finishing orders are drawn from a mixture of orders with the position probabilities of
+the grid, so the mean points of the samples are the expected points of the grid, except
+for beat team mate points, which are scored in the sampled orders.
+Samples are simulated in batches, each batch with its own random stream spawned from a
+single seed, so results only depend on the seed and the batch size, and not on how many
+processes run the batches. The points of each batch are folded into streaming
+aggregates, so memory does not grow with the number of samples.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from pandas import DataFrame
+
+from gridrival.dtypes import get_dtype_policy, points_dtype
+from gridrival.fantasy import FantasyTeam
+from gridrival.optimization.universe import ROSTER_SIZE
+from gridrival.probabilities import GridProbabilities
+from gridrival.scoring import league_scoring
+
+BATCH_SIZE = 1000
+BINS = 1000
+PILOT_SAMPLES = 1000
+PILOT_SEED = 0
+PILOT_MARGIN = 0.1
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+TOLERANCE = 1e-12
+
+
+def doubly_stochastic(
+    grid: np.ndarray, tolerance: float = TOLERANCE, max_iter: int = 10000
+) -> np.ndarray:
+    """Scale the rows and columns of a grid until all of them add up to 1.
+
+    Rows and columns are normalized in turns (Sinkhorn scaling). Grids built from odds
+    already have rows and columns which add up to 1, and are left as they are.
+
+    Negative probabilities can not be sampled and are clipped to 0 first. The naive
+    grid gives them to clear favourites in the positions after their probabilities add
+    up to more than 1, so these are the only probabilities the samples do not follow.
+
+    Parameters
+    ----------
+    grid: ndarray
+        Matrix(N, N) with the probability of each Driver (row) ending in each grid
+        position (column).
+    tolerance: float
+        Largest difference from 1 of the sum of a column.
+    max_iter: int
+        Largest number of scalings.
+
+    Returns
+    -------
+    return: ndarray
+        Matrix(N, N) with non-negative probabilities whose rows and columns add up to 1.
+    """
+
+    matrix = np.clip(np.asarray(grid, dtype=float), 0, None)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Grid must have a position for each Driver.")
+    if not (matrix.sum(axis=0) > 0).all() or not (matrix.sum(axis=1) > 0).all():
+        raise ValueError("Every Driver and position must have some probability.")
+
+    for _ in range(max_iter):
+        matrix /= matrix.sum(axis=1, keepdims=True)
+        columns = matrix.sum(axis=0)
+        if np.abs(columns - 1).max() <= tolerance:
+            break
+        matrix /= columns
+
+    return matrix
+
+
+class OrderMixture(NamedTuple):
+    """Mixture of finishing orders whose position probabilities are those of a grid.
+
+    The grid is decomposed into a weighted sum of finishing orders (Birkhoff-von
+    Neumann decomposition), so drawing an order with its weight places every Driver in
+    every position with the probability of the grid. Orders are found one at a time as
+    a matching of Drivers and positions with some probability left, and the smallest
+    probability of the matching is taken out of the grid as its weight.
+
+    Attributes
+    ----------
+    weights: ndarray
+        Probability of each finishing order.
+    positions: ndarray
+        Matrix(K, N) with the position of each Driver in each finishing order, starting
+        at 0.
+
+    Methods
+    -------
+    from_grid
+        Decompose a grid of probabilities into finishing orders.
+    probabilities
+        Probability of each Driver ending in each position.
+    sample
+        Sample finishing orders.
+    """
+
+    weights: np.ndarray
+    positions: np.ndarray
+
+    @classmethod
+    def from_grid(
+        cls, grid: np.ndarray, dtype: np.dtype = np.int64, tolerance: float = TOLERANCE
+    ) -> "OrderMixture":
+        """Decompose a grid of probabilities into finishing orders.
+
+        Parameters
+        ----------
+        grid: ndarray
+            Matrix(N, N) with the probability of each Driver (row) ending in each grid
+            position (column). Rows and columns are scaled to add up to 1 first.
+        dtype: dtype
+            Integer type of the positions.
+        tolerance: float
+            Probability left out of the decomposition.
+
+        Returns
+        -------
+        return: OrderMixture
+            Finishing orders and their probabilities.
+        """
+
+        left = doubly_stochastic(grid, tolerance)
+        n_drivers = len(left)
+        rows = np.arange(n_drivers)
+
+        # Positions are tried from the most likely for each Driver, so the first orders
+        # take the most probability out of the grid.
+        preference = np.argsort(-left, axis=1, kind="stable")
+        position = np.full(n_drivers, -1, dtype=np.intp)
+        driver = np.full(n_drivers, -1, dtype=np.intp)
+
+        weights = []
+        orders = []
+        mass = 1.0
+
+        while mass > tolerance:
+            support = left > tolerance
+            for row in rows[position >= 0]:
+                if not support[row, position[row]]:
+                    driver[position[row]] = -1
+                    position[row] = -1
+            if not all(
+                _augment(row, support, preference, position, driver, set())
+                for row in rows[position < 0]
+            ):
+                break
+
+            weight = left[rows, position].min()
+            left[rows, position] -= weight
+            mass -= weight
+            weights.append(weight)
+            orders.append(position.copy())
+
+        if not weights:
+            raise ValueError("Grid has no finishing order with some probability.")
+
+        weights = np.array(weights)
+
+        return cls(weights / weights.sum(), np.array(orders, dtype=dtype))
+
+    def probabilities(self) -> np.ndarray:
+        """Probability of each Driver ending in each position.
+
+        Returns
+        -------
+        return: ndarray
+            Matrix(N, N) with the probability of each Driver (row) ending in each grid
+            position (column).
+        """
+
+        n_drivers = self.positions.shape[1]
+        result = np.zeros((n_drivers, n_drivers))
+        np.add.at(
+            result,
+            (np.arange(n_drivers), self.positions),
+            np.broadcast_to(self.weights[:, None], self.positions.shape),
+        )
+
+        return result
+
+    def sample(self, samples: int, rng: np.random.Generator) -> np.ndarray:
+        """Sample finishing orders.
+
+        Parameters
+        ----------
+        samples: int
+            Number of finishing orders.
+        rng: Generator
+            Random number generator.
+
+        Returns
+        -------
+        return: ndarray
+            Matrix(samples, N) with the position of each Driver, starting at 0.
+        """
+
+        return self.positions[rng.choice(len(self.weights), samples, p=self.weights)]
+
+
+def _augment(
+    row: int,
+    support: np.ndarray,
+    preference: np.ndarray,
+    position: np.ndarray,
+    driver: np.ndarray,
+    seen: set,
+) -> bool:
+    "Match a Driver to a position, moving the Drivers already matched if needed."
+
+    for column in preference[row]:
+        if support[row, column] and column not in seen:
+            seen.add(column)
+            if driver[column] < 0 or _augment(
+                driver[column], support, preference, position, driver, seen
+            ):
+                driver[column] = row
+                position[row] = column
+                return True
+
+    return False
+
+
+def sample_positions(
+    grid: np.ndarray, samples: int, rng: np.random.Generator, dtype: np.dtype = np.int64
+) -> np.ndarray:
+    """Sample finishing orders from a grid of probabilities.
+
+    Finishing orders are drawn from the mixture of orders of the grid, so each Driver
+    ends in each position with the probability of the grid. The grid is decomposed
+    on every call, and `OrderMixture` keeps the decomposition to sample many times.
+
+    Parameters
+    ----------
+    grid: ndarray
+        Matrix(N, N) with the probability of each Driver (row) ending in each grid
+        position (column).
+    samples: int
+        Number of finishing orders.
+    rng: Generator
+        Random number generator.
+    dtype: dtype
+        Integer type of the positions.
+
+    Returns
+    -------
+    return: ndarray
+        Matrix(samples, N) with the position of each Driver, starting at 0.
+    """
+
+    return OrderMixture.from_grid(grid, dtype).sample(samples, rng)
+
+
+def sample_categories(
+    probabilities: np.ndarray, samples: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Sample a category for each Driver from its probabilities.
+
+    Parameters
+    ----------
+    probabilities: ndarray
+        Matrix(N, C) with the probability of each Driver (row) for each category.
+    samples: int
+        Number of samples.
+    rng: Generator
+        Random number generator.
+
+    Returns
+    -------
+    return: ndarray
+        Matrix(samples, N) with the category of each Driver.
+    """
+
+    cdf = np.cumsum(probabilities, axis=1)
+    uniform = rng.random((samples, len(probabilities), 1)) * cdf[:, -1:]
+
+    return np.minimum((uniform >= cdf).sum(axis=2), probabilities.shape[1] - 1)
+
+
+class PointsAggregate:
+    """Streaming aggregate of the points of many entities over many samples.
+
+    Keeps the count, sum, sum of squares, minimum, maximum and a histogram of the
+    points of each entity. Quantiles are interpolated from the histogram and are
+    accurate to the width of a bin. Points outside the histogram are counted in its
+    first or last bin.
+
+    Attributes
+    ----------
+    names: list of str
+        Names of the entities.
+    lower: ndarray
+        Lower edge of the histogram of each entity.
+    upper: ndarray
+        Upper edge of the histogram of each entity, whose bins are evenly spaced from
+        the lower edge.
+    counts: ndarray
+        Matrix(E, B) with the number of samples in each bin of each entity.
+    samples: int
+        Number of samples aggregated.
+
+    Methods
+    -------
+    update
+        Add a batch of samples.
+    merge
+        Add the samples of another aggregate with the same entities and bins.
+    mean
+        Mean points of each entity.
+    std
+        Standard deviation of the points of each entity.
+    quantiles
+        Quantiles of the points of each entity.
+    summary
+        DataFrame with the mean, standard deviation, range and quantiles.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        lower: np.ndarray,
+        upper: np.ndarray,
+        bins: int = BINS,
+    ) -> None:
+
+        self.names = list(names)
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=float), len(self.names))
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=float), len(self.names))
+        self.counts = np.zeros((len(self.names), bins), dtype=np.int64)
+        self.samples = 0
+
+        self._sum = np.zeros(len(self.names))
+        self._sum_sq = np.zeros(len(self.names))
+        self._min = np.full(len(self.names), np.inf)
+        self._max = np.full(len(self.names), -np.inf)
+
+    def update(self, points: np.ndarray) -> None:
+        """Add a batch of samples.
+
+        Parameters
+        ----------
+        points: ndarray
+            Matrix(samples, E) with the points of each entity in each sample.
+        """
+
+        points = np.asarray(points, dtype=float)
+        n_entities, bins = self.counts.shape
+
+        self.samples += len(points)
+        self._sum += points.sum(axis=0)
+        self._sum_sq += (points**2).sum(axis=0)
+        self._min = np.minimum(self._min, points.min(axis=0, initial=np.inf))
+        self._max = np.maximum(self._max, points.max(axis=0, initial=-np.inf))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            index = np.nan_to_num(
+                (points - self.lower) / (self.upper - self.lower) * bins
+            )
+        index = np.clip(index.astype(np.int64), 0, bins - 1)
+        index += np.arange(n_entities) * bins
+
+        self.counts += np.bincount(index.ravel(), minlength=n_entities * bins).reshape(
+            n_entities, bins
+        )
+
+    def merge(self, other: "PointsAggregate") -> None:
+        """Add the samples of another aggregate with the same entities and bins.
+
+        Parameters
+        ----------
+        other: PointsAggregate
+            Aggregate of other samples.
+        """
+
+        self.samples += other.samples
+        self.counts += other.counts
+        self._sum += other._sum
+        self._sum_sq += other._sum_sq
+        self._min = np.minimum(self._min, other._min)
+        self._max = np.maximum(self._max, other._max)
+
+    def mean(self) -> np.ndarray:
+        "Mean points of each entity."
+        return self._sum / self.samples
+
+    def std(self) -> np.ndarray:
+        "Standard deviation of the points of each entity."
+        variance = self._sum_sq / self.samples - self.mean() ** 2
+        return np.sqrt(np.clip(variance, 0, None))
+
+    def quantiles(self, q: Sequence[float] = QUANTILES) -> np.ndarray:
+        """Quantiles of the points of each entity.
+
+        Parameters
+        ----------
+        q: list of float
+            Quantiles to compute, between 0 and 1.
+
+        Returns
+        -------
+        return: ndarray
+            Matrix(E, Q) with the quantiles of each entity.
+        """
+
+        cumulative = np.cumsum(self.counts, axis=1) / max(self.samples, 1)
+        result = np.empty((len(self.names), len(q)))
+
+        for entity, (lower, upper) in enumerate(zip(self.lower, self.upper)):
+            edges = np.linspace(lower, upper, self.counts.shape[1] + 1)
+            result[entity] = np.interp(q, np.append(0, cumulative[entity]), edges)
+
+        return np.clip(result, self._min[:, None], self._max[:, None])
+
+    def summary(self, q: Sequence[float] = QUANTILES) -> DataFrame:
+        """DataFrame with the mean, standard deviation, range and quantiles.
+
+        Parameters
+        ----------
+        q: list of float
+            Quantiles to compute, between 0 and 1.
+
+        Returns
+        -------
+        return: DataFrame
+            Statistics of the points of each entity. Index is the entity's name.
+        """
+
+        summary = DataFrame(
+            {
+                "mean": self.mean(),
+                "std": self.std(),
+                "min": self._min,
+                "max": self._max,
+            },
+            index=self.names,
+        )
+        for quantile, values in zip(q, self.quantiles(q).T):
+            summary[f"q{quantile:g}"] = values
+
+        return summary
+
+
+class SeasonResults:
+    """Streaming aggregates of the season points of Drivers, Teams and line-ups.
+
+    Attributes
+    ----------
+    drivers: PointsAggregate
+        Season points of each Driver.
+    teams: PointsAggregate
+        Season points of each Team.
+    lineups: PointsAggregate
+        Season points of each line-up.
+
+    Methods
+    -------
+    merge
+        Add the samples of other results.
+    """
+
+    def __init__(
+        self, drivers: PointsAggregate, teams: PointsAggregate, lineups: PointsAggregate
+    ) -> None:
+
+        self.drivers = drivers
+        self.teams = teams
+        self.lineups = lineups
+
+    def merge(self, other: "SeasonResults") -> None:
+        "Add the samples of other results."
+
+        self.drivers.merge(other.drivers)
+        self.teams.merge(other.teams)
+        self.lineups.merge(other.lineups)
+
+
+class RaceSampler(NamedTuple):
+    """Distributions a race of the season simulator samples from.
+
+    Attributes
+    ----------
+    race: OrderMixture
+        Race finishing orders.
+    qual: OrderMixture
+        Qualifying finishing orders.
+    comp: ndarray
+        Matrix(N, C) with the probability of each Driver for each completion category.
+    """
+
+    race: OrderMixture
+    qual: OrderMixture
+    comp: np.ndarray
+
+
+class SeasonSimulator:
+    """Season Simulator samples the fantasy points of full seasons.
+
+    Every race of a sample draws qualifying and race finishing orders from the grids of
+    its GridProbabilities, independently of each other, and a completion percentage for
+    each Driver. Grids with a correlation between qualifying and race positions are not
+    supported. Finishing orders are drawn from the `OrderMixture` of each grid, which
+    is decomposed once, so each Driver ends in each position with the probability of the
+    grid. Team mates are scored against each other in the sampled race order, so exactly
+    one of them beats the other. Their joint positions are those of the order mixture,
+    which can differ from the joint TeamProbabilities of the expected beat team mate
+    points. The outcomes are scored with the point system of the league, and the points
+    of the races are added up for the season.
+
+    The histograms of points span the range of a pilot of `PILOT_SAMPLES` seasons drawn
+    with a fixed seed when the simulator is created, widened by `PILOT_MARGIN` of the
+    range on each side. Quantiles are accurate to the width of a bin, the widened range
+    divided by the number of bins.
+
+    Samples are split in batches, and each batch draws from its own random stream
+    spawned from the seed with `SeedSequence.spawn`. Batches can be run across processes
+    which each keep a copy of the simulator, and the results are the same for any
+    number of processes.
+
+    Attributes
+    ----------
+    races: list of GridProbabilities
+        Probabilities of every race of the season.
+    drivers: list of str
+        Names of the Drivers.
+    teams: list of str
+        Names of the Teams.
+    lineups: list of FantasyTeam
+        Line-ups whose season points are simulated.
+    processes: int
+        Number of worker processes, if None batches are run in this process.
+    batch_size: int
+        Number of samples simulated together.
+    bins: int
+        Number of bins of the histograms of points.
+
+    Methods
+    -------
+    run
+        Simulate seasons and aggregate their points.
+    simulate_batch
+        Simulate a batch of seasons with a random stream.
+    race_points
+        Points of each Driver and Team in every race of a batch of seasons.
+    """
+
+    def __init__(
+        self,
+        races: Sequence[GridProbabilities],
+        ranks: Mapping[str, float],
+        teams: Mapping[str, Tuple[str, str]],
+        lineups: Sequence[FantasyTeam] = (),
+        processes: Optional[int] = None,
+        batch_size: int = BATCH_SIZE,
+        bins: int = BINS,
+    ) -> None:
+
+        self.races = list(races)
+        self.drivers = list(self.races[0].names)
+        self.teams = list(teams)
+        self.lineups = list(lineups)
+        self.processes = processes
+        self.batch_size = batch_size
+        self.bins = bins
+
+        grid_size = len(self.drivers)
+        self._scoring = league_scoring(grid_size)
+        self._dtype = points_dtype()
+        self._position_dtype = get_dtype_policy().position(grid_size)
+
+        if any(grid.correlation for grid in self.races):
+            raise ValueError(
+                "Qualifying and race positions are sampled independently, grids can "
+                "not have a correlation."
+            )
+
+        index = {name: i for i, name in enumerate(self.drivers)}
+        self._team_drivers = np.array(
+            [[index[driver] for driver in teams[team]] for team in self.teams],
+            dtype=np.intp,
+        ).reshape(len(self.teams), 2)
+
+        # Team mate of each Driver, the Driver itself if it is in no Team.
+        self._teammate = np.arange(grid_size)
+        self._teammate[self._team_drivers[:, 0]] = self._team_drivers[:, 1]
+        self._teammate[self._team_drivers[:, 1]] = self._team_drivers[:, 0]
+
+        self._samplers = [self._sampler(grid) for grid in self.races]
+
+        self._driver_tables, self._team_tables = self._tables()
+        self._improvement = self._improvement_rows(
+            np.array([ranks[driver] for driver in self.drivers], dtype=float)
+        )
+
+        team_index = {name: i for i, name in enumerate(self.teams)}
+        self._lineup_drivers = np.array(
+            [[index[d.name] for d in lineup.drivers] for lineup in self.lineups],
+            dtype=np.intp,
+        ).reshape(len(self.lineups), ROSTER_SIZE)
+        self._lineup_team = np.array(
+            [team_index[lineup.team.name] for lineup in self.lineups], dtype=np.intp
+        )
+        self._lineup_talent = np.zeros((len(self.lineups), grid_size), self._dtype)
+        for i, lineup in enumerate(self.lineups):
+            if lineup.talent_driver.name in index:
+                factor = 1 if lineup.talent_in_roster() else 2
+                self._lineup_talent[i, index[lineup.talent_driver.name]] = factor
+
+        self._bounds = self._pilot_bounds()
+
+    def run(self, samples: int, seed: Optional[int] = None) -> SeasonResults:
+        """Simulate seasons and aggregate their points.
+
+        Parameters
+        ----------
+        samples: int
+            Number of seasons to simulate.
+        seed: int
+            Seed of the random streams. If None results are not reproducible.
+
+        Returns
+        -------
+        return: SeasonResults
+            Aggregates of the season points of Drivers, Teams and line-ups.
+        """
+
+        sizes = [
+            min(self.batch_size, samples - start)
+            for start in range(0, samples, self.batch_size)
+        ]
+        streams = np.random.SeedSequence(seed).spawn(len(sizes))
+        batches = list(zip(streams, sizes))
+
+        results = self._empty_results()
+
+        if self.processes is None:
+            for batch in batches:
+                results.merge(self.simulate_batch(*batch))
+        else:
+            with ProcessPoolExecutor(
+                self.processes, initializer=_init_worker, initargs=(self,)
+            ) as executor:
+                for batch_results in executor.map(_simulate_batch, batches):
+                    results.merge(batch_results)
+
+        return results
+
+    def simulate_batch(
+        self, stream: np.random.SeedSequence, samples: int
+    ) -> SeasonResults:
+        """Simulate a batch of seasons with a random stream.
+
+        Parameters
+        ----------
+        stream: SeedSequence
+            Seed of the random stream of the batch.
+        samples: int
+            Number of seasons in the batch.
+
+        Returns
+        -------
+        return: SeasonResults
+            Aggregates of the season points of the batch.
+        """
+
+        points = self._season_points(samples, np.random.default_rng(stream))
+
+        results = self._empty_results()
+        for aggregate, entity_points in zip(
+            (results.drivers, results.teams, results.lineups), points
+        ):
+            aggregate.update(entity_points)
+
+        return results
+
+    def race_points(
+        self, samples: int, rng: np.random.Generator
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Points of each Driver and Team in every race of a batch of seasons.
+
+        Parameters
+        ----------
+        samples: int
+            Number of seasons in the batch.
+        rng: Generator
+            Random number generator.
+
+        Yields
+        ------
+        drivers: ndarray
+            Matrix(samples, N) with the points of each Driver in the race.
+        teams: ndarray
+            Matrix(samples, T) with the points of each Team in the race.
+        """
+
+        for sampler in self._samplers:
+            yield self._race_points(sampler, samples, rng)
+
+    def _season_points(
+        self, samples: int, rng: np.random.Generator
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        "Season points of each Driver, Team and line-up in a batch of samples."
+
+        driver_points = np.zeros((samples, len(self.drivers)), dtype=self._dtype)
+        team_points = np.zeros((samples, len(self.teams)), dtype=self._dtype)
+
+        for drivers, teams in self.race_points(samples, rng):
+            driver_points += drivers
+            team_points += teams
+
+        lineup_points = (
+            driver_points[:, self._lineup_drivers].sum(axis=2)
+            + team_points[:, self._lineup_team]
+            + driver_points @ self._lineup_talent.T
+        )
+
+        return driver_points, team_points, lineup_points
+
+    def _sampler(self, grid: GridProbabilities) -> RaceSampler:
+        "Finishing orders of a race, decomposed once."
+
+        index = grid.rows(self.drivers)
+        race = OrderMixture.from_grid(grid.race_array[index], self._position_dtype)
+        qual = race
+        if grid.qual_array is not grid.race_array:
+            qual = OrderMixture.from_grid(grid.qual_array[index], self._position_dtype)
+
+        return RaceSampler(race, qual, grid.comp_array[index])
+
+    def _race_points(
+        self, sampler: RaceSampler, samples: int, rng: np.random.Generator
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        "Points of each Driver and Team in a batch of samples of a race."
+
+        qual = sampler.qual.sample(samples, rng)
+        race = sampler.race.sample(samples, rng)
+        completion = sample_categories(sampler.comp, samples, rng)
+
+        driver, team = self._driver_tables, self._team_tables
+        rows = np.arange(len(self.drivers))
+
+        driver_points = (
+            driver["QUALIFYING"][qual]
+            + driver["RACE"][race]
+            + driver["COMPLETION"][completion]
+            + driver["OVERTAKE"][qual, race]
+            + driver["BEAT_TEAMMATE"][race[:, self._teammate], race]
+            + self._improvement[rows, race]
+        )
+        team_points = (team["QUALIFYING"][qual] + team["RACE"][race])[
+            :, self._team_drivers
+        ].sum(axis=2)
+
+        return driver_points, team_points
+
+    def _tables(self) -> Tuple[dict, dict]:
+        "Point tables of the league indexed by position starting at 0."
+
+        driver = self._scoring.Driver
+        team = self._scoring.Team
+
+        return (
+            {
+                "QUALIFYING": driver.QUALIFYING.to_numpy(self._dtype),
+                "RACE": driver.RACE.to_numpy(self._dtype),
+                "COMPLETION": driver.COMPLETION.to_numpy(self._dtype),
+                "OVERTAKE": driver.OVERTAKE.to_numpy(self._dtype),
+                "BEAT_TEAMMATE": driver.BEAT_TEAMMATE.to_numpy(self._dtype),
+            },
+            {
+                "QUALIFYING": team.QUALIFYING.to_numpy(self._dtype),
+                "RACE": team.RACE.to_numpy(self._dtype),
+            },
+        )
+
+    def _improvement_rows(self, ranks: np.ndarray) -> np.ndarray:
+        "Personal improvement points of each Driver for each race position."
+
+        grid_size = len(self.drivers)
+        table = self._scoring.Driver.PERSONAL_IMPROVEMENT_GRID.to_numpy(float)
+
+        rank = np.clip(ranks, 1, grid_size) - 1
+        lower = np.floor(rank).astype(int)
+        upper = np.minimum(lower + 1, grid_size - 1)
+        weight = (rank - lower)[:, None]
+
+        return ((1 - weight) * table[lower] + weight * table[upper]).astype(self._dtype)
+
+    def _pilot_bounds(self) -> Tuple[Tuple[np.ndarray, np.ndarray], ...]:
+        "Edges of the histograms of points from a pilot run with a fixed seed."
+
+        bounds = []
+        for points in self._season_points(
+            PILOT_SAMPLES, np.random.default_rng(PILOT_SEED)
+        ):
+            lower = points.min(axis=0, initial=np.inf).astype(float)
+            upper = points.max(axis=0, initial=-np.inf).astype(float)
+            margin = PILOT_MARGIN * (upper - lower)
+            bounds.append((lower - margin, upper + margin))
+
+        return tuple(bounds)
+
+    def _empty_results(self) -> SeasonResults:
+        "Aggregates with no samples."
+
+        drivers, teams, lineups = self._bounds
+
+        return SeasonResults(
+            PointsAggregate(self.drivers, *drivers, self.bins),
+            PointsAggregate(self.teams, *teams, self.bins),
+            PointsAggregate(
+                [str(lineup) for lineup in self.lineups], *lineups, self.bins
+            ),
+        )
+
+
+_SIMULATOR: Optional[SeasonSimulator] = None
+
+
+def _init_worker(simulator: SeasonSimulator) -> None:
+    "Keep the simulator in the worker process."
+    global _SIMULATOR
+    _SIMULATOR = simulator
+
+
+def _simulate_batch(batch: Tuple[np.random.SeedSequence, int]) -> SeasonResults:
+    "Simulate a batch of seasons in a worker process."
+    return _SIMULATOR.simulate_batch(*batch)
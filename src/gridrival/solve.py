@@ -3,34 +3,23 @@
 from pandas import Series
 
 from gridrival.drivers import DRIVERS, CSainz, GRUssell, MVerstappen, PGasly, YTsunoda
-from gridrival.optimization.basic import BasicSolver
 from gridrival.probabilities import GridProbabilities
-from gridrival.probabilities.betting_odds import TOP_1, WinningOdds
+from gridrival.probabilities.betting_odds import QUAL_1, RET_1, TOP_1
+from gridrival.session import Session
 from gridrival.teams import TEAMS, Ferrari
 
+IN_CONSTRAINT = [PGasly, Ferrari]
+OUT_CONSTRAINT = [CSainz, YTsunoda, GRUssell, MVerstappen]
+BUDGET = 103.4 * 1e6
 
-def main() -> None:
-
-    # Use Winning Odds for Grid Probabilities
-    Top1Odds = WinningOdds(Series(TOP_1))
-    Prob = GridProbabilities(Top1Odds.naive_grid())
 
-    # Update Driver Probabilities
-    for driver in DRIVERS:
-        driver.probabilities = Prob.driver_probabilities(driver.name)
+def main() -> None:
 
-    # Fix Driver and Team points
-    fixed_drivers = [driver.to_fixed_info() for driver in DRIVERS]
-    fixed_teams = [team.to_fixed_info() for team in TEAMS]
+    # Use Winning, Qualifying and Retirement Odds for Grid Probabilities
+    Prob = GridProbabilities.from_odds(Series(TOP_1), Series(RET_1), Series(QUAL_1))
 
-    # Use Basic Solver
-    solver = BasicSolver(
-        fixed_drivers,
-        fixed_teams,
-        [PGasly, Ferrari],
-        [CSainz, YTsunoda, GRUssell, MVerstappen],
-        103.4 * 1e6,
-    )
+    # Evaluate the race in a session, without updating the Drivers
+    session = Session.from_roster(DRIVERS, TEAMS, Prob)
 
     # print solution
-    print(solver.solve())
+    print(session.solve(IN_CONSTRAINT, OUT_CONSTRAINT, BUDGET))
@@ -1,5 +1,7 @@
 "F1 Teams"
 
+from typing import Dict, Optional
+
 from gridrival.drivers import (
     AGiovinazzi,
     CLeclerc,
@@ -24,6 +26,7 @@ from gridrival.drivers import (
     VBottas,
     YTsunoda,
 )
+from gridrival.probabilities import TeamProbabilities
 
 
 class Team:
@@ -41,21 +44,32 @@ class Team:
         Driver which belongs to the Team.
     driver_2: Driver
         Driver which belongs to the Team.
+    probabilities: TeamProbabilities
+        Joint probabilities of the two Drivers shared by the whole grid. If None the
+        points are computed from the probabilities of each Driver.
 
     Methods
     -------
     points
         Expected team points earned by the Team.
+    points_breakdown
+        Expected team points earned by the Team for each point component.
     """
 
     def __init__(
-        self, name: str, driver_1: Driver, driver_2: Driver, cost: int
+        self,
+        name: str,
+        driver_1: Driver,
+        driver_2: Driver,
+        cost: int,
+        probabilities: Optional[TeamProbabilities] = None,
     ) -> None:
 
         self.name = name
         self.driver_1 = driver_1
         self.driver_2 = driver_2
         self.cost = cost
+        self.probabilities = probabilities
 
         driver_1.team = self
         driver_2.team = self
@@ -71,6 +85,9 @@ class Team:
             Expected points earned by the Drivers in the qualifying stage.
         """
 
+        if self.probabilities is not None:
+            return float(self.probabilities.qualifying_points()[self.name])
+
         return self.driver_1.qualifying_points(
             team=True
         ) + self.driver_2.qualifying_points(team=True)
@@ -86,6 +103,9 @@ class Team:
             Expected points earned by the Drivers in the race stage.
         """
 
+        if self.probabilities is not None:
+            return float(self.probabilities.race_points()[self.name])
+
         return self.driver_1.race_points(team=True) + self.driver_2.race_points(
             team=True
         )
@@ -101,12 +121,36 @@ class Team:
             Expected points earned by the Drivers in the race.
         """
 
+        if self.probabilities is not None:
+            return float(self.probabilities.points()[self.name])
+
         return self.driver_1.points(team=True) + self.driver_2.points(team=True)
 
+    def points_breakdown(self) -> Dict[str, float]:
+        """Expected team points earned by the Team for each point component.
+
+        Returns
+        -------
+        return: dict
+            Expected team points of each component. Key is the component's name.
+        """
+
+        return {
+            "qualifying": float(self.qualifying_points()),
+            "race": float(self.race_points()),
+        }
+
     def to_fixed_info(self) -> FixedInfo:
         "Fix Team info for easy optimization."
 
-        return FixedInfo(name=self.name, cost=self.cost, points=self.points())
+        components = self.points_breakdown()
+
+        return FixedInfo(
+            name=self.name,
+            cost=self.cost,
+            points=float(sum(components.values())),
+            components=components,
+        )
 
     def __contains__(self, driver: Driver) -> bool:
         "A Team contains a Driver if it is one of its two Drivers."
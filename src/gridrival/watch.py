@@ -0,0 +1,514 @@
+"""Watch betting odds as they arrive and keep the optimal Team up to date.
+
+Odds snapshots map a market name to the odds of each Driver, for example:
+
+    {"TOP_1": {"L. Hamilton": 2.5, ...}, "RET_1": {"NO_RETIREMENT": 4.1, ...}}
+
+as a JSON file, or as a CSV file with the columns `market`, `name` and `odds`. A
+snapshot may hold only some markets, and only some Drivers of a market, in which case
+the rest of the odds are kept from previous snapshots.
+
+Snapshots should be written under another name and renamed into the directory once
+complete. A snapshot which can not be parsed yet, because it is still being written, is
+read again once it changes.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Union,
+)
+
+import pandas as pd
+from pandas import DataFrame, Series
+
+from gridrival.drivers import DRIVERS, Driver, FixedInfo
+from gridrival.fantasy import FantasyTeam
+from gridrival.optimization.basic import BasicSolver
+from gridrival.probabilities import GridProbabilities
+from gridrival.probabilities.betting_odds import (
+    QUAL_1,
+    RET_1,
+    TOP_1,
+    RetirementOdds,
+    WinningOdds,
+)
+from gridrival.solve import BUDGET, IN_CONSTRAINT, OUT_CONSTRAINT
+from gridrival.teams import TEAMS, Team
+
+POLL_INTERVAL = 1.0
+SNAPSHOT_SUFFIXES = (".json", ".csv")
+
+# Errors of reading a snapshot which is still being written, or was just removed.
+SNAPSHOT_ERRORS = (
+    OSError,
+    UnicodeDecodeError,
+    json.JSONDecodeError,
+    pd.errors.EmptyDataError,
+    pd.errors.ParserError,
+    KeyError,
+)
+
+# Grid built from each market.
+MARKETS = {"TOP_1": "race", "QUAL_1": "qual", "RET_1": "comp"}
+
+# Driver point components which depend on each grid.
+COMPONENTS = {
+    "race": ["race", "overtake", "beat_teammate", "personal_improvement"],
+    "qual": ["qualifying", "overtake"],
+    "comp": ["completion"],
+}
+
+
+def read_snapshot(path: Union[str, Path]) -> Dict[str, Series]:
+    """Read an odds snapshot from a JSON or CSV file.
+
+    Parameters
+    ----------
+    path: str or Path
+        File with the snapshot.
+
+    Returns
+    -------
+    return: dict
+        Odds of each market. Key is the market's name.
+    """
+
+    path = Path(path)
+
+    if path.suffix == ".json":
+        with open(path) as file:
+            markets = json.load(file)
+        return {market: Series(odds, dtype=float) for market, odds in markets.items()}
+
+    if path.suffix == ".csv":
+        rows = pd.read_csv(path)
+        return {
+            market: odds.set_index("name")["odds"].astype(float)
+            for market, odds in rows.groupby("market")
+        }
+
+    raise ValueError(f"{path.name} is not a JSON or CSV snapshot.")
+
+
+async def tail_snapshots(
+    directory: Union[str, Path], interval: float = POLL_INTERVAL
+) -> AsyncIterator[Dict[str, Series]]:
+    """Read the odds snapshots dropped in a directory as they arrive.
+
+    Files already in the directory are read first, in order of name, and the directory
+    is then polled for new files. A file is read again when it is replaced, and a file
+    which can not be parsed is skipped until it changes. Only the files still in the
+    directory are remembered.
+
+    Parameters
+    ----------
+    directory: str or Path
+        Directory where snapshots are dropped.
+    interval: float
+        Seconds between polls of the directory.
+
+    Yields
+    ------
+    snapshot: dict
+        Odds of each market in each new file.
+    """
+
+    read: Dict[Path, int] = {}
+
+    while True:
+        mtimes = _mtimes(Path(directory))
+        read = {path: mtime for path, mtime in read.items() if path in mtimes}
+
+        for path in sorted(mtimes):
+            if read.get(path) == mtimes[path]:
+                continue
+            read[path] = mtimes[path]
+
+            try:
+                snapshot = read_snapshot(path)
+            except SNAPSHOT_ERRORS:
+                continue
+            yield snapshot
+
+        await asyncio.sleep(interval)
+
+
+def _mtimes(directory: Path) -> Dict[Path, int]:
+    "Modification time of each snapshot in a directory."
+
+    mtimes = {}
+    for path in directory.iterdir():
+        if path.suffix not in SNAPSHOT_SUFFIXES:
+            continue
+        try:
+            mtimes[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+
+    return mtimes
+
+
+class IncrementalScorer:
+    """Keep the probabilities and expected points of the grid up to date with odds.
+
+    Each snapshot only rebuilds the grids of the markets whose odds changed, and only
+    the point components which depend on those grids are recomputed.
+
+    Every market is normalized over the whole field, so a change to the odds of a
+    single Driver moves the probabilities of every Driver. The components of a changed
+    market are therefore recomputed for the whole grid, and the points of every Team
+    when the race or qualifying grid changed.
+
+    Attributes
+    ----------
+    drivers: list of Driver
+        Drivers in the grid.
+    teams: list of Team
+        Teams in the grid.
+    odds: dict
+        Latest odds of each market.
+    grid: GridProbabilities
+        Probabilities of the grid last scored.
+    components: DataFrame
+        Expected points of each Driver for each point component.
+    team_points: Series
+        Expected points of each Team.
+    tolerance: float
+        Largest change of the probabilities of a grid since it was last scored which
+        is ignored.
+    correlation: float
+        Correlation between qualifying and race positions.
+
+    Methods
+    -------
+    update
+        Update the odds with a new snapshot.
+    fixed_drivers
+        Fixed info of the Drivers with their latest points.
+    fixed_teams
+        Fixed info of the Teams with their latest points.
+    """
+
+    def __init__(
+        self,
+        drivers: List[Driver],
+        teams: List[Team],
+        odds: Mapping[str, Series],
+        tolerance: float = 0.0,
+        correlation: float = 0.0,
+    ) -> None:
+
+        self.drivers = drivers
+        self.teams = teams
+        self.tolerance = tolerance
+        self.correlation = correlation
+
+        self._rank = Series({driver.name: driver.rank for driver in drivers})
+
+        self.odds = {market: Series(odds[market], dtype=float) for market in odds}
+        self._grids = {
+            grid: self._build_grid(market)
+            for market, grid in MARKETS.items()
+            if market in self.odds
+        }
+        self.grid = self._grid()
+
+        names = [driver.name for driver in drivers]
+        self.components = DataFrame(
+            0.0,
+            index=names,
+            columns=[
+                "qualifying",
+                "race",
+                "completion",
+                "overtake",
+                "beat_teammate",
+                "personal_improvement",
+            ],
+        )
+        self.team_points = Series(0.0, index=[team.name for team in teams])
+        self._score(set(self.components.columns))
+
+    def update(self, snapshot: Mapping[str, Series]) -> Set[str]:
+        """Update the odds with a new snapshot.
+
+        Parameters
+        ----------
+        snapshot: dict
+            Odds of the markets in the snapshot. Key is the market's name.
+
+        Returns
+        -------
+        return: set of str
+            Names of the Drivers and Teams whose expected points changed.
+        """
+
+        components: Set[str] = set()
+
+        for market, odds in snapshot.items():
+            if market not in MARKETS:
+                continue
+
+            previous = self.odds.get(market)
+            odds = Series(odds, dtype=float)
+            if previous is not None:
+                odds = self._merge(previous, odds)
+                if odds.equals(previous):
+                    continue
+            self.odds[market] = odds
+
+            grid = MARKETS[market]
+            probabilities = self._build_grid(market)
+            # The last scored grid is kept, so small moves add up until they are scored.
+            if self._changed(self._grids.get(grid), probabilities):
+                self._grids[grid] = probabilities
+                components.update(COMPONENTS[grid])
+                if grid == "race" and "qual" not in self._grids:
+                    components.update(COMPONENTS["qual"])
+
+        if not components:
+            return set()
+
+        self.grid = self._grid()
+        before_drivers = self.components.sum(axis=1)
+        before_teams = self.team_points.copy()
+        self._score(components)
+
+        drivers = before_drivers.index[before_drivers != self.components.sum(axis=1)]
+        teams = before_teams.index[before_teams != self.team_points]
+
+        return set(drivers) | set(teams)
+
+    def fixed_drivers(self) -> List[FixedInfo]:
+        "Fixed info of the Drivers with their latest points."
+
+        points = self.components.sum(axis=1)
+
+        return [
+            FixedInfo(name=driver.name, cost=driver.cost, points=points[driver.name])
+            for driver in self.drivers
+        ]
+
+    def fixed_teams(self) -> List[FixedInfo]:
+        "Fixed info of the Teams with their latest points."
+
+        return [
+            FixedInfo(
+                name=team.name, cost=team.cost, points=self.team_points[team.name]
+            )
+            for team in self.teams
+        ]
+
+    @staticmethod
+    def _merge(previous: Series, odds: Series) -> Series:
+        "Odds of a snapshot completed with the previous odds of the market."
+
+        merged = previous.copy()
+        merged.update(odds)
+
+        return pd.concat([merged, odds.loc[odds.index.difference(previous.index)]])
+
+    def _build_grid(self, market: str) -> DataFrame:
+        "Probabilities built from the latest odds of a market."
+
+        if MARKETS[market] == "comp":
+            return RetirementOdds(self.odds[market]).completion_probabilities()
+        return WinningOdds(self.odds[market]).naive_grid()
+
+    def _changed(self, before: Optional[DataFrame], after: DataFrame) -> bool:
+        "Any probability of the grid changed by more than the tolerance."
+
+        if (
+            before is None
+            or not before.columns.equals(after.columns)
+            or not before.index.sort_values().equals(after.index.sort_values())
+        ):
+            return True
+
+        change = (after - before.loc[after.index]).abs().to_numpy().max(initial=0)
+
+        return bool(change > self.tolerance)
+
+    def _grid(self) -> GridProbabilities:
+        "Probabilities of the grid from the latest grids of each market."
+
+        return GridProbabilities(
+            self._grids["race"],
+            self._grids["comp"],
+            self._grids.get("qual"),
+            correlation=self.correlation,
+        )
+
+    def _score(self, components: Set[str]) -> None:
+        "Recompute the point components of every Driver and the points of the Teams."
+
+        grid = self.grid.select(self.components.index)
+        scores = {
+            "qualifying": grid.qualifying_points,
+            "race": grid.race_points,
+            "completion": grid.completion_points,
+            "overtake": grid.overtake_points,
+            "personal_improvement": lambda: grid.personal_improvement_points(
+                self._rank
+            ),
+        }
+        for component, score in scores.items():
+            if component in components:
+                self.components[component] = score()
+
+        if not components & {"qualifying", "race"}:
+            return
+
+        probabilities = grid.team_probabilities(
+            {team.name: (team.driver_1.name, team.driver_2.name) for team in self.teams}
+        )
+        if "beat_teammate" in components:
+            beat_teammate = probabilities.beat_teammate_points()
+            self.components.loc[beat_teammate.index, "beat_teammate"] = beat_teammate
+        self.team_points = probabilities.points().loc[self.team_points.index]
+
+
+class OddsWatcher:
+    """Odds Watcher emits the optimal Fantasy Team every time new odds change it.
+
+    Every snapshot updates the expected points incrementally, and the Fantasy Team is
+    only solved again if the points of any Driver or Team changed. A new Fantasy Team is
+    only emitted when it differs from the last one emitted.
+
+    Attributes
+    ----------
+    scorer: IncrementalScorer
+        Probabilities and expected points kept up to date with the odds.
+    in_constraint: list of Driver and Team
+        Drivers and Teams which much be included in the Fantasy Team.
+    out_constraint: list of Driver and Team
+        Drivers and Teams which can not be included in the Fantasy Team.
+    budget: int
+        Maximum budget for the Fantasy Team.
+    talent_slot: bool
+        If True the Talent Driver is a sixth Driver in a separate slot.
+    best: FantasyTeam
+        Latest optimal Fantasy Team.
+
+    Methods
+    -------
+    update
+        Update the odds and return the optimal Fantasy Team if it changed.
+    watch
+        Emit the optimal Fantasy Team every time a stream of snapshots changes it.
+    """
+
+    def __init__(
+        self,
+        scorer: IncrementalScorer,
+        in_constraint: List[Union[Driver, Team]],
+        out_constraint: List[Union[Driver, Team]],
+        budget: int,
+        talent_slot: bool = False,
+    ) -> None:
+
+        self.scorer = scorer
+        self.in_constraint = in_constraint
+        self.out_constraint = out_constraint
+        self.budget = budget
+        self.talent_slot = talent_slot
+
+        self.best = self._solve()
+
+    def update(self, snapshot: Mapping[str, Series]) -> Optional[FantasyTeam]:
+        """Update the odds and return the optimal Fantasy Team if it changed.
+
+        Parameters
+        ----------
+        snapshot: dict
+            Odds of the markets in the snapshot. Key is the market's name.
+
+        Returns
+        -------
+        return: FantasyTeam
+            New optimal Fantasy Team, None if the optimal Fantasy Team did not change.
+        """
+
+        if not self.scorer.update(snapshot):
+            return None
+
+        best = self._solve()
+        if self._key(best) == self._key(self.best):
+            self.best = best
+            return None
+
+        self.best = best
+
+        return best
+
+    async def watch(
+        self, snapshots: AsyncIterable[Mapping[str, Series]]
+    ) -> AsyncIterator[FantasyTeam]:
+        """Emit the optimal Fantasy Team every time a stream of snapshots changes it.
+
+        Parameters
+        ----------
+        snapshots: async iterable of dict
+            Stream of odds snapshots, such as `tail_snapshots`.
+
+        Yields
+        ------
+        best: FantasyTeam
+            New optimal Fantasy Team.
+        """
+
+        async for snapshot in snapshots:
+            best = self.update(snapshot)
+            if best is not None:
+                yield best
+
+    def _solve(self) -> FantasyTeam:
+        "Solve for the best Fantasy Team with the latest points."
+
+        return BasicSolver(
+            self.scorer.fixed_drivers(),
+            self.scorer.fixed_teams(),
+            self.in_constraint,
+            self.out_constraint,
+            self.budget,
+            talent_slot=self.talent_slot,
+        ).solve()
+
+    @staticmethod
+    def _key(fantasy_team: FantasyTeam) -> tuple:
+        "Names of the Drivers, Team and Talent Driver of a Fantasy Team."
+
+        return (
+            tuple(sorted(driver.name for driver in fantasy_team.drivers)),
+            fantasy_team.team.name,
+            fantasy_team.talent_driver.name,
+        )
+
+
+async def _print_changes(watcher: OddsWatcher, directory: str) -> None:
+    "Print the optimal Fantasy Team every time it changes."
+
+    print(watcher.best)
+    async for best in watcher.watch(tail_snapshots(directory)):
+        print(best)
+
+
+def main() -> None:
+    "Watch a directory of odds snapshots and print the optimal Team as it changes."
+
+    scorer = IncrementalScorer(
+        DRIVERS, TEAMS, {"TOP_1": TOP_1, "QUAL_1": QUAL_1, "RET_1": RET_1}
+    )
+    watcher = OddsWatcher(scorer, IN_CONSTRAINT, OUT_CONSTRAINT, BUDGET)
+
+    asyncio.run(_print_changes(watcher, sys.argv[1]))
@@ -0,0 +1,49 @@
+"Shared fixtures of the tests."
+
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+from pandas import Series
+
+from gridrival.drivers import DRIVERS, Driver
+from gridrival.probabilities import GridProbabilities
+from gridrival.probabilities.betting_odds import QUAL_1, RET_1, TOP_1
+from gridrival.teams import TEAMS, Team
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(2021)
+
+
+@pytest.fixture
+def grid() -> GridProbabilities:
+    "Probabilities of the race from the winning, retirement and qualifying odds."
+    return GridProbabilities.from_odds(Series(TOP_1), Series(RET_1), Series(QUAL_1))
+
+
+@pytest.fixture
+def roster(grid) -> Tuple[List[Driver], List[Team]]:
+    "Fresh Drivers and Teams of the league with the probabilities of the race."
+
+    drivers = {
+        driver.name: Driver(
+            driver.name,
+            driver.cost,
+            driver.rank,
+            grid.driver_probabilities(driver.name),
+        )
+        for driver in DRIVERS
+    }
+    teams = [
+        Team(
+            team.name,
+            drivers[team.driver_1.name],
+            drivers[team.driver_2.name],
+            team.cost,
+        )
+        for team in TEAMS
+    ]
+
+    return list(drivers.values()), teams
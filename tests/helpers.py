@@ -0,0 +1,121 @@
+"Brute-force references for the tests."
+
+from itertools import combinations
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pandas import Series
+
+from gridrival.drivers import FixedInfo
+from gridrival.fantasy import TALENT_DRIVER_COST, FantasyTeam
+from gridrival.optimization.basic import BasicSolver
+from gridrival.scoring import league_scoring
+from gridrival.session import Session
+from gridrival.simulation import OrderMixture
+
+Lineup = Tuple[Tuple[FixedInfo, ...], FixedInfo, Optional[FixedInfo], float, float]
+
+
+def random_pool(
+    rng: np.random.Generator, n_drivers: int, n_teams: int
+) -> Tuple[List[FixedInfo], List[FixedInfo]]:
+    "Drivers and Teams with random costs, about half of the Drivers below 18M."
+
+    drivers = [
+        FixedInfo(
+            f"D{i}", float(rng.integers(5, 32)) * 1e6, float(rng.uniform(20, 200))
+        )
+        for i in range(n_drivers)
+    ]
+    teams = [
+        FixedInfo(
+            f"T{i}", float(rng.integers(5, 30)) * 1e6, float(rng.uniform(20, 150))
+        )
+        for i in range(n_teams)
+    ]
+
+    return drivers, teams
+
+
+def lineups(
+    drivers: Sequence[FixedInfo],
+    teams: Sequence[FixedInfo],
+    budget: float = np.inf,
+    talent_slot: bool = False,
+) -> List[Lineup]:
+    "Every line-up with its Talent Driver, cost and points, built one by one."
+
+    result = []
+    for comb in combinations(drivers, 5):
+        for team in teams:
+            cost = sum(driver.cost for driver in comb) + team.cost
+            points = sum(driver.points for driver in comb) + team.points
+            if talent_slot:
+                candidates = [
+                    driver
+                    for driver in drivers
+                    if driver not in comb
+                    and driver.cost <= TALENT_DRIVER_COST
+                    and cost + driver.cost <= budget
+                ]
+            else:
+                candidates = [d for d in comb if d.cost <= TALENT_DRIVER_COST]
+            talent = max(candidates, key=lambda d: d.points, default=None)
+            if talent is not None:
+                points += talent.points
+                if talent_slot:
+                    cost += talent.cost
+                    points += talent.points
+            result.append((comb, team, talent, cost, points))
+
+    return result
+
+
+def best_points(
+    drivers: Sequence[FixedInfo],
+    teams: Sequence[FixedInfo],
+    budget: float = np.inf,
+    talent_slot: bool = False,
+    keep: Callable[[Lineup], bool] = lambda lineup: True,
+) -> Optional[float]:
+    "Points of the best line-up within budget which is kept, None if there is none."
+
+    points = [
+        lineup[4]
+        for lineup in lineups(drivers, teams, budget, talent_slot)
+        if lineup[3] <= budget and keep(lineup)
+    ]
+
+    return max(points, default=None)
+
+
+def basic_points(drivers, teams, in_constraint, out_constraint, budget, **kwargs):
+    "Points of the best line-up of BasicSolver, None if no line-up meets the query."
+
+    solver = BasicSolver(
+        drivers, teams, in_constraint, out_constraint, budget, **kwargs
+    )
+    if not len(solver.universe):
+        return None
+    return solver.solve().points()
+
+
+def points(fantasy_team: Optional[FantasyTeam]) -> Optional[float]:
+    return None if fantasy_team is None else fantasy_team.points()
+
+
+def mixture_beat_teammate_points(session: Session) -> Series:
+    "Expected beat team mate points of each Driver in the race orders of the mixture."
+
+    grid = session.probabilities
+    mixture = OrderMixture.from_grid(grid.race_array)
+    table = league_scoring(len(grid.names)).Driver.BEAT_TEAMMATE.to_numpy()
+
+    teammate = np.arange(len(grid.names))
+    for driver_1, driver_2 in session.teams.values():
+        rows = grid.rows([driver_1, driver_2])
+        teammate[rows] = rows[::-1]
+
+    points = table[mixture.positions[:, teammate], mixture.positions]
+
+    return Series(mixture.weights @ points, index=grid.names)
@@ -0,0 +1,30 @@
+"BasicSolver against a brute-force reference."
+
+import numpy as np
+import pytest
+from helpers import best_points, random_pool
+
+from gridrival.optimization.basic import BasicSolver
+
+BUDGETS = [70e6, 90e6, 110e6, np.inf]
+
+
+@pytest.mark.parametrize("talent_slot", [False, True])
+@pytest.mark.parametrize("budget", BUDGETS)
+def test_basic_solver_matches_brute_force(rng, talent_slot, budget):
+    drivers, teams = random_pool(rng, 10, 4)
+    in_constraint, out_constraint = [drivers[1]], [drivers[2], teams[0]]
+
+    def keep(lineup):
+        picked = set(lineup[0]) | {lineup[1]}
+        return drivers[1] in picked and not picked & set(out_constraint)
+
+    expected = best_points(
+        [d for d in drivers if d is not drivers[2]], teams, budget, talent_slot, keep
+    )
+    solver = BasicSolver(
+        drivers, teams, in_constraint, out_constraint, budget, talent_slot=talent_slot
+    )
+    got = solver.solve().points() if len(solver.universe) else None
+
+    assert got == pytest.approx(expected)
@@ -0,0 +1,153 @@
+"Compiled line-up constraints against a brute-force filter."
+
+import numpy as np
+import pytest
+from helpers import best_points, random_pool
+
+from gridrival.optimization.basic import BasicSolver
+from gridrival.optimization.constraints import (
+    AtLeast,
+    AtMost,
+    CostBand,
+    NotTogether,
+    compile_constraints,
+)
+from gridrival.optimization.universe import Universe
+
+
+def constraints_for(drivers, teams):
+    return [
+        AtMost(1, drivers[0:3]),
+        AtLeast(1, [drivers[5], drivers[6], teams[1]]),
+        NotTogether(drivers[7], drivers[8]),
+        CostBand(75e6, 115e6),
+    ]
+
+
+def meets(lineup, drivers, teams):
+    "The line-up meets the constraints of `constraints_for`."
+
+    picked = set(lineup[0]) | {lineup[1]}
+    return (
+        len(picked & set(drivers[0:3])) <= 1
+        and bool(picked & {drivers[5], drivers[6], teams[1]})
+        and not {drivers[7], drivers[8]} <= picked
+        and 75e6 <= lineup[3] <= 115e6
+    )
+
+
+@pytest.mark.parametrize("talent_slot", [False, True])
+def test_mask_matches_brute_force(rng, talent_slot):
+    drivers, teams = random_pool(rng, 11, 4)
+    compiled = compile_constraints(constraints_for(drivers, teams), drivers, teams)
+    universe = Universe.enumerate(drivers, teams, talent_slot, 120e6)
+
+    expected = []
+    for lineup, team, cost in zip(universe.lineups, universe.team, universe.cost):
+        picked = tuple(drivers[i] for i in lineup)
+        expected.append(meets((picked, teams[team], None, cost), drivers, teams))
+
+    np.testing.assert_array_equal(compiled.mask(universe), expected)
+
+
+def test_combination_mask_keeps_every_feasible_combination(rng):
+    drivers, teams = random_pool(rng, 11, 4)
+    compiled = compile_constraints(constraints_for(drivers, teams), drivers, teams)
+    universe = Universe.enumerate(drivers, teams)
+
+    kept = compiled.combination_mask(universe.lineups)
+
+    assert kept[compiled.mask(universe)].all()
+    assert not kept.all()
+
+
+def test_team_mask_matches_count_constraints(rng):
+    drivers, teams = random_pool(rng, 11, 4)
+    counts = constraints_for(drivers, teams)[:-1]
+    compiled = compile_constraints(counts, drivers, teams)
+    universe = Universe.enumerate(drivers, teams)
+
+    # Line-ups hold every Team for each combination, in order.
+    combs = universe.lineups[:: len(teams)]
+
+    np.testing.assert_array_equal(
+        compiled.team_mask(combs).ravel(), compiled.mask(universe)
+    )
+
+
+def test_constraints_no_lineup_can_break_are_left_out(rng):
+    drivers, teams = random_pool(rng, 11, 4)
+    compiled = compile_constraints(
+        [AtMost(2, drivers[:2]), AtLeast(0, drivers), AtMost(1, drivers[:2])],
+        drivers,
+        teams,
+    )
+
+    assert compiled.driver_weights.shape == (11, 1)
+    np.testing.assert_array_equal(compiled.maximum, [1])
+
+
+@pytest.mark.parametrize("talent_slot", [False, True])
+@pytest.mark.parametrize("prune", [False, True])
+@pytest.mark.parametrize("memory_budget", [None, 20000])
+def test_constrained_solver_matches_brute_force(rng, talent_slot, prune, memory_budget):
+    for _ in range(4):
+        drivers, teams = random_pool(rng, 11, 4)
+        budget = 110e6
+
+        solver = BasicSolver(
+            drivers,
+            teams,
+            [],
+            [],
+            budget,
+            talent_slot=talent_slot,
+            memory_budget=memory_budget,
+            prune=prune,
+            constraints=constraints_for(drivers, teams),
+        )
+        expected = best_points(
+            drivers,
+            teams,
+            budget,
+            talent_slot,
+            lambda lineup: meets(lineup, drivers, teams),
+        )
+
+        got = solver.solve().points() if len(solver.universe) else None
+        assert got == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("memory_budget", [None, 20000])
+@pytest.mark.parametrize("seed, high", [(0, 90e6), (5, 100e6), (9, 110e6)])
+def test_cost_band_below_budget_bounds_talent_slot(memory_budget, seed, high):
+    drivers, teams = random_pool(np.random.default_rng(seed), 10, 4)
+
+    banded = BasicSolver(
+        drivers,
+        teams,
+        [],
+        [],
+        130e6,
+        talent_slot=True,
+        memory_budget=memory_budget,
+        constraints=[CostBand(0, high)],
+    )
+    budgeted = BasicSolver(drivers, teams, [], [], high, talent_slot=True)
+
+    assert banded.solve().points() == pytest.approx(budgeted.solve().points())
+    assert banded.solve().points() == pytest.approx(
+        best_points(drivers, teams, high, talent_slot=True)
+    )
+
+
+def test_excluded_driver_is_never_picked(rng):
+    drivers, teams = random_pool(rng, 10, 3)
+    excluded = max(drivers, key=lambda driver: driver.points)
+
+    solver = BasicSolver(
+        drivers, teams, [], [], np.inf, constraints=[AtMost(0, [excluded])]
+    )
+
+    assert excluded not in solver.solve().drivers
+    assert excluded.name not in {driver.name for driver in solver.universe.drivers}
@@ -0,0 +1,103 @@
+"Removal of the bookmaker margin from betting odds."
+
+import numpy as np
+import pytest
+
+from gridrival.probabilities.demargin import demargin
+
+# Podium odds which add up to less than three winners, as in stale exchange prices.
+PODIUM = np.array([1.001, 1.002, 1.5, 8.0, 40.0, 100.0])
+
+# Probabilities of a single winner and a three winner market.
+WINNER = np.array([0.5, 0.3, 0.2])
+TOP_3 = np.array([0.9, 0.8, 0.6, 0.4, 0.2, 0.1])
+
+
+@pytest.mark.parametrize("method", ["proportional", "shin", "power", "odds_ratio"])
+def test_probabilities_add_up_to_winners(method):
+    odds = np.array([[1.8, 2.1, 9.0, 15.0], [1.5, 3.0, 6.0, np.nan]])
+
+    probabilities = demargin(odds, method)
+
+    np.testing.assert_allclose(np.nansum(probabilities, axis=1), 1)
+    assert np.isnan(probabilities[1, 3])
+
+
+def test_user_method_gets_implied_probabilities():
+    calls = []
+
+    def squared(implied):
+        calls.append(implied)
+        return implied**2
+
+    probabilities = demargin(np.array([2.0, 4.0]), squared)
+
+    assert len(calls) == 1
+    np.testing.assert_allclose(probabilities, [0.8, 0.2])
+
+
+@pytest.mark.parametrize("method", ["proportional", "shin", "power", "odds_ratio"])
+def test_multi_winner_probabilities_are_at_most_one(method):
+    probabilities = demargin(np.stack([PODIUM, PODIUM[::-1]]), method, total=3)
+
+    assert probabilities.max() <= 1
+    np.testing.assert_allclose(probabilities.sum(axis=1), 3)
+    np.testing.assert_allclose(probabilities[0], probabilities[1, ::-1])
+
+
+@pytest.mark.parametrize("method", ["proportional", "shin"])
+def test_scaled_back_probabilities_are_capped(method):
+    probabilities = demargin(PODIUM, method, total=3)
+
+    assert probabilities.max() == 1
+
+
+def shin_fixed_point(odds):
+    "Shin probabilities with z from the fixed-point iteration of a single market."
+
+    implied = 1 / odds
+    booksum = implied.sum()
+    z = 0.0
+    for _ in range(1000):
+        root = np.sqrt(z**2 + 4 * (1 - z) * implied**2 / booksum)
+        z, previous = (root.sum() - 2) / (len(odds) - 2), z
+        if abs(z - previous) < 1e-16:
+            break
+
+    root = np.sqrt(z**2 + 4 * (1 - z) * implied**2 / booksum)
+    return (root - z) / (2 * (1 - z))
+
+
+@pytest.mark.parametrize(
+    "odds", [[1.8, 2.1, 9.0, 15.0], [1.3, 5.5, 8.0, 21.0, 41.0, 101.0]]
+)
+def test_shin_matches_fixed_point_iteration(odds):
+    odds = np.array(odds)
+
+    np.testing.assert_allclose(
+        demargin(odds, "shin"), shin_fixed_point(odds), rtol=0, atol=2e-13
+    )
+
+
+@pytest.mark.parametrize("probabilities", [WINNER, TOP_3])
+def test_power_recovers_probabilities(probabilities):
+    implied = probabilities ** (1 / 1.5)
+
+    np.testing.assert_allclose(
+        demargin(1 / implied, "power", probabilities.sum()),
+        probabilities,
+        rtol=0,
+        atol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("probabilities", [WINNER, TOP_3])
+def test_odds_ratio_recovers_probabilities(probabilities):
+    implied = 1.2 * probabilities / (1 + 0.2 * probabilities)
+
+    np.testing.assert_allclose(
+        demargin(1 / implied, "odds_ratio", probabilities.sum()),
+        probabilities,
+        rtol=0,
+        atol=1e-12,
+    )
@@ -0,0 +1,21 @@
+"Data types of the arrays of the model."
+
+import numpy as np
+import pytest
+
+from gridrival.dtypes import COMPACT_POLICY, DEFAULT_POLICY
+
+
+@pytest.mark.parametrize("grid_size", [1, 20, 126, 127, 128, 200, 32767, 32768])
+def test_compact_position_holds_every_position(grid_size):
+    dtype = COMPACT_POLICY.position(grid_size)
+    info = np.iinfo(dtype)
+
+    assert info.min <= -grid_size and grid_size <= info.max
+    assert np.dtype(dtype).itemsize == (
+        1 if grid_size <= 127 else 2 if grid_size <= 32767 else 4
+    )
+
+
+def test_default_position_is_int64():
+    assert DEFAULT_POLICY.position(20) == np.int64
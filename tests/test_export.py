@@ -0,0 +1,47 @@
+"Columnar export of the scored line-ups."
+
+import numpy as np
+import pytest
+
+from gridrival.optimization.basic import BasicSolver
+from gridrival.optimization.export import write_lineups
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_written_lineups_match_universe(tmp_path, roster, file_format):
+    drivers, teams = roster
+    solver = BasicSolver(
+        [driver.to_fixed_info() for driver in drivers],
+        [team.to_fixed_info() for team in teams[:4]],
+        [],
+        [],
+        80e6,
+    )
+    path = tmp_path / f"lineups.{file_format}"
+
+    rows = solver.write_lineups(str(path), file_format=file_format, chunk_size=5000)
+
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+    else:
+        table = pa.ipc.open_file(str(path)).read_all()
+
+    assert rows == table.num_rows == len(solver.universe)
+    np.testing.assert_allclose(table["points"].to_numpy(), solver.universe.points)
+    components = sum(
+        table[name].to_numpy()
+        for name in table.column_names
+        if name.startswith("points_")
+    )
+    np.testing.assert_allclose(components, solver.universe.points, rtol=1e-12)
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    solver = BasicSolver([], [], [], [], np.inf)
+
+    with pytest.raises(ValueError):
+        write_lineups(solver.universe, str(tmp_path / "lineups.csv"), "csv")
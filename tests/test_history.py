@@ -0,0 +1,88 @@
+"Rolling ranks of the season history against a direct rolling mean."
+
+import numpy as np
+import pytest
+
+from gridrival.history import ROLLING_RACES, SeasonHistory
+
+NAMES = ["A", "B", "C", "D", "E"]
+
+
+def random_results(rng, races, names=NAMES, missing=0.0):
+    "Finishing positions of random races, each Driver missing with some probability."
+
+    results = []
+    for _ in range(races):
+        racing = [name for name in names if rng.uniform() >= missing]
+        order = rng.permutation(len(racing)) + 1
+        results.append(dict(zip(racing, order.tolist())))
+
+    return results
+
+
+def rolling_ranks(results, initial, window=ROLLING_RACES):
+    "Mean of the last positions of each Driver, its initial rank if it has none."
+
+    positions = {name: [] for name in initial}
+    for race in results:
+        for name, position in race.items():
+            positions[name].append(position)
+
+    return {
+        name: (
+            float(np.mean(positions[name][-window:]))
+            if positions[name]
+            else initial[name]
+        )
+        for name in initial
+    }
+
+
+def test_ring_buffer_wraps_past_window(rng):
+    initial = {name: 10.0 for name in NAMES}
+    history = SeasonHistory(initial=initial)
+    results = random_results(rng, 3 * ROLLING_RACES + 1)
+
+    for race in range(len(results)):
+        history.add_result(results[race])
+        expected = rolling_ranks(results[: race + 1], initial)
+        assert history.ranks() == pytest.approx(expected, abs=1e-12)
+
+    assert history.races == len(results)
+
+
+@pytest.mark.parametrize("window", [1, 3, ROLLING_RACES])
+def test_replay_matches_direct_rolling_mean(rng, window):
+    initial = {name: float(rank) for rank, name in enumerate(NAMES, 1)}
+    history = SeasonHistory(initial=initial, window=window)
+    results = random_results(rng, 30, missing=0.2)
+
+    for race, ranks in enumerate(history.replay(results)):
+        assert ranks == pytest.approx(
+            rolling_ranks(results[:race], initial, window), abs=1e-12
+        )
+
+
+def test_driver_missing_from_race_keeps_results():
+    history = SeasonHistory(initial={"A": 5.0, "B": 5.0})
+
+    history.add_result({"A": 1, "B": 2})
+    history.add_result({"A": 3, "B": 4})
+    history.add_result({"A": 2})
+
+    assert history.rank("A") == pytest.approx(2.0)
+    assert history.rank("B") == pytest.approx(3.0)
+
+
+def test_new_driver_joins_mid_season():
+    history = SeasonHistory(initial={"A": 5.0, "B": 5.0})
+    history.add_result({"A": 1, "B": 2})
+
+    replayed = list(history.replay([{"A": 1, "B": 2, "C": 3}, {"A": 2, "C": 1}]))
+
+    # A Driver without an initial rank starts at the back of the grid.
+    assert history.drivers == ["A", "B", "C"]
+    assert replayed[0]["C"] == pytest.approx(3.0)
+    assert history.rank("C") == pytest.approx(2.0)
+    assert history.rank("A") == pytest.approx(4 / 3)
+    assert history.rank("B") == pytest.approx(2.0)
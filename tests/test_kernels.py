@@ -0,0 +1,100 @@
+"Kernels for building and filtering line-ups against the NumPy path."
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+from helpers import random_pool
+
+from gridrival.drivers import FixedInfo
+from gridrival.optimization import kernels
+from gridrival.optimization.basic import BasicSolver
+from gridrival.optimization.universe import Universe
+
+BUDGETS = [70e6, 90e6, 110e6, np.inf]
+
+
+@pytest.fixture
+def jit():
+    "Use the kernels, compiled or as plain Python if Numba is not installed."
+
+    token = kernels._JIT.set(True)
+    yield
+    kernels._JIT.reset(token)
+
+
+@pytest.mark.parametrize("n, k", [(7, 5), (10, 5), (5, 5), (4, 5), (6, 0), (6, 1)])
+def test_combinations_match_itertools(n, k):
+    expected = list(combinations(range(n), k))
+
+    assert kernels.combinations(n, k).tolist() == [list(comb) for comb in expected]
+
+
+@pytest.mark.parametrize("talent_slot", [False, True])
+@pytest.mark.parametrize("budget", BUDGETS)
+def test_universe_matches_numpy_path(rng, jit, talent_slot, budget):
+    drivers, teams = random_pool(rng, 10, 4)
+
+    universe = Universe.enumerate(drivers, teams, talent_slot, budget)
+    with kernels.use_jit(False):
+        expected = Universe.enumerate(drivers, teams, talent_slot, budget)
+
+    np.testing.assert_array_equal(universe.lineups, expected.lineups)
+    np.testing.assert_array_equal(universe.team, expected.team)
+    np.testing.assert_array_equal(universe.talent, expected.talent)
+    np.testing.assert_array_equal(universe.cost, expected.cost)
+    np.testing.assert_array_equal(universe.points, expected.points)
+
+
+def test_constraint_mask_matches_numpy_path(rng, jit):
+    drivers, teams = random_pool(rng, 9, 3)
+    universe = Universe.enumerate(drivers, teams)
+
+    for budget in BUDGETS:
+        for in_drivers, in_teams in [([], []), ([0], []), ([2, 5], [1]), ([], [2])]:
+            expected = universe.cost <= budget
+            for driver in in_drivers:
+                expected &= universe.contains(drivers[driver])
+            for team in in_teams:
+                expected &= universe.contains(teams[team])
+
+            mask = kernels.constraint_mask(
+                universe.lineups,
+                universe.team,
+                universe.cost,
+                budget,
+                in_drivers,
+                in_teams,
+            )
+            np.testing.assert_array_equal(mask, expected)
+
+
+@pytest.mark.parametrize("talent_slot", [False, True])
+@pytest.mark.parametrize("memory_budget", [None, 20000])
+def test_solver_matches_numpy_path(rng, jit, talent_slot, memory_budget):
+    drivers, teams = random_pool(rng, 10, 4)
+    queries = [
+        ([], []),
+        ([drivers[1]], [drivers[2], teams[0]]),
+        ([drivers[3], teams[1]], [drivers[4]]),
+        # Included Drivers and Teams which are not in the universe keep nothing.
+        ([FixedInfo("X", 10e6, 100.0)], []),
+        ([drivers[5]], [drivers[5]]),
+    ]
+
+    for budget in BUDGETS:
+        for in_constraint, out_constraint in queries:
+            args = (drivers, teams, in_constraint, out_constraint, budget)
+            kwargs = dict(talent_slot=talent_slot, memory_budget=memory_budget)
+
+            solver = BasicSolver(*args, **kwargs)
+            with kernels.use_jit(False):
+                expected = BasicSolver(*args, **kwargs)
+
+            assert len(solver.universe) == len(expected.universe)
+            np.testing.assert_array_equal(solver.universe.cost, expected.universe.cost)
+            np.testing.assert_array_equal(
+                solver.universe.points, expected.universe.points
+            )
+            if len(expected.universe):
+                assert repr(solver.solve()) == repr(expected.solve())
@@ -0,0 +1,34 @@
+"LeagueSolver against a brute-force reference."
+
+import pytest
+from helpers import best_points, points, random_pool
+
+from gridrival.optimization.league import LeagueSolver, Member
+
+
+@pytest.mark.parametrize("transfers", [0, 1, 2, 6])
+def test_league_solver_matches_brute_force(rng, transfers):
+    drivers, teams = random_pool(rng, 10, 4)
+    members = [
+        Member(
+            [drivers[i] for i in rng.choice(len(drivers), 5, replace=False)],
+            teams[int(rng.integers(len(teams)))],
+            float(rng.integers(0, 15)) * 1e6,
+            transfers,
+        )
+        for _ in range(6)
+    ]
+
+    solutions = LeagueSolver(drivers, teams, batch_size=4).solve(members)
+
+    for member, solution in zip(members, solutions):
+        current = set(member.drivers) | {member.team}
+        budget = sum(fixed.cost for fixed in current) + member.bank
+
+        def keep(lineup):
+            picked = set(lineup[0]) | {lineup[1]}
+            return len(picked - current) <= member.transfers
+
+        assert points(solution) == pytest.approx(
+            best_points(drivers, teams, budget, keep=keep)
+        )
@@ -0,0 +1,36 @@
+"MeetInTheMiddleSolver against BasicSolver."
+
+import numpy as np
+import pytest
+from helpers import basic_points, points, random_pool
+
+from gridrival.optimization.meet_in_the_middle import MeetInTheMiddleSolver
+
+BUDGETS = [70e6, 90e6, 110e6, np.inf]
+
+
+@pytest.mark.parametrize("talent_slot", [False, True])
+@pytest.mark.parametrize("budget", BUDGETS)
+def test_meet_in_the_middle_matches_basic_solver(rng, talent_slot, budget):
+    for _ in range(5):
+        drivers, teams = random_pool(rng, 12, 4)
+        in_constraint = [drivers[int(rng.integers(12))]]
+        out_constraint = [drivers[int(rng.integers(12))], teams[0]]
+        if in_constraint[0] is out_constraint[0]:
+            out_constraint = out_constraint[1:]
+
+        solution = MeetInTheMiddleSolver(
+            drivers, teams, in_constraint, out_constraint, budget, talent_slot
+        ).solve()
+        expected = basic_points(
+            drivers,
+            teams,
+            in_constraint,
+            out_constraint,
+            budget,
+            talent_slot=talent_slot,
+        )
+
+        assert points(solution) == pytest.approx(expected)
+        if solution is not None:
+            assert solution.cost() <= budget
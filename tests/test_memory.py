@@ -0,0 +1,72 @@
+"Peaks of nested memory profiler stages."
+
+import threading
+import tracemalloc
+
+import numpy as np
+
+from gridrival import memory
+from gridrival.memory import MemoryProfiler
+
+MB = 1024**2
+
+
+def test_nested_stage_keeps_enclosing_peak():
+    profiler = MemoryProfiler()
+
+    with profiler.stage("outer"):
+        large = np.ones(8 * MB, dtype=np.uint8)
+        del large
+        with profiler.stage("inner"):
+            small = np.ones(MB, dtype=np.uint8)
+            del small
+
+    assert profiler.stages["outer"].python_peak >= 8 * MB
+    assert MB <= profiler.stages["inner"].python_peak < 2 * MB
+
+
+def test_stages_of_threads_keep_their_peaks():
+    first, second = MemoryProfiler(), MemoryProfiler()
+    first_open, second_open, first_closed = (threading.Event() for _ in range(3))
+
+    # The first stage, which starts tracing, ends while the second stage started later
+    # in another thread is still open.
+    def run_first():
+        with first.stage("stage"):
+            large = np.ones(8 * MB, dtype=np.uint8)
+            del large
+            first_open.set()
+            second_open.wait()
+        first_closed.set()
+
+    def run_second():
+        first_open.wait()
+        with second.stage("stage"):
+            second_open.set()
+            first_closed.wait()
+            small = np.ones(MB, dtype=np.uint8)
+            del small
+
+    threads = [threading.Thread(target=run_first), threading.Thread(target=run_second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert first.stages["stage"].python_peak >= 8 * MB
+    assert MB <= second.stages["stage"].python_peak < 2 * MB
+    assert not tracemalloc.is_tracing()
+
+
+def test_peak_is_not_measured_without_reset(monkeypatch):
+    monkeypatch.setattr(memory, "_RESET_PEAK", False)
+    profiler = MemoryProfiler()
+
+    tracemalloc.start()
+    try:
+        with profiler.stage("stage"):
+            pass
+    finally:
+        tracemalloc.stop()
+
+    assert profiler.stages["stage"].python_peak is None
@@ -0,0 +1,112 @@
+"Projected price changes against the expected points of the races."
+
+import numpy as np
+import pytest
+from helpers import mixture_beat_teammate_points
+from pandas import DataFrame
+
+from gridrival.pricing import (
+    DRIVER_MAX_CHANGE,
+    DRIVER_SALARY_STEP,
+    DRIVER_TOP_SALARY,
+    TEAM_MAX_CHANGE,
+    TEAM_SALARY_STEP,
+    TEAM_TOP_SALARY,
+    PriceProjection,
+    default_salaries,
+    project_prices,
+)
+from gridrival.probabilities import GridProbabilities
+from gridrival.session import Session
+from gridrival.simulation import SeasonSimulator, doubly_stochastic
+
+
+@pytest.fixture
+def certain_session(grid, roster):
+    "Session of a race whose finishing orders and completions are certain."
+
+    order = np.argsort(-grid.race_points().to_numpy(), kind="stable")
+    race = DataFrame(
+        np.eye(len(order))[np.argsort(order)], index=grid.names, columns=grid.positions
+    )
+    comp = DataFrame(0.0, index=grid.names, columns=grid.completions)
+    comp[grid.completions[-1]] = 1.0
+
+    return Session.from_roster(*roster, GridProbabilities(race, comp))
+
+
+def expected_costs(cost, points, races, top, step, max_change):
+    "Cost after the last race when every race scores the expected points."
+
+    salaries = default_salaries(len(cost), top, step)
+    return project_prices(cost, [points] * races, salaries, max_change)[-1]
+
+
+@pytest.mark.parametrize("races", [1, 3])
+def test_certain_races_project_expected_points(certain_session, races):
+    session = certain_session
+    simulator = SeasonSimulator(
+        [session.probabilities] * races, session.ranks, session.teams
+    )
+
+    projection = PriceProjection(
+        simulator, session.driver_costs, session.team_costs
+    ).run(50, seed=2021)
+    summary = projection.summary()
+
+    driver_points = session.driver_points().sum(axis=1).loc[simulator.drivers]
+    team_points = session.team_points().sum(axis=1).loc[simulator.teams]
+    expected = np.concatenate(
+        [
+            expected_costs(
+                projection.driver_cost,
+                driver_points.to_numpy(),
+                races,
+                DRIVER_TOP_SALARY,
+                DRIVER_SALARY_STEP,
+                DRIVER_MAX_CHANGE,
+            ),
+            expected_costs(
+                projection.team_cost,
+                team_points.to_numpy(),
+                races,
+                TEAM_TOP_SALARY,
+                TEAM_SALARY_STEP,
+                TEAM_MAX_CHANGE,
+            ),
+        ]
+    )
+
+    np.testing.assert_allclose(summary["expected_cost"], expected)
+    np.testing.assert_allclose(summary["std"], 0, atol=1e-6)
+
+
+def test_projected_races_score_expected_points(grid, roster):
+    positions = {
+        stage: DataFrame(
+            doubly_stochastic(getattr(grid, f"{stage}_array")),
+            index=grid.names,
+            columns=grid.positions,
+        )
+        for stage in ("race", "qual")
+    }
+    session = Session.from_roster(
+        *roster, GridProbabilities(positions["race"], grid.comp, positions["qual"])
+    )
+    simulator = SeasonSimulator(
+        [session.probabilities] * 2, session.ranks, session.teams
+    )
+
+    projection = PriceProjection(
+        simulator, session.driver_costs, session.team_costs
+    ).run(40000, seed=2021)
+
+    driver_points = session.driver_points()
+    driver_points["beat_teammate"] = mixture_beat_teammate_points(session)
+    driver_points = driver_points.sum(axis=1).loc[simulator.drivers]
+    team_points = session.team_points().sum(axis=1).loc[simulator.teams]
+    # About five standard errors of the mean points of a Driver in 40000 races.
+    for points in projection.driver_points:
+        np.testing.assert_allclose(points, driver_points, atol=0.8)
+    for points in projection.team_points:
+        np.testing.assert_allclose(points, team_points, atol=0.5)
@@ -0,0 +1,66 @@
+"Expected points of the grid, the Drivers and the Teams."
+
+import numpy as np
+import pytest
+
+from gridrival.probabilities import GridProbabilities, TeamProbabilities
+from gridrival.session import Session
+
+
+def test_team_probabilities_are_computed_once(grid, roster):
+    _, teams = roster
+    team_probabilities = TeamProbabilities.from_teams(grid, teams)
+
+    assert team_probabilities.points() is team_probabilities.points()
+    assert (
+        team_probabilities.beat_teammate_points()
+        is team_probabilities.beat_teammate_points()
+    )
+
+
+def test_objects_share_team_probabilities_with_session(grid, roster):
+    drivers, teams = roster
+    team_probabilities = TeamProbabilities.from_teams(grid, teams)
+    for team in teams:
+        team.probabilities = team_probabilities
+
+    session = Session.from_roster(drivers, teams, grid)
+    driver_points = session.driver_points().sum(axis=1)
+    team_points = session.team_points().sum(axis=1)
+
+    for driver in drivers:
+        fixed = driver.to_fixed_info()
+        assert fixed.points == pytest.approx(driver_points[driver.name])
+        assert fixed.components == pytest.approx(
+            session.driver_points().loc[driver.name].to_dict()
+        )
+    for team in teams:
+        assert team.to_fixed_info().points == pytest.approx(team_points[team.name])
+
+
+def test_fixed_info_computes_each_component_once(roster, monkeypatch):
+    drivers, teams = roster
+    calls = []
+    overtake_points = type(drivers[0]).overtake_points
+
+    def counted(driver):
+        calls.append(driver.name)
+        return overtake_points(driver)
+
+    monkeypatch.setattr(type(drivers[0]), "overtake_points", counted)
+    fixed = drivers[0].to_fixed_info()
+
+    assert calls == [drivers[0].name]
+    assert fixed.points == pytest.approx(sum(fixed.components.values()))
+
+
+def test_grids_are_read_only_views(grid):
+    with pytest.raises(ValueError):
+        grid.race.iloc[0, 0] = 0.5
+
+    race = grid.race.copy()
+    race.iloc[[0, 1]] = race.iloc[[1, 0]].to_numpy()
+    changed = GridProbabilities(race, grid.comp, grid.qual)
+
+    assert np.shares_memory(grid.race.to_numpy(), grid.race_array)
+    assert changed.race_points().iloc[0] == pytest.approx(grid.race_points().iloc[1])
@@ -0,0 +1,47 @@
+"Dominance pruning against the unpruned universe."
+
+import numpy as np
+import pytest
+from helpers import random_pool
+
+from gridrival.optimization.basic import BasicSolver
+from gridrival.optimization.prune import prune_dominated
+
+BUDGETS = [70e6, 90e6, 110e6, np.inf]
+
+
+@pytest.mark.parametrize("talent_slot", [False, True])
+def test_pruning_keeps_best_lineup_and_frontier(rng, talent_slot):
+    drivers, teams = random_pool(rng, 14, 5)
+    in_constraint = [drivers[0]]
+
+    pruned = prune_dominated(drivers, teams, in_constraint, talent_slot)
+    assert pruned.n_pruned == len(drivers) + len(teams) - len(pruned.drivers) - len(
+        pruned.teams
+    )
+    assert drivers[0] in pruned.drivers
+
+    for budget in BUDGETS:
+        full = BasicSolver(
+            drivers, teams, in_constraint, [], budget, talent_slot=talent_slot
+        )
+        reduced = BasicSolver(
+            drivers,
+            teams,
+            in_constraint,
+            [],
+            budget,
+            talent_slot=talent_slot,
+            prune=True,
+        )
+        assert reduced.pruned == pruned.n_pruned
+        assert reduced.solve().points() == pytest.approx(full.solve().points())
+
+        # A separate Talent Driver is picked for the solver's budget, so the frontier
+        # below it is only the best for each budget in roster mode.
+        if talent_slot:
+            continue
+        frontier = full.pareto_frontier()
+        reduced_frontier = reduced.pareto_frontier()
+        np.testing.assert_allclose(reduced_frontier.cost, frontier.cost)
+        np.testing.assert_allclose(reduced_frontier.points, frontier.points)
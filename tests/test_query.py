@@ -0,0 +1,31 @@
+"QuerySolver against BasicSolver."
+
+import numpy as np
+import pytest
+from helpers import basic_points, points, random_pool
+
+from gridrival.optimization.query import Query, QuerySolver
+
+BUDGETS = [70e6, 90e6, 110e6, np.inf]
+
+
+def test_query_solver_matches_basic_solver(rng):
+    drivers, teams = random_pool(rng, 12, 5)
+    queries = [
+        Query(budget, in_constraint, out_constraint)
+        for budget in BUDGETS
+        for in_constraint in ([], [drivers[0]], [drivers[3], teams[1]])
+        for out_constraint in ([], [drivers[5], teams[2]])
+    ]
+
+    solutions = QuerySolver(drivers, teams).solve(queries)
+
+    for query, solution in zip(queries, solutions):
+        expected = basic_points(
+            drivers,
+            teams,
+            list(query.in_constraint),
+            list(query.out_constraint),
+            query.budget,
+        )
+        assert points(solution) == pytest.approx(expected)
@@ -0,0 +1,76 @@
+"Immutable evaluation sessions."
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pandas import Series
+
+from gridrival import solve
+from gridrival.probabilities import GridProbabilities
+from gridrival.probabilities.betting_odds import QUAL_1, RET_1, TOP_1
+from gridrival.session import Session
+
+
+def odds_grid(scale: float) -> GridProbabilities:
+    "Probabilities of the race with the winning odds of the favourite scaled."
+
+    top_1 = Series(TOP_1, dtype=float)
+    top_1.iloc[0] *= scale
+
+    return GridProbabilities.from_odds(top_1, Series(RET_1), Series(QUAL_1))
+
+
+def evaluate(session: Session):
+    "Points of the Drivers and Teams and best line-up of a session."
+
+    best = session.solve(budget=100e6)
+
+    return session.driver_points(), session.team_points(), repr(best)
+
+
+def test_session_leaves_roster_untouched(roster):
+    drivers, teams = roster
+    before = [
+        (
+            driver.probabilities,
+            driver.probabilities.race.copy(),
+            driver.rank,
+            driver.team,
+        )
+        for driver in drivers
+    ]
+
+    session = Session.from_roster(drivers, teams, odds_grid(2.0))
+    session.with_ranks({driver.name: 1.0 for driver in drivers}).driver_points()
+    evaluate(session)
+
+    for driver, (probabilities, race, rank, team) in zip(drivers, before):
+        assert driver.probabilities is probabilities
+        assert driver.probabilities.race.equals(race)
+        assert driver.rank == rank
+        assert driver.team is team
+
+
+def test_sessions_in_threads_match_sequential(roster):
+    drivers, teams = roster
+    session = Session.from_roster(drivers, teams, odds_grid(1.0))
+    sessions = [
+        session.with_probabilities(odds_grid(scale)) for scale in (0.5, 1.0, 2.0, 4.0)
+    ]
+
+    sequential = [evaluate(session) for session in sessions]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        threaded = list(executor.map(evaluate, sessions * 3))
+
+    assert len({result[2] for result in sequential}) > 1
+    for expected, got in zip(sequential * 3, threaded):
+        assert got[0].equals(expected[0])
+        assert got[1].equals(expected[1])
+        assert got[2] == expected[2]
+
+
+def test_main_prints_best_lineup(capsys):
+    solve.main()
+
+    assert capsys.readouterr().out == (
+        "[(V. Bottas, L. Stroll, P. Gasly, E. Ocon, M. Schumacher), Ferrari, E. Ocon]\n"
+    )
@@ -0,0 +1,118 @@
+"Season samples against the probabilities and expected points of the grids."
+
+import numpy as np
+import pytest
+from helpers import mixture_beat_teammate_points
+from pandas import DataFrame
+
+from gridrival.probabilities import GridProbabilities
+from gridrival.session import Session
+from gridrival.simulation import (
+    QUANTILES,
+    OrderMixture,
+    SeasonSimulator,
+    doubly_stochastic,
+    sample_positions,
+)
+
+SAMPLES = 40000
+
+
+@pytest.fixture
+def session(grid, roster):
+    "Session of the league with grids of probabilities which can all be sampled."
+
+    positions = {
+        stage: DataFrame(
+            doubly_stochastic(getattr(grid, f"{stage}_array")),
+            index=grid.names,
+            columns=grid.positions,
+        )
+        for stage in ("race", "qual")
+    }
+    valid = GridProbabilities(positions["race"], grid.comp, positions["qual"])
+
+    return Session.from_roster(*roster, valid)
+
+
+def test_order_mixture_reproduces_grid(rng):
+    grid = doubly_stochastic(rng.random((12, 12)) ** 4)
+
+    mixture = OrderMixture.from_grid(grid)
+
+    assert mixture.weights.sum() == pytest.approx(1)
+    assert (np.sort(mixture.positions, axis=1) == np.arange(12)).all()
+    np.testing.assert_allclose(mixture.probabilities(), grid, atol=1e-9)
+
+
+def test_sampled_positions_follow_grid(rng, session):
+    grid = session.probabilities.race_array
+
+    positions = sample_positions(grid, SAMPLES, rng, np.int8)
+    frequencies = (positions[:, :, None] == np.arange(len(grid))).mean(axis=0)
+
+    assert positions.dtype == np.int8
+    np.testing.assert_allclose(frequencies, grid, atol=0.01)
+
+
+def test_mean_points_match_expected_points(session):
+    simulator = SeasonSimulator(
+        [session.probabilities] * 2, session.ranks, session.teams, batch_size=5000
+    )
+
+    results = simulator.run(SAMPLES, seed=2021)
+
+    # Team mates are scored in the sampled order, whose joint positions are those of
+    # the order mixture rather than of TeamProbabilities.
+    driver_points = session.driver_points()
+    driver_points["beat_teammate"] = mixture_beat_teammate_points(session)
+
+    for aggregate, expected in [
+        (results.drivers, driver_points),
+        (results.teams, session.team_points()),
+    ]:
+        expected = 2 * expected.sum(axis=1).loc[aggregate.names].to_numpy()
+        error = aggregate.std() / np.sqrt(aggregate.samples)
+        assert np.abs(aggregate.mean() - expected).max() < 0.5
+        assert (np.abs(aggregate.mean() - expected) < 5 * error).all()
+
+
+def test_one_team_mate_beats_the_other(rng, session):
+    simulator = SeasonSimulator([session.probabilities], session.ranks, session.teams)
+
+    # Only the beat team mate points are left.
+    for tables in (simulator._driver_tables, simulator._team_tables):
+        for name, table in tables.items():
+            if name != "BEAT_TEAMMATE":
+                tables[name] = np.zeros_like(table)
+    simulator._improvement = np.zeros_like(simulator._improvement)
+
+    ((drivers, _),) = simulator.race_points(SAMPLES, rng)
+
+    team_drivers = [session.probabilities.rows(pair) for pair in session.teams.values()]
+    winners = (drivers[:, np.array(team_drivers)] > 0).sum(axis=2)
+    assert (winners == 1).all()
+
+
+def test_quantiles_are_accurate_to_a_bin(session):
+    simulator = SeasonSimulator(
+        [session.probabilities] * 2, session.ranks, session.teams
+    )
+    stream = np.random.SeedSequence(2021)
+
+    results = simulator.simulate_batch(stream, SAMPLES)
+    points, _, _ = simulator._season_points(SAMPLES, np.random.default_rng(stream))
+
+    aggregate = results.drivers
+    width = (aggregate.upper - aggregate.lower) / aggregate.counts.shape[1]
+    error = np.abs(aggregate.quantiles() - np.quantile(points, QUANTILES, axis=0).T)
+    assert (error <= width[:, None]).all()
+    assert (width < 1).all()
+
+
+def test_correlated_grids_are_rejected(session):
+    grid = session.probabilities
+    correlated = GridProbabilities(grid.race, grid.comp, grid.qual, correlation=0.5)
+
+    with pytest.raises(ValueError):
+        SeasonSimulator([correlated], session.ranks, session.teams)
@@ -0,0 +1,67 @@
+"Memory footprint and correctness of the array-backed universe."
+
+import tracemalloc
+
+import numpy as np
+import pytest
+from helpers import lineups, random_pool
+
+from gridrival.drivers import FixedInfo
+from gridrival.optimization.basic import BasicSolver
+from gridrival.optimization.universe import Universe
+
+N_LINEUPS = 155040
+
+
+def full_pool():
+    "A grid of 20 Drivers and 10 Teams."
+
+    drivers = [FixedInfo(f"D{i}", (i + 4) * 1e6, 150.0 - i) for i in range(20)]
+    teams = [FixedInfo(f"T{i}", (i + 5) * 1e6, 160.0 - i) for i in range(10)]
+
+    return drivers, teams
+
+
+@pytest.mark.parametrize("talent_slot", [False, True])
+def test_full_universe_bytes_per_lineup(talent_slot):
+    universe = Universe.enumerate(*full_pool(), talent_slot=talent_slot)
+
+    assert len(universe) == N_LINEUPS
+    assert universe.nbytes <= 24 * N_LINEUPS
+
+
+def test_full_universe_traced_memory():
+    drivers, teams = full_pool()
+
+    tracemalloc.start()
+    universe = Universe.enumerate(drivers, teams)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert size <= 1.1 * universe.nbytes
+    assert peak <= Universe.estimated_nbytes(len(drivers), len(teams))
+
+
+@pytest.mark.parametrize("talent_slot", [False, True])
+def test_universe_matches_lineups_built_one_by_one(rng, talent_slot):
+    drivers, teams = random_pool(rng, 9, 3)
+    budget = 110e6
+
+    universe = Universe.enumerate(drivers, teams, talent_slot, budget)
+    expected = lineups(drivers, teams, budget, talent_slot)
+
+    np.testing.assert_allclose(universe.cost, [lineup[3] for lineup in expected])
+    np.testing.assert_allclose(universe.points, [lineup[4] for lineup in expected])
+    talent = [
+        universe.drivers[i].name if i >= 0 else None for i in universe.talent.tolist()
+    ]
+    assert talent == [lineup[2] and lineup[2].name for lineup in expected]
+
+
+def test_universe_enumeration_order_is_lineup_order(rng):
+    drivers, teams = random_pool(rng, 7, 2)
+    solver = BasicSolver(drivers, teams, [], [], np.inf)
+
+    expected = [(lineup[0], lineup[1]) for lineup in lineups(drivers, teams)]
+
+    assert [(ft.drivers, ft.team) for ft in solver.universe] == expected
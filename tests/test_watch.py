@@ -0,0 +1,122 @@
+"Incremental scoring of odds snapshots and tailing of snapshot files."
+
+import asyncio
+import json
+import os
+
+import pytest
+from pandas import Series
+
+from gridrival.probabilities.betting_odds import QUAL_1, RET_1, TOP_1
+from gridrival.watch import IncrementalScorer, tail_snapshots
+
+ODDS = {
+    market: Series(odds, dtype=float)
+    for market, odds in {"TOP_1": TOP_1, "QUAL_1": QUAL_1, "RET_1": RET_1}.items()
+}
+
+
+@pytest.mark.parametrize("market", ["TOP_1", "QUAL_1", "RET_1"])
+def test_update_matches_fresh_scorer(roster, market):
+    drivers, teams = roster
+    scorer = IncrementalScorer(drivers, teams, ODDS)
+    odds = ODDS[market].copy()
+    odds.iloc[0] *= 1.5
+
+    changed = scorer.update({market: odds.iloc[:1]})
+    fresh = IncrementalScorer(drivers, teams, {**ODDS, market: odds})
+
+    assert changed
+    assert scorer.components.to_numpy() == pytest.approx(
+        fresh.components.to_numpy(), abs=1e-12
+    )
+    assert scorer.team_points.to_numpy() == pytest.approx(
+        fresh.team_points.to_numpy(), abs=1e-12
+    )
+
+
+def test_update_with_same_odds_changes_nothing(roster):
+    drivers, teams = roster
+    scorer = IncrementalScorer(drivers, teams, ODDS)
+
+    assert scorer.update({"TOP_1": ODDS["TOP_1"].iloc[:3]}) == set()
+
+
+def test_update_below_tolerance_is_ignored(roster):
+    drivers, teams = roster
+    scorer = IncrementalScorer(drivers, teams, ODDS, tolerance=1e-2)
+    odds = ODDS["TOP_1"].copy()
+    odds.iloc[-1] *= 1.001
+
+    assert scorer.update({"TOP_1": odds}) == set()
+
+
+def test_updates_below_tolerance_add_up(roster):
+    drivers, teams = roster
+    scorer = IncrementalScorer(drivers, teams, ODDS, tolerance=1e-3)
+    odds = ODDS["TOP_1"].copy()
+
+    # Each step moves the probabilities by less than the tolerance, both by more.
+    odds.iloc[0] *= 1.002
+    first = scorer.update({"TOP_1": odds.iloc[:1]})
+    odds.iloc[0] *= 1.002
+    second = scorer.update({"TOP_1": odds.iloc[:1]})
+    fresh = IncrementalScorer(drivers, teams, {**ODDS, "TOP_1": odds})
+
+    assert first == set()
+    assert second
+    assert scorer.components.to_numpy() == pytest.approx(
+        fresh.components.to_numpy(), abs=1e-12
+    )
+
+
+def collect(directory, steps):
+    "Number of snapshots read by tail_snapshots after each step changes the directory."
+
+    async def run():
+        snapshots = []
+
+        async def consume():
+            async for snapshot in tail_snapshots(directory, interval=0.005):
+                snapshots.append(snapshot)
+
+        task = asyncio.ensure_future(consume())
+        counts = []
+        for step in steps:
+            step()
+            await asyncio.sleep(0.05)
+            counts.append(len(snapshots))
+        task.cancel()
+
+        return snapshots, counts
+
+    return asyncio.run(run())
+
+
+def test_tail_retries_half_written_snapshot(tmp_path):
+    path = tmp_path / "snapshot.json"
+    content = json.dumps({"TOP_1": {"L. Hamilton": 2.5}})
+
+    def half():
+        path.write_text(content[:10])
+        os.utime(path, ns=(1, 1))
+
+    def complete():
+        path.write_text(content)
+        os.utime(path, ns=(2, 2))
+
+    snapshots, counts = collect(tmp_path, [half, complete])
+
+    assert counts == [0, 1]
+    assert snapshots[0]["TOP_1"]["L. Hamilton"] == 2.5
+
+
+def test_tail_reads_each_file_once_and_forgets_removed(tmp_path):
+    path = tmp_path / "a.json"
+
+    def write():
+        path.write_text(json.dumps({"TOP_1": {"L. Hamilton": 2.5}}))
+
+    _, counts = collect(tmp_path, [write, lambda: None, path.unlink, write])
+
+    assert counts == [1, 1, 1, 2]